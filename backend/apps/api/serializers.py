@@ -110,7 +110,10 @@ class GameSerializer(serializers.ModelSerializer):
     class Meta:
         model = Game
         exclude = (
-            'deck',
+            'deck_cards',
+            'deck_seed',
+            'deck_template',
+            'deck_cursor',
             'stage_index',
         )
         read_only_fields = [
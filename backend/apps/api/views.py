@@ -1,11 +1,14 @@
 from typing import TYPE_CHECKING, Type, TypeAlias
 
 from core.utils import init_logger
+from django.db import transaction
 from games.models import Game, Player
 from games.models.player import PlayerPreform
+from games.selectors import PlayerSelector
 from games.services import actions, stages
-from games.services.processors import BaseProcessor
+from games.services.processors import BaseProcessor, StaleGameError
 from rest_framework import exceptions, mixins, viewsets
+from rest_framework.generics import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
@@ -57,6 +60,31 @@ class GamesViewSet(viewsets.ModelViewSet):
         host = Player.objects.create(user=self.request.user, game=game)
         game.select_players(source=[host])
 
+    @action(methods=['get'], detail=True, permission_classes=[IsAuthenticated])
+    def events(self, request: Request, pk: int):
+        """
+        Game events after sequence number from `after` query param (all events by
+        default). Clients could keep the latest one to fetch only new events. Events
+        could be filtered by game `round` as well.
+
+        Events are available only for game players and users waiting to participate.
+        Other users get 404 (it is not revealed whether the game exists).
+        """
+        params = {}
+        for name in ('after', 'round'):
+            try:
+                params[name] = int(request.query_params[name])
+            except KeyError:
+                pass
+            except ValueError:
+                raise exceptions.ValidationError({name: 'A valid integer is required.'})
+
+        game = get_object_or_404(Game.objects.joined_by(request.user), pk=pk)
+        events = game.events.rendering().after(params.get('after', 0))
+        if 'round' in params:
+            events = events.filter(round=params['round'])
+        return Response([event.render() for event in events])
+
 
 class GameInterfaceMixin(_BASE_VIEW):
     def perform_authentication(self, request):
@@ -67,7 +95,7 @@ class GameInterfaceMixin(_BASE_VIEW):
         if isinstance(request.user, DjangoUserModel):
             request.user.__class__ = User
 
-    def get_game(self):
+    def get_game(self) -> Game:
         return (
             Game.objects.prefetch_players().get(pk=self.kwargs['pk']).select_players()
         )
@@ -103,6 +131,9 @@ class ActionsViewSet(GameInterfaceMixin, viewsets.ViewSet):
     # get this list from ActionsViewSet extra actions configuration
     all_actions = ('bet', 'blind', 'check', 'reply', 'vabank', 'pass', 'end', 'start')
 
+    stale_game_retries = 2
+    'how many times action is run again if game has been saved by another request'
+
     def list(self, request: Request, pk: int):
         user: User = request.user
         game = self.get_game()
@@ -131,15 +162,25 @@ class ActionsViewSet(GameInterfaceMixin, viewsets.ViewSet):
         **action_kwargs,
     ):
         game = game or self.get_game()
-
-        try:
-            action_type.run(game, by_user or self.request.user, **action_kwargs)
-        except actions.ActionError as e:
-            raise ConflictState(e.action)
+        user = by_user or self.request.user
+
+        # game could be saved by another request while action is running, then
+        # action is run again against freshly loaded game
+        for attempt in range(self.stale_game_retries + 1):
+            try:
+                action_type.run(game, user, **action_kwargs)
+                break
+            except actions.ActionError as e:
+                raise ConflictState(e.action)
+            except StaleGameError as e:
+                logger.warning(f'{e} Attempt {attempt + 1}. ')
+                game = self.get_game()
+        else:
+            message = 'Game has been changed by another request. Try again. '
+            raise ConflictState(message, game, 'stale_game')
 
         serializer = GameSerializer(instance=game)
         return Response(serializer.data)
-        return Response({'latest': game.actions_history[-1]})
 
     @action(methods=['post'], detail=False)
     def start(self, request: Request, pk: int):
@@ -273,8 +314,17 @@ class PlayersViewSet(
         except PlayerPreform.DoesNotExist:
             raise exceptions.NotFound('User is not waiting to take part in game. ')
 
-        player_preform.delete()
-        super().perform_create(serializer)  # serializer.save()
+        # joining changes game players, so it is checked by game version as well as
+        # processor savings (host could approve joining at the same time as round
+        # is started)
+        try:
+            with transaction.atomic():
+                game.increment_version()
+                player_preform.delete()
+                super().perform_create(serializer)  # serializer.save()
+        except StaleGameError:
+            message = 'Game has been changed by another request. Try again. '
+            raise ConflictState(message, game, 'stale_game')
 
     def perform_destroy(self, instance: Player):
         game = instance.game
@@ -287,6 +337,9 @@ class PlayersViewSet(
         except actions.ActionError as e:
             # allowed only between rounds: at SetupStage and TearDownStage
             raise ConflictState(e.action)
+        except StaleGameError:
+            message = 'Game has been changed by another request. Try again. '
+            raise ConflictState(message, game, 'stale_game')
 
     def get_object(self) -> Player:
         return super().get_object()
@@ -303,6 +356,9 @@ class PlayersViewSet(
     def other(self, request: Request, pk: int):
         other = self.get_game().players.exclude(user=request.user)
         serializer = self.get_serializer(instance=other, many=True)
+        if not isinstance(serializer.child, HiddenPlayerSerializer):
+            # cards are open: evaluate all combos at once
+            PlayerSelector(other).evaluate_all_combos()
         return Response(serializer.data)
 
 
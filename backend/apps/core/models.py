@@ -1,8 +1,9 @@
 from copy import deepcopy
 import functools
+import logging
 from typing import Any, Callable, Iterable, Iterator, Optional, TypeAlias, TypeVar
 import typing
-from django.db import models
+from django.db import models, transaction
 from core.utils import StrColors, init_logger
 
 logger = init_logger(__name__)
@@ -59,19 +60,59 @@ class UpdateMethodMixin:
             self.save()
 
 
+def snapshot_value(value: Any) -> Any:
+    """
+    Copy of field value to find out its changes later. Lists of immutable items (like
+    cards) are copied into tuples, other mutable values are deep copied.
+
+    >>> snapshot_value([1, 2, 3])
+    (1, 2, 3)
+    >>> snapshot_value([{'a': 1}])
+    [{'a': 1}]
+    """
+    if isinstance(value, (list, tuple)):
+        snapshot = tuple(value)
+        if any(isinstance(item, (list, dict)) for item in snapshot):
+            return deepcopy(value)
+        return snapshot
+    return deepcopy(value)
+
+
 class ChangedFieldsLoggingMixin(_TYPE_MODEL):
+    """
+    Snapshot fields values at init and after every saving to know which fields have
+    been changed since then.
+    """
+
+    _db_data: dict[str, Any]
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._db_data = self.get_current_fields()
 
-    def get_current_fields(self) -> dict[str, Any]:
+    def get_current_fields(
+        self, attnames: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """Snapshot of loaded (not deferred) fields."""
+        if attnames is None:
+            attnames = (f.attname for f in self._meta.concrete_fields)
         return {
-            f.attname: deepcopy(getattr(self, f.attname)) for f in self._meta.fields
+            attname: snapshot_value(self.__dict__[attname])
+            for attname in attnames
+            if attname in self.__dict__
         }
 
     def get_changed_fields(self) -> dict[str, Any]:
         current_data = self.get_current_fields()
-        return {k: v for k, v in current_data.items() if v != self._db_data[k]}
+        return {
+            k: v
+            for k, v in current_data.items()
+            if k not in self._db_data or v != self._db_data[k]
+        }
+
+    def refresh_from_db(self, using=None, fields=None) -> None:
+        super().refresh_from_db(using, fields)
+        self._db_data.update(self.get_current_fields(fields))
 
     def save(
         self,
@@ -80,22 +121,19 @@ class ChangedFieldsLoggingMixin(_TYPE_MODEL):
         using: Optional[str] = None,
         update_fields: Optional[Iterable[str]] = None,
     ) -> None:
-        if self.pk:
+        if self.pk and logger.isEnabledFor(logging.DEBUG):
             changed = self.get_changed_fields()
             for k, v in changed.items():
-                if isinstance(v, list) and len(v) > 5:
+                if isinstance(v, (list, tuple)) and len(v) > 5:
                     changed[k] = str(v[:4]) + '...'
             logger.debug(
                 f'{StrColors.green("Saving")} {self}... Changed fields: {changed}'
             )
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug(f'{StrColors.yellow("Creation")} {self}')
 
         super().save(force_insert, force_update, using, update_fields)
-        self._db_data = self.get_current_fields()
-
-    class Meta:
-        abstract = True
+        self._db_data.update(self.get_current_fields(update_fields))
 
 class CleanManagerMixin():
 
@@ -156,13 +194,53 @@ class FullCleanSavingMixin(_TYPE_MODEL):
             super().save(force_insert, force_update, using, update_fields)
             self.post_init_clean()
         else:
-            self.full_clean()
+            exclude = None
+            if update_fields is not None:
+                # validate only fields to be saved
+                exclude = [
+                    f.name
+                    for f in self._meta.concrete_fields
+                    if f.attname not in update_fields and f.name not in update_fields
+                ]
+            self.full_clean(exclude=exclude)
             super().save(force_insert, force_update, using, update_fields)
 
 
 class ExtendedSavingMixin(FullCleanSavingMixin, ChangedFieldsLoggingMixin):
-    # not implemented yet
-    pass
+    """
+    Save (and validate) only fields that have been changed since loading from db or
+    the latest saving. Nothing is saved if there are no changes.
+    """
+
+    def save(
+        self,
+        force_insert: bool = False,
+        force_update: bool = False,
+        using: Optional[str] = None,
+        update_fields: Optional[Iterable[str]] = None,
+        *,
+        only_if_presave: bool = False,
+    ) -> None:
+        if only_if_presave and not self._presave_flag:
+            return
+
+        # [NOTE] not `self.pk`: instance could be created with pk, but not saved yet
+        if not self._state.adding and update_fields is None and not force_insert:
+            changed = [
+                attname
+                for attname in self.get_changed_fields()
+                if attname != self._meta.pk.attname
+            ]
+            if not changed:
+                return
+            auto_now = [
+                f.attname
+                for f in self._meta.concrete_fields
+                if getattr(f, 'auto_now', False)
+            ]
+            update_fields = list(dict.fromkeys([*changed, *auto_now]))
+
+        super().save(force_insert, force_update, using, update_fields)
 
 
 class CreatedModifiedModel(models.Model):
@@ -182,3 +260,89 @@ class CreatedModifiedModel(models.Model):
     class Meta:
         abstract = True
         ordering = ['created']
+
+
+def bulk_save(
+    instances: Iterable[ExtendedSavingMixin | models.Model],
+    *,
+    only_if_presave=False,
+    before_saving: Callable[[], Any] | None = None,
+) -> int:
+    """
+    Save changed fields of many instances inside one transaction: all instances are
+    validated (only changed fields) and than one `bulk_update` is made for every
+    model. Not saved instances are saved one by one, but plain models instances
+    (without extended saving) are inserted by one `bulk_create` for every model.
+    Return amount of saved instances.
+
+    Plain models instances have no presave flag, they are saved anyway.
+
+    `before_saving` is called inside transaction before any saving, only if there
+    are something to save (raise there to rollback saving).
+    """
+    changed_by_model: dict[
+        type[models.Model], dict[ExtendedSavingMixin, list[str]]
+    ] = {}
+    created = []
+    created_by_model: dict[type[models.Model], list[models.Model]] = {}
+    for instance in instances:
+        if not isinstance(instance, ExtendedSavingMixin):
+            if instance._state.adding:
+                created_by_model.setdefault(type(instance), []).append(instance)
+            continue
+        if only_if_presave and not instance._presave_flag:
+            continue
+        if instance._state.adding:
+            created.append(instance)
+            continue
+
+        changed = [
+            attname
+            for attname in instance.get_changed_fields()
+            if attname != instance._meta.pk.attname
+        ]
+        if changed:
+            changed_by_model.setdefault(type(instance), {})[instance] = changed
+
+    # [1] validate all together before any saving
+    for changed_instances in changed_by_model.values():
+        for instance, changed in changed_instances.items():
+            instance.full_clean(
+                exclude=[
+                    f.name
+                    for f in instance._meta.concrete_fields
+                    if f.attname not in changed
+                ]
+            )
+
+    if not created and not created_by_model and not changed_by_model:
+        return 0
+
+    # [2] one bulk update for every model (union of changed fields)
+    with transaction.atomic():
+        if before_saving:
+            before_saving()
+        for model, created_instances in created_by_model.items():
+            model._default_manager.bulk_create(created_instances)
+        for instance in created:
+            instance.save()
+        for model, changed_instances in changed_by_model.items():
+            auto_now = [
+                f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)
+            ]
+            fields = [f.attname for f in auto_now]
+            for changed in changed_instances.values():
+                fields.extend(changed)
+            fields = list(dict.fromkeys(fields))
+            for instance in changed_instances:
+                for field in auto_now:
+                    field.pre_save(instance, add=False)
+            model._default_manager.bulk_update(changed_instances, fields)
+            for instance in changed_instances:
+                instance._db_data.update(instance.get_current_fields(fields))
+
+    return (
+        len(created)
+        + sum(map(len, created_by_model.values()))
+        + sum(map(len, changed_by_model.values()))
+    )
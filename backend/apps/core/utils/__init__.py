@@ -1,5 +1,6 @@
-__all__=['decorators', 'functools', 'interval', 'looptools', 'types']
+__all__=['caches', 'decorators', 'functools', 'interval', 'looptools', 'types']
 
+from .caches import LRUCache
 from .decorators import TemporaryContext, temporally, ProcessingTimer, processing_timer
 from .looptools import looptools, circle_after
 from .functools import *
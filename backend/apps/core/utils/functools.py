@@ -5,7 +5,8 @@ import itertools
 import logging
 import operator
 import re
-from typing import Any, Callable, Iterable, Sequence, SupportsIndex
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Sequence, SupportsIndex
 from core.utils.types import _CT
 
 
@@ -30,6 +31,27 @@ def change_loggers_level(level, match_name: str = r'games', exclude_match: str =
             logging.getLogger(name).setLevel(level)
 
 
+@contextmanager
+def loggers_level(level, match_name: str = r'games') -> Iterator[None]:
+    """
+    Temporally change level of loggers matched by name (see `change_loggers_level`),
+    previous levels are restored after.
+    """
+    loggers = [
+        logging.getLogger(name)
+        for name in list(logging.root.manager.loggerDict)
+        if re.match(match_name, name)
+    ]
+    levels = [item.level for item in loggers]
+    for item in loggers:
+        item.setLevel(level)
+    try:
+        yield
+    finally:
+        for item, previous in zip(loggers, levels):
+            item.setLevel(previous)
+
+
 def eq_first(minor: str, major: str, case_sensitive=False) -> bool:
     """
     True if minor string is equivalent to major string from begining.
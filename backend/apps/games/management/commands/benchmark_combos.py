@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand
+from games.services import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Run combos evaluation benchmarks for shipped configs and write report in '
+        'JSON format (to compare it between releases). '
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--config',
+            action='append',
+            choices=benchmarks.CONFIG_NAMES,
+            help='config to benchmark (all configs by default)',
+        )
+        parser.add_argument('--rounds', type=int, default=benchmarks.DEFAULT_ROUNDS)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', type=str, help='file path (stdout by default)')
+
+    def handle(self, *args, **options):
+        report = benchmarks.run(
+            options['config'] or benchmarks.CONFIG_NAMES,
+            rounds=options['rounds'],
+            seed=options['seed'],
+        )
+        dumped = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(dumped)
+        else:
+            self.stdout.write(dumped)
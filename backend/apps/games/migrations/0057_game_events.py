@@ -0,0 +1,162 @@
+# Generated by Django 4.1 on 2026-10-17 00:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# event classes names by theirs codes at the moment of migration
+# (see `games.services.events.EVENT_CLASSES`)
+EVENT_CLASSES = (
+    'StartAction',
+    'EndAction',
+    'ForceContinueAction',
+    'LeaveGame',
+    'KickOut',
+    'PassAction',
+    'PlaceBet',
+    'PlaceBlind',
+    'PlaceBetCheck',
+    'PlaceBetReply',
+    'PlaceBetVaBank',
+    'SetupStage',
+    'DealCardsStage',
+    'DealCardsStage_1',
+    'DealCardsStage_2',
+    'DealCardsStage_3',
+    'BiddingsStage',
+    'BiddingsStage_1',
+    'BiddingsStage_2',
+    'BiddingsStage_3',
+    'BiddingsStage_4',
+    'PlacingBlindsStage',
+    'FlopStage',
+    'FlopStage_1',
+    'FlopStage_2',
+    'FlopStage_3',
+    'FlopStage_4',
+    'FlopStage_5',
+    'OpposingStage',
+    'TearDownStage',
+)
+
+
+def history_to_events(apps, schema_editor):
+    """
+    Copy game actions history into game events. History keeps rendered messages
+    only (message form kwargs are unknown), so they are stored as they are.
+
+    History is cleared at TearDownStage, so it contains the current round only
+    (and TearDownStage of the previous round at the beginning).
+    """
+    Game = apps.get_model('games', 'Game')
+    GameEvent = apps.get_model('games', 'GameEvent')
+    UserProxy = apps.get_model('users', 'UserProxy')
+    codes = {name: code for code, name in enumerate(EVENT_CLASSES)}
+    users = dict(UserProxy.objects.values_list('username', 'pk'))
+
+    for game in Game.objects.iterator():
+        if not game.actions_history:
+            continue
+
+        events = []
+        for seq, entry in enumerate(game.actions_history, start=1):
+            if entry.get('class') not in codes:
+                continue
+            round_number = game.rounds_counter
+            if seq == 1 and entry['class'] == 'TearDownStage':
+                round_number -= 1  # tear down of the previous round
+            value = entry.get('value')
+            event = GameEvent(
+                game_id=game.pk,
+                seq=seq,
+                round=round_number,
+                code=codes[entry['class']],
+                performer_id=users.get(entry.get('performer')),
+                value=value if isinstance(value, int) else None,
+                details={'legacy_message': entry.get('message', '')},
+            )
+            events.append(event)
+
+        GameEvent.objects.bulk_create(events)
+        game.events_counter = len(game.actions_history)
+        game.save(update_fields=['events_counter'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0014_alter_profile_user'),
+        ('games', '0056_alter_game_config_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='events_counter',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='GameEvent',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'seq',
+                    models.PositiveIntegerField(verbose_name='sequence number at game'),
+                ),
+                ('round', models.PositiveIntegerField(verbose_name='game round')),
+                (
+                    'code',
+                    models.PositiveSmallIntegerField(verbose_name='event class code'),
+                ),
+                ('value', models.IntegerField(blank=True, null=True)),
+                ('details', models.JSONField(blank=True, null=True)),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='creation data'
+                    ),
+                ),
+                (
+                    'game',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='events',
+                        to='games.game',
+                    ),
+                ),
+                (
+                    'performer',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to='users.userproxy',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'game event',
+                'verbose_name_plural': 'game events',
+                'ordering': ['seq'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='gameevent',
+            constraint=models.UniqueConstraint(
+                fields=('game', 'seq'), name='unique_game_event_seq'
+            ),
+        ),
+        migrations.RunPython(history_to_events, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='game',
+            name='actions_history',
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.1 on 2026-10-17 00:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0057_game_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSnapshot',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'seq',
+                    models.PositiveIntegerField(verbose_name='sequence number at game'),
+                ),
+                ('data', models.JSONField()),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='creation data'
+                    ),
+                ),
+                (
+                    'game',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='snapshots',
+                        to='games.game',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'game snapshot',
+                'verbose_name_plural': 'game snapshots',
+                'ordering': ['seq'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='gamesnapshot',
+            index=models.Index(
+                fields=['game', 'seq'], name='games_games_game_id_63d312_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0058_game_snapshots'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='game',
+            old_name='deck',
+            new_name='deck_cards',
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='deck_cursor',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='deck_seed',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='deck_template',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1 on 2026-10-17 01:02
+
+from django.db import migrations, models
+
+
+def delete_duplicated_snapshots(apps, schema_editor):
+    """Keep only the latest snapshot for every event."""
+    GameSnapshot = apps.get_model('games', 'GameSnapshot')
+    latest = (
+        GameSnapshot.objects.values('game', 'seq')
+        .annotate(latest=models.Max('pk'))
+        .values('latest')
+    )
+    GameSnapshot.objects.exclude(pk__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0060_game_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicated_snapshots, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='gamesnapshot',
+            name='games_games_game_id_63d312_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='gamesnapshot',
+            constraint=models.UniqueConstraint(
+                fields=('game', 'seq'), name='unique_game_snapshot_seq'
+            ),
+        ),
+    ]
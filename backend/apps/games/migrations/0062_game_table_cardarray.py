@@ -0,0 +1,24 @@
+# Generated by Django 4.1 on 2026-10-17 01:19
+
+from django.db import migrations
+import games.models.fields
+import games.services.cards
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0061_game_snapshot_unique_seq'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='game',
+            name='table',
+            field=games.models.fields.CardListField(
+                blank=True,
+                container=games.services.cards.CardArray,
+                default=games.models.fields.cardarray_default,
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+SETUP_STAGE_CODE = 11
+'`SetupStage` event code (see `games.services.events.EVENT_CLASSES`). '
+
+
+def hide_shuffle_seeds(apps, schema_editor):
+    """
+    Shuffle seeds were logged at setup events value, anyone who knows seed could
+    restore all deck cards. Those rounds could not be replayed any more.
+    """
+    GameEvent = apps.get_model('games', 'GameEvent')
+    GameEvent.objects.filter(code=SETUP_STAGE_CODE).update(value=None, details=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0062_game_table_cardarray'),
+    ]
+
+    operations = [
+        migrations.RunPython(hide_shuffle_seeds, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
-__all__=['game', 'player', 'fields']
+__all__=['game', 'player', 'event', 'fields']
 
 from .game import Game
 from .player import Player
+from .event import GameEvent, GameSnapshot
 from .fields import CardListField, StacksField
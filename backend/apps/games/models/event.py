@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any
+
+from core.utils import init_logger
+from django.db import models
+from games.models import Game
+from games.services.events import EventClass, get_event_class
+from users.models import User
+
+logger = init_logger(__name__)
+
+
+class GameEventQuerySet(models.QuerySet):
+    def after(self, seq: int):
+        """Events after sequence number (not including it)."""
+        return self.filter(seq__gt=seq)
+
+    def rendering(self):
+        """Select related performer, it is necessary to render messages."""
+        return self.select_related('performer')
+
+
+class GameEvent(models.Model):
+    """
+    Append-only log of actions and stages that have been proceed at game.
+
+    Messages are not stored, they are rendered on read by event class message form,
+    performer and value (and details: other message form kwargs, if there are any).
+    Events copied from former actions history keep rendered `legacy_message` only.
+    """
+
+    objects: GameEventQuerySet = GameEventQuerySet.as_manager()  # type: ignore
+
+    game: Game = models.ForeignKey(
+        to=Game,
+        on_delete=models.CASCADE,
+        related_name='events',
+    )
+    seq: int = models.PositiveIntegerField('sequence number at game')
+    round: int = models.PositiveIntegerField('game round')
+    code: int = models.PositiveSmallIntegerField('event class code')
+    performer: User | None = models.ForeignKey(
+        to=User,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+    )
+    value: int | None = models.IntegerField(null=True, blank=True)
+    details: dict[str, Any] | None = models.JSONField(null=True, blank=True)
+    created = models.DateTimeField('creation data', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'game event'
+        verbose_name_plural = 'game events'
+        ordering = ['seq']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['game', 'seq'],
+                name='unique_game_event_seq',
+            ),
+        ]
+
+    def __repr__(self) -> str:
+        return f'({self.seq}) {self.event_class.__name__} at game {self.game_id}'
+
+    def __str__(self) -> str:
+        return self.message
+
+    @property
+    def event_class(self) -> EventClass:
+        return get_event_class(self.code)
+
+    @property
+    def message(self) -> str:
+        if self.details and 'legacy_message' in self.details:
+            # copied from former game actions history (see migration 0057)
+            return self.details['legacy_message']
+        kwargs = {'player': self.performer, 'value': self.value, **(self.details or {})}
+        return self.event_class.message.format(**kwargs)
+
+    def render(self) -> dict[str, Any]:
+        """
+        Event representation: sequence number, class name, performer username (None
+        for stages), message and value.
+        """
+        return {
+            'seq': self.seq,
+            'class': self.event_class.__name__,
+            'performer': str(self.performer) if self.performer else None,
+            'message': self.message,
+            'value': self.value,
+        }
+
+
+class GameSnapshot(models.Model):
+    """
+    Game and players state after event with `seq` number. Game could be replayed
+    from the nearest snapshot (see `games.services.replay`).
+
+    There are only one snapshot for every event: players could join game between
+    rounds (it is not an event), so the latest snapshot replaces previous one.
+    """
+
+    game: Game = models.ForeignKey(
+        to=Game,
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+    )
+    seq: int = models.PositiveIntegerField('sequence number at game')
+    data: dict[str, Any] = models.JSONField()
+    created = models.DateTimeField('creation data', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'game snapshot'
+        verbose_name_plural = 'game snapshots'
+        ordering = ['seq']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['game', 'seq'],
+                name='unique_game_snapshot_seq',
+            ),
+        ]
+
+    def __repr__(self) -> str:
+        return f'({self.seq}) snapshot at game {self.game_id}'
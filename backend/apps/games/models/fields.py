@@ -7,7 +7,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 
 
-from games.services.cards import Card, CardList, Stacks
+from games.services.cards import Card, CardArray, CardList, Stacks, parse_cards
 
 logger = init_logger(__name__)
 
@@ -20,44 +20,68 @@ def stacks_default() -> Stacks:
     return []
 
 
+def cardarray_default():
+    return CardArray()
+
+
 class CardListField(models.Field):
+    """
+    `container` -- python type for field values: `CardList` (default) or more compact
+    `CardArray`.
+    """
+
     description = 'list of cards represented as string, seperated by space symbol'
 
-    def __init__(self, *args, **kwargs) -> None:
+    CONTAINERS = (CardList, CardArray)
+
+    def __init__(
+        self, *args, container: type[CardList | CardArray] = CardList, **kwargs
+    ) -> None:
+        assert container in self.CONTAINERS, f'not supported: {container=}'
+        self.container = container
         if kwargs.get('blank'):
-            kwargs['default'] = cardlist_default
+            kwargs['default'] = (
+                cardlist_default if container is CardList else cardarray_default
+            )
         super().__init__(*args, **kwargs)
 
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.container is not CardList:
+            kwargs['container'] = self.container
+        return name, path, args, kwargs
+
     def get_internal_type(self):
         return "TextField"
 
-    def from_db_value(self, value: str, expression, connection) -> CardList:
+    def from_db_value(self, value: str, expression, connection) -> CardList | CardArray:
         """is calling for transfer data from db"""
         return self.to_python(value)
 
-    def to_python(self, value: str | CardList) -> CardList:
+    def to_python(self, value: str | CardList | CardArray) -> CardList | CardArray:
         """Is calling for transfer data from `Forms` to `Python` scrypt.
         Do not create new CardList instance if it comes by attrubute.
         """
         if isinstance(value, str):
             try:
-                return CardList(*value.split(' '))
+                return self.container(instance=parse_cards(value))
             except ValueError as e:
                 raise ValidationError(
                     [ValidationError(arg, code='invalid') for arg in e.args]
                 )
-        elif isinstance(value, CardList):
+        elif isinstance(value, self.CONTAINERS):
             return value
         else:
             raise TypeError(f'ivalid type: {type(value)} ({value=}) ')
 
     @temporally(Card.Text, str_method='eng_short_suit')
-    def get_prep_value(self, value: CardList) -> str:
+    def get_prep_value(self, value: CardList | CardArray) -> str:
         """converting Python objects to query values"""
         # type cheking
-        if not isinstance(value, CardList):
+        if not isinstance(value, self.CONTAINERS):
             raise TypeError(
-                f'CardListField stores only CardList instances, not {type(value)}. ',
+                f'CardListField stores only {self.container.__name__} instances, '
+                f'not {type(value)}. ',
                 f'{value=}. ',
             )
         # representation
@@ -86,7 +110,7 @@ class StacksField(models.Field):
         if isinstance(value, str):
             try:
                 stacks = split(value, by_symbols='[]')
-                return list(CardList(*cards.split(' ')) for cards in stacks)
+                return list(CardList(instance=parse_cards(cards)) for cards in stacks)
             except ValueError as e:
                 raise ValidationError(
                     [ValidationError(arg, code='invalid') for arg in e.args]
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+import random
 from functools import cached_property
 from typing import TYPE_CHECKING, Any, Iterable, Sequence
 
 from core.models import (
     CreatedModifiedModel,
-    FullCleanSavingMixin,
+    ExtendedSavingMixin,
     UpdateMethodMixin,
-    get_list_default,
 )
 from core.utils import StrColors, init_logger
 from django.db import models
@@ -17,18 +17,51 @@ from games.models.fields import CardListField
 from games.models.managers import GameManager
 
 from games.selectors import PlayerSelector
-from games.services.cards import CardList
-from games.services.processors import BaseProcessor
+from games.services.cards import CardArray, CardList, Decks, SeededDeck
+from games.services.events import get_event_code
+from games.services.processors import BaseProcessor, StaleGameError
+from games.services.replay import dump_state
 from users.models import User
 
 if TYPE_CHECKING:
+    from games.services.actions import BaseAction
+    from games.services.stages import BaseStage
+
+    from .event import GameEvent, GameSnapshot
     from .player import Player, PlayerManager, PlayerPreform
 
 
 logger = init_logger(__name__)
 
 
-class Game(UpdateMethodMixin, FullCleanSavingMixin, CreatedModifiedModel):
+class GameDeck(SeededDeck):
+    """
+    Seeded deck of the game. Cursor is stored at game field, so drawing cards changes
+    only that small integer field.
+    """
+
+    def __init__(self, game: Game) -> None:
+        assert game.deck_seed is not None, 'Game deck is not seeded. '
+        self.game = game
+        super().__init__(
+            Decks.template(game.config.deck), game.deck_seed, game.deck_cursor
+        )
+        if self.template_id != game.deck_template:
+            raise ValueError(
+                f'Deck template for {game.config_name} has been changed since '
+                'the deck was shuffled. '
+            )
+
+    @property
+    def cursor(self) -> int:
+        return self.game.deck_cursor
+
+    @cursor.setter
+    def cursor(self, value: int) -> None:
+        self.game.deck_cursor = value
+
+
+class Game(UpdateMethodMixin, ExtendedSavingMixin, CreatedModifiedModel):
     objects: GameManager[Game] = GameManager()
 
     # OneToMany related fields initialized by Django
@@ -54,33 +87,170 @@ class Game(UpdateMethodMixin, FullCleanSavingMixin, CreatedModifiedModel):
         max_length=30,
         default=ConfigChoices.CLASSIC,
     )
-    deck: CardList = CardListField(blank=True)
-    table: CardList = CardListField(blank=True)
+    deck_cards: CardList = CardListField(blank=True)
+    """Deck cards (when deck is not seeded). """
+    deck_seed: int | None = models.PositiveBigIntegerField(null=True, blank=True)
+    """Shuffle seed of deck template (see `SeededDeck`). """
+    deck_template: int | None = models.BigIntegerField(null=True, blank=True)
+    """Checksum of deck template that has been shuffled. """
+    deck_cursor: int = models.PositiveSmallIntegerField(default=0)
+    """Amount of cards drawn from seeded deck. """
+    _deck: GameDeck | None = None
+
+    @property
+    def deck(self) -> CardList | SeededDeck:
+        """
+        Remaining deck cards. Seeded deck stores only shuffle seed and cursor, cards
+        are derived on demand. Otherwise cards are stored as they are.
+        """
+        if self.deck_seed is None:
+            return self.deck_cards
+        if self._deck is None or self._deck.seed != self.deck_seed:
+            self._deck = GameDeck(self)
+        return self._deck
+
+    @deck.setter
+    def deck(self, value: CardList | SeededDeck) -> None:
+        self._deck = None
+        if isinstance(value, SeededDeck):
+            self.deck_cards = CardList()
+            self.deck_seed = value.seed
+            self.deck_template = value.template_id
+            self.deck_cursor = value.cursor
+        else:
+            self.deck_cards = value
+            self.deck_seed = None
+            self.deck_template = None
+            self.deck_cursor = 0
+
+    table: CardArray = CardListField(blank=True, container=CardArray)
+    """Table cards (compact container, see `CardArray`). """
     bank: int = models.PositiveIntegerField(default=0)
 
     @property
     def bank_total(self):
         return self.bank + self.players.aggregate_sum_all_bets()
 
-    actions_history: list[dict[str, Any]] = models.JSONField(
-        default=get_list_default,
-        blank=True,
-    )
-    """
-    List with actions and stages that have been proceed:
-    >>> [{'performer': str | None, 'class': str, 'message': str}, ...]
-
-    (for stages performer is None)
-    """
-
     begins: bool = models.BooleanField(default=False)
     rounds_counter: int = models.PositiveIntegerField(default=1)
+    events_counter: int = models.PositiveIntegerField(default=0)
+    """Sequence number of the latest game event. """
     stage_index: int = models.PositiveSmallIntegerField(default=0)
+    version: int = models.PositiveIntegerField(default=0)
+    """Incremented at every processor saving (see `increment_version`). """
+
+    rnd: random.Random | None = None
+    """Generator for deck shuffle seeds (system random one if None). """
+
+    state_version: int = 0
+    """
+    Changed at any game state changes (action acted, players re-selected). Stage
+    memoized results (performer, possible actions) are valid only for that version.
+    """
+    _stage: BaseStage | None = None
 
     @property
-    def stage(self):
+    def stage(self) -> BaseStage:
+        """
+        Stage instance is kept while stage index and state version are the same, so
+        its memoized results (performer, possible actions) and attributes set at
+        execution (message kwargs) do not outlive game state.
+        """
         stage_class = self.stages[self.stage_index]
-        return stage_class(self)
+        if type(self._stage) is not stage_class:
+            self._stage = stage_class(self)
+        return self._stage  # type: ignore
+
+    # OneToMany related fields initialized by Django
+    events: models.Manager[GameEvent]
+    snapshots: models.Manager[GameSnapshot]
+
+    pending_events: list[GameEvent]
+    """Logged, but not saved events. They are saved together with game objects. """
+
+    def log_event(self, latest: BaseStage | BaseAction) -> GameEvent:
+        """
+        Log action or stage that have been proceed. Event is saved later by processor
+        (one INSERT for all pending events).
+        """
+        # imported here because of circular imports
+        from games.models.event import GameEvent
+
+        kwargs = dict(latest.get_message_kwargs())
+        value = kwargs.pop('value', getattr(latest, 'value', None))
+        kwargs.pop('player', None)
+        player: Player | None = getattr(latest, 'player', None)
+
+        details = {
+            key: arg if isinstance(arg, int | str) else str(arg)
+            for key, arg in kwargs.items()
+        }
+        details.update(latest.get_event_details())
+
+        self.events_counter += 1
+        self.presave()
+        event = GameEvent(
+            game=self,
+            seq=self.events_counter,
+            round=self.rounds_counter,
+            code=get_event_code(type(latest)),
+            performer=player.user if player else None,
+            value=value if isinstance(value, int) else None,
+            details=details or None,
+        )
+        self.pending_events.append(event)
+        return event
+
+    @property
+    def actions_history(self) -> list[dict[str, Any]]:
+        """
+        Rendered events of the current round (including pending ones).
+        See `GameEvent.render`.
+        """
+        events: list[GameEvent] = []
+        if not self._state.adding:
+            events.extend(self.events.rendering().filter(round=self.rounds_counter))
+        events.extend(e for e in self.pending_events if e.round == self.rounds_counter)
+        return [event.render() for event in events]
+
+    def take_snapshot(self) -> GameSnapshot:
+        """
+        Not saved snapshot of game and players state after the latest event.
+        """
+        # imported here because of circular imports
+        from games.models.event import GameSnapshot
+
+        return GameSnapshot(game=self, seq=self.events_counter, data=dump_state(self))
+
+    def increment_version(self) -> None:
+        """
+        Conditional UPDATE of version (optimistic concurrency control): it is
+        incremented only if game has not been saved by anyone else since it was
+        loaded, otherwise `StaleGameError` is raised. Called by processor inside
+        transaction before other game objects saving and by players joining (see
+        `PlayersViewSet`).
+
+        [NOTE] Other writes are not versioned: `select_players` only re-selects
+        players in memory, game creation and deleting are not concurrent with
+        processing. Any new write of game state should call for that method.
+        """
+        if self._state.adding:
+            return
+
+        loaded = self._db_data.get('version', self.version)
+        updated = Game.objects.filter(pk=self.pk, version=loaded).update(
+            version=models.F('version') + 1
+        )
+        if not updated:
+            raise StaleGameError(
+                f'{self!r} has been saved by another process since version {loaded}. '
+            )
+        self.version = self._db_data['version'] = loaded + 1
+
+    def touch_state(self) -> None:
+        """Call after any game state changes to invalidate memoized stage."""
+        self.state_version += 1
+        self._stage = None
 
     @cached_property
     def stages(self):
@@ -112,6 +282,7 @@ class Game(UpdateMethodMixin, FullCleanSavingMixin, CreatedModifiedModel):
         )
 
         super().__init__(*args, **kwargs)
+        self.pending_events = []
 
         if not commit:
             return
@@ -179,6 +350,7 @@ class Game(UpdateMethodMixin, FullCleanSavingMixin, CreatedModifiedModel):
             source = default_source
 
         self._players_selector = PlayerSelector(source)
+        self.touch_state()
         return self
 
     def reselect_players(self):
@@ -207,6 +379,11 @@ class Game(UpdateMethodMixin, FullCleanSavingMixin, CreatedModifiedModel):
                 'There was no reason call for reselect_players(). '
             )
 
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self.pending_events.clear()
+        self.touch_state()
+
     def get_players(self) -> PlayerSelector | None:
         """The same as `players` property, but no raises for None value."""
         return self._players_selector
@@ -34,6 +34,19 @@ class GameManager(models.Manager[_T]):
         )
         return super().prefetch_related(*prefetch_lookups)
 
+    def joined_by(self, user):
+        """
+        Games where user is a player or is waiting to participate (has a preform).
+        """
+        return (
+            super()
+            .filter(
+                models.Q(players_manager__user=user)
+                | models.Q(players_preforms__user=user)
+            )
+            .distinct()
+        )
+
 
 class PlayerQuerySet(models.QuerySet):
     pass
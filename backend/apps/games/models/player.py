@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from core.models import CreatedModifiedModel, FullCleanSavingMixin, get_list_default
+from core.models import CreatedModifiedModel, ExtendedSavingMixin, get_list_default
 from core.utils import init_logger
 from core.validators import int_list_validator
 from django.db import models
@@ -9,13 +9,13 @@ from games.models import Game
 from games.models.fields import CardListField
 from games.models.managers import PlayerManager
 from games.services.cards import CardList
-from games.services.combos import Combo, ComboStacks
+from games.services.players import PlayerMixin
 from users.models import User
 
 logger = init_logger(__name__)
 
 
-class Player(FullCleanSavingMixin, CreatedModifiedModel):
+class Player(PlayerMixin, ExtendedSavingMixin, CreatedModifiedModel):
     """
     Model for representing single user at curtain game.
     """
@@ -47,41 +47,6 @@ class Player(FullCleanSavingMixin, CreatedModifiedModel):
     is_host: bool = models.BooleanField()
     is_active: bool = models.BooleanField('not passed player', default=True)
 
-    @property
-    def bet_total(self):
-        return sum(self.bets)
-
-    @property
-    def is_dealer(self):
-        """
-        A dealer button is used to represent the player in the dealer position.
-        The dealer button rotates clockwise after each round, changing the position of
-        the dealer and blinds. Dealer position number is always 0.
-        """
-        return self.position == 0
-
-    @property
-    def is_performer(self):
-        return self == self.game.stage.performer
-
-    @property
-    def other_players(self):
-        return self.game.players.exclude(player=self)
-
-    @property
-    def combo(self):
-        if not self.hand and not self.game.table:
-            return None
-
-        stacks = ComboStacks()
-        kind = stacks.track_and_merge(
-            self.hand,
-            self.game.table,
-            references=self.game.config.combos,
-            possible_highest=self.game.config.deck.interval.max,
-        )
-        return Combo(kind, stacks)
-
     class Meta(CreatedModifiedModel.Meta):
         verbose_name = 'user in game (player)'
         verbose_name_plural = 'users in games (players)'
@@ -94,16 +59,6 @@ class Player(FullCleanSavingMixin, CreatedModifiedModel):
         # nulls_last -- not makes affect to 0 (zero) values, but None values
         ordering = [F('position').asc(nulls_last=True), 'id']
 
-    def __repr__(self) -> str:
-        n = self.position if self.position is not None else '?'
-        h = '(h)' if self.is_host else ''
-        d = '(d)' if self.is_dealer else ''
-        name = self.user.username
-        return f'({n}) {name}{h}{d}'
-
-    def __str__(self) -> str:
-        return self.user.username
-
     def init_clean(self):
         if self.is_host is None:
             # if no other players, this player become a host
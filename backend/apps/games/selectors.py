@@ -1,17 +1,19 @@
 from __future__ import annotations
 import itertools
 
-from operator import attrgetter
+from operator import attrgetter, itemgetter
 from typing import TYPE_CHECKING, Iterator, Sequence
 
 from core.utils import circle_after
 from core.utils import init_logger, reverse_attrgetter
+from games.services.bitboards import CardsBitboard
 from users.models import User
 
 logger = init_logger(__name__)
 
 if TYPE_CHECKING:
     from games.models import Player
+    from games.services.combos import Combo
 
 
 class PlayerSelector:
@@ -122,12 +124,35 @@ class PlayerSelector:
     # player's combo
     ####################################################################################
 
+    def evaluate_all_combos(self) -> dict[Player, Combo | None]:
+        """
+        Evaluate combos for all players at once. Table cards are counted only once,
+        than every player's hand is folded into a copy of table bitboard.
+        """
+        if not self._source:
+            return {}
+        table = CardsBitboard(self._source[0].game.table)
+        return {player: player.evaluate_combo(table) for player in self._source}
+
     @property
     def groupby_combo(self):
-        key = attrgetter('combo')
-        sorted_by_combo = sorted(self.active, key=key, reverse=True)
-        for combo, players in itertools.groupby(sorted_by_combo, key):
-            yield players
+        # [NOTE]
+        # combo is evaluated only once for every player, than players are sorted and
+        # grouped by combo strength key (not by deep combos comparison)
+        combos = PlayerSelector(tuple(self.active)).evaluate_all_combos()
+        evaluated = [
+            (combo.strength, player)
+            for player, combo in combos.items()
+            if combo is not None
+        ]
+        evaluated.sort(key=itemgetter(0), reverse=True)
+        for strength, group in itertools.groupby(evaluated, itemgetter(0)):
+            yield [player for _, player in group]
+
+        # players without any cards have no combo at all: they are the weakest
+        no_combo = [player for player, combo in combos.items() if combo is None]
+        if no_combo:
+            yield no_combo
 
     @property
     def winners(self):
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
+    Any,
     ClassVar,
     Generic,
     Literal,
@@ -60,8 +61,15 @@ class BaseAction:
     name = 'action'
     message: str = '{player} did action'
 
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {'player': self.player}
+
     def get_message_format(self):
-        return self.message.format(player=self.player)
+        return self.message.format(**self.get_message_kwargs())
+
+    def get_event_details(self) -> dict[str, Any]:
+        """Extra data for game event to replay action. """
+        return {}
 
     def __init__(self, game: Game, player: Player) -> None:
         check_objects_continuity(player, game.players)
@@ -105,6 +113,7 @@ class BaseAction:
         Simple shortcut for running proccessor just after action added to it.
         If `user` is not provided, `performer` will be taken.
         """
+        player: Player | None
         if isinstance(user, User):
             # at user instance from players, profile bank is prefetched, not at request
             # user therefore we use this trick to get player with prefethed fields and
@@ -299,8 +308,8 @@ class KickOut(LeaveGame):
     def act(self):
         self.destroy(self.value)
 
-    def get_message_format(self):
-        return self.message.format(player=self.player.user, kicker=self.value)
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {'player': self.player.user, 'kicker': self.value}
 
 
 ########################################################################################
@@ -326,8 +335,8 @@ class PlaceBet(BaseAction):
     value: int
 
 
-    def get_message_format(self):
-        return self.message.format(player=self.player.user, value=self.value)
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {'player': self.player.user, 'value': self.value}
 
     def __init__(self, game: Game, player: Player, value: int):
         self.value = value
@@ -351,11 +360,11 @@ class PlaceBlind(PlaceBet):
     help_text: str = 'blind is a neccessary bet at beginings'
     values_expected = False
 
-    def get_message_format(self):
-        return self.message.format(
-            player=self.player.user,
-            blind='small' if self.value == self.game.config.small_blind else 'big',
-        )
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {
+            'player': self.player.user,
+            'blind': 'small' if self.value == self.game.config.small_blind else 'big',
+        }
 
     def __init__(self, game: Game, player: Player):
         super(PlaceBet, self).__init__(game, player)
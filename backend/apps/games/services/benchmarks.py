@@ -0,0 +1,218 @@
+"""
+Benchmarks for combinations evaluation hot path.
+
+Deals are generated randomly (but seeded) for shipped configs. Every benchmark is
+run for several rounds and timings stats are collected in the same way as
+pytest-benchmark does (min, max, mean, median, stddev). Results are plain dicts, so
+they could be dumped into JSON and compared between releases. No database is used:
+games and players are not saved instances.
+
+Run by `python manage.py benchmark_combos`.
+"""
+
+from __future__ import annotations
+
+import platform
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterable
+
+from core.utils import init_logger
+from games.configurations.configurations import CONFIG_SCHEMAS, GameConfig
+from games.services.cards import CardList, Decks
+from games.services.combos import ComboStacks, combo_cache
+
+logger = init_logger(__name__)
+
+CONFIG_NAMES = ('classic', 'bizarre', 'cheeky', 'foolish')
+JOKERS_DENSITIES = (0.0, 0.1, 0.3)
+PLAYERS_AMOUNTS = (2, 4, 8)
+DEFAULT_ROUNDS = 20
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings stats (in seconds) for one benchmark run.
+    """
+
+    name: str
+    params: dict[str, Any]
+    rounds: int
+    stats: dict[str, float] = field(default_factory=dict)
+
+
+def measure(
+    func: Callable[[], Any],
+    rounds: int,
+    setup: Callable[[], Any] | None = None,
+) -> dict[str, float]:
+    """
+    Call `func` several times (and `setup` before every call, it is not timed).
+    """
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.mean(timings),
+        'median': statistics.median(timings),
+        'stddev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def deal(
+    config: GameConfig,
+    rnd: random.Random,
+    players_amount: int,
+    jokers_density: float,
+) -> tuple[list[CardList], CardList]:
+    """
+    Random hands and table cards (full amounts for config) drawn from one shuffled
+    deck. Every card is replaced by a joker with `jokers_density` probability, but
+    there are no more jokers than config deck has.
+    """
+    template = Decks.template(config.deck)
+    deck = CardList(instance=(card for card in template if not card.is_joker))
+    deck.shuffle(rnd)
+    jokers = CardList(instance=(card for card in template if card.is_joker))
+    jokers = jokers.shuffle(rnd)[: config.deck.jokers_amount]
+
+    def cards(amount: int) -> CardList:
+        drawn = deck.draw(amount)
+        for i in range(len(drawn)):
+            if rnd.random() < jokers_density and jokers:
+                drawn[i] = jokers.pop()
+        return drawn
+
+    hands = [cards(sum(config.deal_cards_amounts)) for _ in range(players_amount)]
+    return hands, cards(sum(config.flops_amounts))
+
+
+def clear_caches() -> None:
+    combo_cache.clear()
+
+
+def bench_track_and_merge(
+    config_name: str, jokers_density: float, rounds: int, seed: int
+) -> BenchmarkResult:
+    config = CONFIG_SCHEMAS[config_name]
+    rnd = random.Random(seed)
+    deals = [deal(config, rnd, 1, jokers_density) for _ in range(rounds)]
+    deals_iter = iter(deals)
+
+    def track_and_merge():
+        (hand,), table = next(deals_iter)
+        ComboStacks().track_and_merge(
+            hand,
+            table,
+            references=config.combos,
+            possible_highest=config.deck.interval.max,
+            possible_lowest=config.deck.interval.min,
+        )
+
+    return BenchmarkResult(
+        'ComboStacks.track_and_merge',
+        {'config': config_name, 'jokers_density': jokers_density},
+        rounds,
+        measure(track_and_merge, rounds),
+    )
+
+
+def bench_winners(
+    config_name: str, players_amount: int, rounds: int, seed: int
+) -> BenchmarkResult:
+    # not saved instances: Game and Player are imported here because of circular
+    # imports (models import services)
+    from games.models import Game, Player
+
+    config = CONFIG_SCHEMAS[config_name]
+    rnd = random.Random(seed)
+    games = []
+    for _ in range(rounds):
+        hands, table = deal(config, rnd, players_amount, 0.0)
+        game = Game(pk=1, config_name=config_name, table=table)
+        players = [
+            Player(pk=i + 1, game=game, hand=hand, position=i)
+            for i, hand in enumerate(hands)
+        ]
+        game.select_players(players)
+        games.append(game)
+    games_iter = iter(games)
+
+    def winners():
+        list(next(games_iter).players.winners)
+
+    return BenchmarkResult(
+        'PlayerSelector.winners',
+        {'config': config_name, 'players_amount': players_amount},
+        rounds,
+        measure(winners, rounds, setup=clear_caches),
+    )
+
+
+def bench_cardlist(
+    config_name: str, jokers_density: float, rounds: int, seed: int
+) -> list[BenchmarkResult]:
+    config = CONFIG_SCHEMAS[config_name]
+    rnd = random.Random(seed)
+    players_amount = max(PLAYERS_AMOUNTS)
+    cards = []
+    for _ in range(rounds):
+        hands, table = deal(config, rnd, players_amount, jokers_density)
+        cards.append(CardList(instance=[c for hand in hands for c in hand] + table))
+    params = {'config': config_name, 'jokers_density': jokers_density}
+
+    sortby_iter = iter([c.copy() for c in cards])
+    groupby_iter = iter([c.copy() for c in cards])
+    return [
+        BenchmarkResult(
+            'CardList.sortby',
+            params,
+            rounds,
+            measure(lambda: next(sortby_iter).sortby('rank'), rounds),
+        ),
+        BenchmarkResult(
+            'CardList.groupby',
+            params,
+            rounds,
+            measure(lambda: list(next(groupby_iter).groupby('suit')), rounds),
+        ),
+    ]
+
+
+def run(
+    config_names: Iterable[str] = CONFIG_NAMES,
+    rounds: int = DEFAULT_ROUNDS,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Run all benchmarks. Return JSON-serializable report.
+    """
+    results: list[BenchmarkResult] = []
+    for config_name in config_names:
+        for density in JOKERS_DENSITIES:
+            results.append(bench_track_and_merge(config_name, density, rounds, seed))
+            results.extend(bench_cardlist(config_name, density, rounds, seed))
+        for players_amount in PLAYERS_AMOUNTS:
+            results.append(bench_winners(config_name, players_amount, rounds, seed))
+        logger.info(f'Benchmarks for {config_name} are done. ')
+
+    clear_caches()
+    return {
+        'machine_info': {
+            'python_version': platform.python_version(),
+            'python_implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+        },
+        'options': {'rounds': rounds, 'seed': seed},
+        'benchmarks': [asdict(result) for result in results],
+    }
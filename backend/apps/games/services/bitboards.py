@@ -0,0 +1,218 @@
+"""
+Bitboard representation of cards for fast combinations tracking.
+
+Instead of sorting and grouping CardList several times for every tracking method,
+cards are counted once into rank/suit masks and counters. Rank groups, flush groups
+and straight windows are taken from that counters by bit operations.
+
+Multi-deck duplicates (the same card several times at one source) are supported by
+counters, masks describe only presence of card value.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from operator import attrgetter
+from typing import Iterable, Iterator
+
+from core.utils import init_logger
+from games.services.cards import Card, CardList, JokerCard, get_card
+
+logger = init_logger(__name__)
+
+
+def bits_desc(mask: int) -> Iterator[int]:
+    """
+    Yield set bits positions from highest to smallest.
+
+    >>> list(bits_desc(0b10110))
+    [4, 2, 1]
+    """
+    while mask:
+        bit = mask.bit_length() - 1
+        yield bit
+        mask ^= 1 << bit
+
+
+def runs_desc(mask: int) -> list[tuple[int, int]]:
+    """
+    Find all runs of set bits (one by one without gaps) from highest to smallest.
+    Return list of `(highest bit, run length)`.
+
+    >>> runs_desc(0b1110_0111_0100)
+    [(11, 3), (6, 3), (2, 1)]
+    """
+    runs: list[tuple[int, int]] = []
+    while mask:
+        high = mask.bit_length() - 1
+        # zeros under the highest bit, the highest of them breaks the run
+        gaps = ~mask & ((1 << high + 1) - 1)
+        low = gaps.bit_length()
+        runs.append((high, high - low + 1))
+        mask &= (1 << low) - 1
+    return runs
+
+
+class CardsBitboard:
+    """
+    Cards counted by rank and suit.
+
+    `rank_mask`: bit for every presented rank
+    `suit_masks`: rank bits for every suit (and `rank_suits` vice versa)
+    `counts`: amount of every card value (more than 1 for multi-deck configs)
+    `jokers`: not mirrored jokers
+
+    >>> board = CardsBitboard(CardList('Ace|H', 'King|H', 'King|C', 'black'))
+    >>> board.groups('rank')
+    [(14, 1), (13, 2)]
+    >>> board.group('rank', 13) == CardList('King|H', 'King|C')
+    True
+    """
+
+    __slots__ = (
+        'counts',
+        'rank_counts',
+        'suit_counts',
+        'rank_mask',
+        'suit_masks',
+        'rank_suits',
+        'jokers',
+        'mirrored',
+    )
+
+    counts: Counter[tuple[int, int]]
+    rank_counts: Counter[int]
+    suit_counts: Counter[int]
+    rank_mask: int
+    suit_masks: dict[int, int]
+    rank_suits: dict[int, int]
+    jokers: list[JokerCard]
+    mirrored: int
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self.counts = Counter()
+        self.rank_counts = Counter()
+        self.suit_counts = Counter()
+        self.rank_mask = 0
+        self.suit_masks = {}
+        self.rank_suits = {}
+        self.jokers = []
+        self.mirrored = 0
+        self.extend(cards)
+
+    def __repr__(self) -> str:
+        return f'CardsBitboard({self.cards("rank")})'
+
+    def __add__(self, other: CardsBitboard) -> CardsBitboard:
+        new = self.copy()
+        new.update(other)
+        return new
+
+    def copy(self) -> CardsBitboard:
+        new = CardsBitboard()
+        new.update(self)
+        return new
+
+    def update(self, other: CardsBitboard) -> None:
+        """Add all cards from other bitboard."""
+        self.counts.update(other.counts)
+        self.rank_counts.update(other.rank_counts)
+        self.suit_counts.update(other.suit_counts)
+        self.rank_mask |= other.rank_mask
+        for suit, mask in other.suit_masks.items():
+            self.suit_masks[suit] = self.suit_masks.get(suit, 0) | mask
+        for rank, mask in other.rank_suits.items():
+            self.rank_suits[rank] = self.rank_suits.get(rank, 0) | mask
+        self.jokers.extend(other.jokers)
+        self.mirrored += other.mirrored
+
+    def add(self, card: Card) -> None:
+        if isinstance(card, JokerCard):
+            if card.is_mirror:
+                # [NOTE] mirrored jokers are not supported, only counted
+                self.mirrored += 1
+            else:
+                self.jokers.append(card)
+            return
+
+        rank, suit = card.rank, card.suit
+        assert rank is not None and suit is not None, f'not tracked card {card}'
+        self.counts[(rank, suit)] += 1
+        self.rank_counts[rank] += 1
+        self.suit_counts[suit] += 1
+        self.rank_mask |= 1 << rank
+        self.suit_masks[suit] = self.suit_masks.get(suit, 0) | 1 << rank
+        self.rank_suits[rank] = self.rank_suits.get(rank, 0) | 1 << suit
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.add(card)
+
+    @property
+    def length(self) -> int:
+        """Amount of all cards (including jokers)."""
+        return self.rank_counts.total() + len(self.jokers) + self.mirrored
+
+    @property
+    def is_trackable(self) -> bool:
+        """Mirrored jokers could not be tracked by bitboard."""
+        return not self.mirrored
+
+    def groups(self, attr: str) -> list[tuple[int, int]]:
+        """
+        Values of rank/suit from highest to smallest with amount of cards.
+        """
+        counts = self.rank_counts if attr == 'rank' else self.suit_counts
+        return [(value, counts[value]) for value in sorted(counts, reverse=True)]
+
+    def group(self, attr: str, value: int) -> CardList:
+        """
+        All cards with specific rank/suit value sorted by another attribute.
+        """
+        group = CardList()
+        if attr == 'rank':
+            for suit in bits_desc(self.rank_suits.get(value, 0)):
+                group.extend([get_card(value, suit)] * self.counts[(value, suit)])
+        else:
+            for rank in bits_desc(self.suit_masks.get(value, 0)):
+                group.extend([get_card(rank, value)] * self.counts[(rank, value)])
+        return group
+
+    def highest(self, attr: str) -> Card:
+        """
+        The highest card sorted by attr and than by another attribute.
+        """
+        if attr == 'rank':
+            rank = self.rank_mask.bit_length() - 1
+            suit = self.rank_suits[rank].bit_length() - 1
+        else:
+            suit = max(self.suit_masks)
+            rank = self.suit_masks[suit].bit_length() - 1
+        return get_card(rank, suit)
+
+    def rows(self) -> list[tuple[int, int]]:
+        """
+        Straight windows: runs of ranks as `(highest rank, length)`.
+        """
+        return runs_desc(self.rank_mask)
+
+    def row(self, highest: int, length: int) -> CardList:
+        """
+        Cards of straight window: one card for each rank (with the highest suit).
+        """
+        return CardList(
+            instance=(
+                get_card(rank, self.rank_suits[rank].bit_length() - 1)
+                for rank in range(highest, highest - length, -1)
+            )
+        )
+
+    def cards(self, attr: str = 'rank') -> CardList:
+        """
+        All cards sorted by attr (the same order as `CardList.sortby`).
+        """
+        cards = CardList()
+        for value, _ in self.groups(attr):
+            cards.extend(self.group(attr, value))
+        cards.extend(sorted(self.jokers, key=attrgetter('kind'), reverse=True))
+        return cards
@@ -35,8 +35,12 @@ from __future__ import annotations
 import functools
 import itertools
 import random
+import zlib
+from array import array
+from collections.abc import MutableSequence
 from operator import attrgetter
-from typing import TYPE_CHECKING, ClassVar, Generator, Iterable, SupportsIndex, TypeAlias, overload
+from types import EllipsisType
+from typing import TYPE_CHECKING, ClassVar, Generator, Iterable, Iterator, SupportsIndex, TypeAlias, overload
 
 from core.utils import eq_first, init_logger, range_inclusevly, split
 
@@ -173,11 +177,17 @@ class Card:
         def classic_shirt(c: Card) -> str:
             return Card.Text.CLASSIC['shirt']
 
+    __slots__ = ('rank', 'suit')
+
+    rank: int | None
+    suit: int | None
+
     def __init__(
         self, rank: int | str | Card | None = None, suit: int | str | None = None
     ) -> None:
-        self.rank: int | None
-        self.suit: int | None
+        _rank: int | None
+        _suit: int | None | EllipsisType = ...  # not defined yet
+
         # in case when all rank and suit described only in rank attribute
         if isinstance(rank, str):
             splited = split(rank)
@@ -203,9 +213,9 @@ class Card:
             assert not suit, f'not supported: {rank=} | {suit=} together'
             instance = rank
             if isinstance(instance, tuple):
-                self.rank, self.suit = instance
+                _rank, _suit = instance
             elif isinstance(instance, Card):
-                self.rank, self.suit = (instance.rank, instance.suit)
+                _rank, _suit = (instance.rank, instance.suit)
             else:
                 raise ValueError(f'not supported {instance=}')
         elif isinstance(rank, str):
@@ -219,9 +229,9 @@ class Card:
                 )
             except StopIteration:
                 raise ValueError(f'not supported: {rank=} | {suit=}')
-            self.rank = Card.Text.get_rank_value(filtered)
+            _rank = Card.Text.get_rank_value(filtered)
         else:
-            self.rank = rank
+            _rank = rank
 
         if isinstance(suit, str):
             try:
@@ -230,18 +240,45 @@ class Card:
                 )
             except StopIteration:
                 raise ValueError(f'not supported: {rank=} | {suit=}')
-            self.suit = Card.Text.get_suit_value(filtered)
-        elif not hasattr(self, 'suit'):
-            # hasattr - because we probably set this attribute upper
-            self.suit = suit
+            _suit = Card.Text.get_suit_value(filtered)
+        elif _suit is ...:
+            # because we probably set this value upper
+            _suit = suit
 
-        if (self.rank is not None and self.suit is None) or (
-            self.rank is None and self.suit is not None
+        if (_rank is not None and _suit is None) or (
+            _rank is None and _suit is not None
         ):
             raise ValueError(
-                f'not supported: {rank=} | {suit=}. \n{self.rank = } | {self.suit = }'
+                f'not supported: {rank=} | {suit=}. \n'
+                f'self.rank = {_rank!r} | self.suit = {_suit!r}'
             )
 
+        # [NOTE]
+        # cards are immutable, so attributes are set only once here bypassing
+        # __setattr__ restriction
+        object.__setattr__(self, 'rank', _rank)
+        object.__setattr__(self, 'suit', _suit)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable. ')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable. ')
+
+    def __copy__(self) -> Card:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Card:
+        # immutable object: the same instance could be shared by any copies
+        return self
+
+    def __reduce__(self):
+        # unpickled cards are taken from registry as well
+        return (get_card, (self.rank, self.suit))
+
+    def __hash__(self) -> int:
+        return hash((self.rank, self.suit))
+
     def __getitem__(self, key: str) -> int:
         """
         Card support access to self attributes via card[key].
@@ -249,7 +286,10 @@ class Card:
         >>> Card('Ace|Hearts')['rank']
         14
         """
-        return self.__dict__[key]
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
 
     def get_str(self, method_name: str = 'classic'):
         """
@@ -307,7 +347,7 @@ class Card:
         self, reflection: Card, attr: str | None = None, val: int | None = None
     ) -> JokerCard:
         """
-        Create and return new JokerCard mirrored from reflection.
+        Get JokerCard mirrored from reflection (from cards registry, see `get_joker`).
         Also set a specific value for refelection attrubite before.
 
         Parameters
@@ -375,11 +415,15 @@ class JokerCard(Card):
             except IndexError:
                 return Card.Text.default(c)
 
+    __slots__ = ('kind',)
+
+    kind: int
+
     def __init__(
         self,
         kind: int | str | JokerCard,
         reflection: Card | str | None = None,
-        initial: dict[str, int] = {},
+        initial: dict[str, int | None] = {},
     ) -> None:
         if isinstance(kind, str):
             splited = split(kind)
@@ -392,14 +436,14 @@ class JokerCard(Card):
                 assert not reflection
                 reflection = '|'.join(splited)
             if isinstance(kind, str):
-                self.kind = JokerCard.Text.get_kind_value(kind)
+                object.__setattr__(self, 'kind', JokerCard.Text.get_kind_value(kind))
             else:
                 raise ValueError(f'JokerCard defenition goes in wrong way: {kind=}')
 
         elif isinstance(kind, int):
-            self.kind = kind
+            object.__setattr__(self, 'kind', kind)
         elif isinstance(kind, JokerCard):
-            self.kind = kind.kind
+            object.__setattr__(self, 'kind', kind.kind)
         else:
             raise TypeError()
 
@@ -411,7 +455,13 @@ class JokerCard(Card):
             super().__init__()
 
         for k in initial:
-            self.__dict__[k] = initial[k]
+            assert k in Card.__slots__, f'not supported: {k=}'
+            object.__setattr__(self, k, initial[k])
+
+    def __reduce__(self):
+        return (get_joker, (self.kind, self.rank, self.suit))
+
+    __hash__ = Card.__hash__
 
     def __lt__(self, other: object) -> bool:
         if isinstance(other, JokerCard):
@@ -438,8 +488,14 @@ class JokerCard(Card):
     ) -> JokerCard:
         assert isinstance(reflection, Card)
         assert (attr is not None and val is not None) or (attr is None and val is None)
-        initial = {attr: val} if isinstance(attr, str) and isinstance(val, int) else {}
-        return JokerCard(self, reflection, initial)
+        rank, suit = reflection.rank, reflection.suit
+        if attr == 'rank':
+            rank = val
+        elif attr == 'suit':
+            suit = val
+        elif attr is not None:
+            raise ValueError(f'not supported: {attr=}')
+        return get_joker(self.kind, rank, suit)
 
 
 class CardList(list[Card]):
@@ -491,27 +547,9 @@ class CardList(list[Card]):
                 raise NotImplementedError('Tuple definition for card not available. ')
             elif isinstance(card, str):
                 assert not new_card_instances, 'not supported for `str` defenition'
-                assert (
-                    ' ' not in card
-                ), 'card contains space symbol, but it reserved for CardList seperator'
-                assert (
-                    '[' not in card and ']' not in card
-                ), 'card contains [] symbols, but it reserved for Stacks seperator'
-                try:
-                    yield Card(card)
-                except ValueError as card_exc:
-                    try:
-                        yield JokerCard(card)
-                    except ValueError as joker_exc:
-                        raise ValueError(
-                            f'not supported: {card = }\n',
-                            *card_exc.args,
-                            *joker_exc.args,
-                        )
-                    except EmptyValueError:
-                        continue
-                except EmptyValueError:
-                    continue
+                parsed = parse_card(card)
+                if parsed is not None:
+                    yield parsed
             else:
                 raise ValueError(
                     f'Invalid card type: {type(card)}. ', f'{card=} in {cards=}. '
@@ -581,7 +619,7 @@ class CardList(list[Card]):
 
     def __getitem__(self, __s: SupportsIndex | slice, /) -> CardList | Card:
         return (
-            CardList(*super().__getitem__(__s))
+            CardList(instance=super().__getitem__(__s))
             if isinstance(__s, slice)
             else super().__getitem__(__s)
         )
@@ -609,13 +647,29 @@ class CardList(list[Card]):
     def last(self) -> Card:
         return self[-1]
 
-    def shuffle(self) -> CardList:
+    def shuffle(self, rnd: random.Random | None = None) -> CardList:
         """
-        Shuffle self list of cards and return self
+        Shuffle self list of cards (by `rnd` if provided) and return self
         """
-        random.shuffle(self)
+        (rnd or random).shuffle(self)
         return self
 
+    def draw(self, amount: int) -> CardList:
+        """
+        Remove `amount` cards from the end of list and return them at the same order
+        as they were poped one by one (the last card goes first).
+
+        >>> cards = CardList('2|C', '3|C', '4|C')
+        >>> cards.draw(2), cards
+        ([4|C, 3|C], [2|C])
+        """
+        if amount > len(self):
+            raise IndexError(f'draw {amount} cards from list of {len(self)} cards')
+        start = len(self) - amount
+        drawn = CardList(instance=reversed(super().__getitem__(slice(start, None))))
+        del self[start:]
+        return drawn
+
     def sortby(self, attr: str = 'rank', *, reverse: bool = True) -> CardList:
         """
         Total 'in place' sorting by specific attribute `rank` or `suit`. Using Card
@@ -698,24 +752,552 @@ class CardList(list[Card]):
             yield bool(key is None), CardList(instance=group)
 
 
+class CardArray(MutableSequence[Card]):
+    """
+    Compact alternative to `CardList`. Cards are stored as small integer codes at
+    `array('H')` and decoded to (shared) `Card` instances only on demand, so
+    slicing, extending and deleting is a plain memory copy of codes.
+
+    Has the same API as `CardList`: `sortby`, `groupby`, `isolate_jokers`,
+    slicing, `first`, `last`, `shuffle` and other list methods.
+
+    Code bits: `[kind:1][joker:1][rank:4][suit:3]`. Not mirrored jokers has zero
+    rank and suit bits.
+
+    >>> cards = CardArray('2|C', 'Ace|H', 'red(Ace|S)')
+    >>> cards.sortby('rank')
+    [red(Ace|S), Ace|H, 2|C]
+    >>> cards[1:] == CardList('Ace|H', '2|C')
+    True
+    """
+
+    __slots__ = ('_codes',)
+    _codes: array
+
+    def __init__(
+        self,
+        *cards: Card | JokerCard | str,
+        instance: Iterable[Card] | str | None = None,
+    ) -> None:
+        if isinstance(instance, CardArray):
+            assert not cards, 'Not supported definition for `instance` and `cards`. '
+            self._codes = array('H', instance._codes)
+        elif isinstance(instance, str):
+            self._codes = array('H', map(encode_card, CardList(instance=instance)))
+        elif instance is not None:
+            assert not cards, 'Not supported definition for `instance` and `cards`. '
+            self._codes = array('H', map(encode_card, instance))
+        else:
+            self._codes = array('H', map(encode_card, CardList.generator(*cards)))
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[int]) -> CardArray:
+        cards = cls.__new__(cls)
+        cards._codes = array('H', codes)
+        return cards
+
+    @property
+    def codes(self) -> array:
+        return self._codes
+
+    def __repr__(self) -> str:
+        return list(self).__repr__()
+
+    def __str__(self) -> str:
+        return ' '.join([c.__str__() for c in self])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CardArray) and self._codes == other._codes:
+            return True
+        if isinstance(other, (list, CardArray)):
+            # compare cards (not codes): mirrored joker is equal to its reflection
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __iter__(self) -> Iterator[Card]:
+        return map(decode_card, self._codes)
+
+    def __reversed__(self) -> Iterator[Card]:
+        return map(decode_card, reversed(self._codes))
+
+    def __contains__(self, value: object) -> bool:
+        return any(value == card for card in self)
+
+    @overload
+    def __getitem__(self, __i: SupportsIndex, /) -> Card:
+        ...
+
+    @overload
+    def __getitem__(self, __s: slice, /) -> CardArray:
+        ...
+
+    def __getitem__(self, __s: SupportsIndex | slice, /) -> CardArray | Card:
+        if isinstance(__s, slice):
+            return CardArray.from_codes(self._codes[__s])
+        return decode_card(self._codes[__s])
+
+    def __setitem__(self, __s: SupportsIndex | slice, value) -> None:
+        if isinstance(__s, slice):
+            self._codes[__s] = array('H', map(encode_card, value))
+        else:
+            self._codes[__s] = encode_card(value)
+
+    def __delitem__(self, __s: SupportsIndex | slice) -> None:
+        del self._codes[__s]
+
+    def __add__(self, other: Iterable[Card]) -> CardArray:
+        new = self.copy()
+        new.extend(other)
+        return new
+
+    def __copy__(self) -> CardArray:
+        return self.copy()
+
+    def insert(self, index: int, value: Card) -> None:
+        self._codes.insert(index, encode_card(value))
+
+    def insert_left(self, __object: Card) -> None:
+        self.insert(0, __object)
+
+    def append(self, value: Card) -> None:
+        self._codes.append(encode_card(value))
+
+    def extend(self, values: Iterable[Card]) -> None:
+        if isinstance(values, CardArray):
+            self._codes.extend(values._codes)
+        else:
+            self._codes.extend(map(encode_card, values))
+
+    def pop(self, index: int = -1) -> Card:
+        return decode_card(self._codes.pop(index))
+
+    def clear(self) -> None:
+        del self._codes[:]
+
+    def reverse(self) -> None:
+        self._codes.reverse()
+
+    def copy(self, deep: bool = False) -> CardArray:
+        """
+        Return copy of the CardArray. Cards are immutable and shared, so there are no
+        difference between shallow and deep copy.
+        """
+        return CardArray.from_codes(self._codes)
+
+    def tolist(self) -> CardList:
+        return CardList(instance=self)
+
+    @property
+    def length(self) -> int:
+        return self.__len__()
+
+    @property
+    def first(self) -> Card:
+        return self[0]
+
+    @property
+    def last(self) -> Card:
+        return self[-1]
+
+    def shuffle(self, rnd: random.Random | None = None) -> CardArray:
+        """
+        Shuffle self array of cards (by `rnd` if provided) and return self
+        """
+        (rnd or random).shuffle(self._codes)
+        return self
+
+    def draw(self, amount: int) -> CardArray:
+        """
+        The same as `CardList.draw`.
+        """
+        if amount > len(self):
+            raise IndexError(f'draw {amount} cards from array of {len(self)} cards')
+        start = len(self) - amount
+        drawn = CardArray.from_codes(self._codes[start:])
+        drawn.reverse()
+        del self._codes[start:]
+        return drawn
+
+    def sortby(self, attr: str = 'rank', *, reverse: bool = True) -> CardArray:
+        """
+        Total 'in place' sorting. The same as `CardList.sortby`, but keys are taken
+        from precalculated codes table.
+
+        return self
+        """
+        assert attr in ('rank', 'suit')
+        key = functools.partial(_code_sort_key, attr=attr)
+        self._codes = array('H', sorted(self._codes, key=key, reverse=reverse))
+        return self
+
+    def isolate_jokers(
+        self, *, sort_attr: str, sort_reverse: bool = True
+    ) -> tuple[CardArray, CardArray]:
+        """
+        Isolate not mirrored jokers into a new array. Self array is sorted(!) inside.
+
+        Return `self`, `jokers`
+        """
+        self.sortby(sort_attr, reverse=sort_reverse)
+        jokers = CardArray()
+        index = -1 if sort_reverse else 0
+        while self._codes and _is_free_joker_code(self._codes[index]):
+            jokers._codes.append(self._codes.pop(index))
+        return self, jokers
+
+    def groupby(self, attr: str) -> Generator[tuple[bool, CardArray], None, None]:
+        """
+        Yield CardArray (a group) of equal ranks/suits in a row from highest to
+        smallest. The same as `CardList.groupby`.
+        """
+        self.sortby(attr)
+        key = _code_rank if attr == 'rank' else _code_suit
+
+        for value, group in itertools.groupby(self._codes, key=key):
+            yield bool(value is None), CardArray.from_codes(group)
+
+
+################################################################################
+# Cards parsing
+################################################################################
+# [NOTE]
+# Parsing card by `Card.__init__` is slow (regex splitting, scanning text tables,
+# retrying as JokerCard through exceptions). But every game loading deserialize
+# deck, table and all players hands, so we use precalculated table
+# `token -> card` for all common spellings instead. Unknown spellings are parsed
+# in slow way and memorized too (cards are immutable and shared).
+
+CARD_TOKENS_LIMIT = 10_000
+"""Max size of tokens table (to prevent growing by memorizing any garbage)."""
+
+
+def parse_card(token: str) -> Card | None:
+    """
+    Get shared card instance by its string representation. Return None for blank
+    token (like '').
+
+    >>> parse_card('red(Jack|C)') is parse_card('red(J|c)')
+    True
+    """
+    table = _card_tokens_table()
+    try:
+        return table[token]
+    except KeyError:
+        pass
+
+    card = _parse_card_slow(token)
+    if len(table) < CARD_TOKENS_LIMIT:
+        table[token] = card
+    return card
+
+
+def parse_cards(value: str) -> list[Card]:
+    """
+    Parse cards seperated by space symbol (CardListField representation).
+    """
+    return [card for token in value.split(' ') if (card := parse_card(token))]
+
+
+def _parse_card_slow(card: str) -> Card | None:
+    assert (
+        ' ' not in card
+    ), 'card contains space symbol, but it reserved for CardList seperator'
+    assert (
+        '[' not in card and ']' not in card
+    ), 'card contains [] symbols, but it reserved for Stacks seperator'
+    try:
+        return intern_card(Card(card))
+    except ValueError as card_exc:
+        try:
+            return intern_card(JokerCard(card))
+        except ValueError as joker_exc:
+            raise ValueError(
+                f'not supported: {card = }\n',
+                *card_exc.args,
+                *joker_exc.args,
+            )
+        except EmptyValueError:
+            return None
+    except EmptyValueError:
+        return None
+
+
+@functools.cache
+def _card_tokens_table() -> dict[str, Card | None]:
+    """
+    Table for every common card spelling: `A|h`, `Ace|Hearts`, `14|3`, `black`,
+    `red(Jack|C)`... Values are taken from slow parser, so results are the same.
+    """
+    ranks = range_inclusevly(2, len(Card.Text.ENG['rank']) - 1)
+    suits = range_inclusevly(1, len(Card.Text.ENG['suit']) - 1)
+
+    def rank_spellings(rank: int):
+        name = Card.Text.ENG['rank'][rank]
+        return {name, name[0], str(rank)}
+
+    def suit_spellings(suit: int):
+        name = Card.Text.ENG['suit'][suit]
+        return {name, name[0], name[0].lower(), str(suit)}
+
+    cards = [
+        f'{r}|{s}'
+        for rank, suit in itertools.product(ranks, suits)
+        for r, s in itertools.product(rank_spellings(rank), suit_spellings(suit))
+    ]
+    kinds = JokerCard.Text.ENG['joker']
+    jokers = kinds + [f'{kind}({card})' for kind in kinds for card in cards]
+
+    table: dict[str, Card | None] = {'': None}
+    for token in itertools.chain(cards, jokers):
+        table[token] = _parse_card_slow(token)
+    return table
+
+
+def encode_card(card: Card) -> int:
+    """
+    Code card into integer for `CardArray` storage.
+
+    >>> decode_card(encode_card(Card('Ace|H'))) == Card('Ace|H')
+    True
+    """
+    code = (card.rank or 0) << 3 | (card.suit or 0)
+    if isinstance(card, JokerCard):
+        code |= _JOKER_FLAG | card.kind << 8
+    return code
+
+
+@functools.cache
+def decode_card(code: int) -> Card:
+    if code & _JOKER_FLAG:
+        return get_joker(code >> 8, _code_rank(code), _code_suit(code))
+    return get_card(_code_rank(code), _code_suit(code))
+
+
+_JOKER_FLAG = 1 << 7
+
+
+def _code_rank(code: int) -> int | None:
+    return code >> 3 & 0b1111 or None
+
+
+def _code_suit(code: int) -> int | None:
+    return code & 0b111 or None
+
+
+def _is_free_joker_code(code: int) -> bool:
+    # not mirrored joker
+    return bool(code & _JOKER_FLAG) and not code & 0b1111111
+
+
+@functools.cache
+def _code_sort_key(code: int, attr: str) -> tuple[int, int, int]:
+    # the same key as at `CardList.sortby`
+    rank, suit = _code_rank(code), _code_suit(code)
+    if code & _JOKER_FLAG and rank is None and suit is None:
+        return (-1, -1, code >> 8)
+
+    value, another = (rank, suit) if attr == 'rank' else (suit, rank)
+    assert value is not None and another is not None, f'invalid card {code=}'
+    if code & _JOKER_FLAG:
+        return (value, another, code >> 8)
+    return (value, another, 1000 if SET_JOKERS_AFTER_EQUAL_CARD else -1)
+
+
 Stacks: TypeAlias = list[CardList]
 
 
+################################################################################
+# Cards registry
+################################################################################
+# [NOTE]
+# Cards are immutable, so there are no reasons to keep thousands of equal instances
+# in memory (bizarre deck contains more than 200 cards, and every game, player hand
+# and combo stacks refer to them). Registry works as flyweight factory: every
+# distinct card value has only one shared instance.
+#
+# `Card(...)` constructor still creates new instance, use it only when you really
+# need it (mostly tests).
+
+
+@functools.cache
+def _get_card(rank: int | None, suit: int | None) -> Card:
+    return Card(rank, suit)
+
+
+@functools.cache
+def _get_joker(kind: int, rank: int | None, suit: int | None) -> JokerCard:
+    return JokerCard(kind, initial={'rank': rank, 'suit': suit})
+
+
+def get_card(rank: int | None, suit: int | None) -> Card:
+    """
+    Shared card instance from registry.
+
+    >>> get_card(14, 4) is get_card(14, 4)
+    True
+    """
+    return _get_card(rank, suit)
+
+
+def get_joker(kind: int, rank: int | None = None, suit: int | None = None):
+    """
+    Shared joker instance from registry (with reflection if rank and suit provided).
+
+    >>> get_joker(1) is get_joker(1, None, None)
+    True
+    """
+    return _get_joker(kind, rank, suit)
+
+
+def intern_card(card: Card) -> Card:
+    """
+    Replace card by equal instance from registry.
+    """
+    if isinstance(card, JokerCard):
+        return _get_joker(card.kind, card.rank, card.suit)
+    return _get_card(card.rank, card.suit)
+
+
+class SeededDeck:
+    """
+    Shuffled deck stored by deck template, shuffle seed and cursor (amount of drawn
+    cards) instead of cards list. Remaining cards are derived on demand: template is
+    shuffled by `random.Random(seed)` (the same permutation as `CardList.shuffle`
+    makes) and drawn cards are cut off from the end.
+
+    Drawing cards only moves cursor, so there are no cards to store after every deal.
+
+    >>> deck = SeededDeck(CardList('2|C', '3|C', '4|C', '5|C'), seed=1)
+    >>> cards = CardList('2|C', '3|C', '4|C', '5|C').shuffle(random.Random(1))
+    >>> deck.draw(3) == cards.draw(3), deck.cursor, deck == cards
+    (True, 3, True)
+    """
+
+    def __init__(self, template: Iterable[Card], seed: int, cursor: int = 0) -> None:
+        self.template = tuple(template)
+        self.seed = seed
+        self.cursor = cursor
+        self._order: tuple[Card, ...] | None = None
+
+    @property
+    def cursor(self) -> int:
+        """Amount of drawn cards."""
+        return self._cursor
+
+    @cursor.setter
+    def cursor(self, value: int) -> None:
+        self._cursor = value
+
+    @property
+    def order(self) -> tuple[Card, ...]:
+        """All template cards at shuffled order (computed only once)."""
+        if self._order is None:
+            order = list(self.template)
+            random.Random(self.seed).shuffle(order)
+            self._order = tuple(order)
+        return self._order
+
+    @property
+    def template_id(self) -> int:
+        """Checksum of template cards codes to make sure template was not changed."""
+        return zlib.crc32(array('H', map(encode_card, self.template)).tobytes())
+
+    @property
+    def cards(self) -> CardList:
+        """Remaining cards."""
+        return CardList(instance=self.order[: len(self)])
+
+    def __len__(self) -> int:
+        return len(self.template) - self.cursor
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self.order[: len(self)])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SeededDeck):
+            return (self.template, self.seed, self.cursor) == (
+                other.template,
+                other.seed,
+                other.cursor,
+            )
+        if isinstance(other, (CardList, CardArray)):
+            return self.cards == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.seed}, {len(self)} cards)'
+
+    def __str__(self) -> str:
+        return str(self.cards)
+
+    def copy(self) -> CardList:
+        """Remaining cards (as a new list)."""
+        return self.cards
+
+    def draw(self, amount: int) -> CardList:
+        """
+        The same as `CardList.draw`, but cards are not removed, cursor is moved.
+        """
+        if amount > len(self):
+            raise IndexError(f'draw {amount} cards from deck of {len(self)} cards')
+        end = len(self)
+        drawn = CardList(instance=reversed(self.order[end - amount : end]))
+        self.cursor += amount
+        return drawn
+
+    def clear(self) -> None:
+        self.cursor = len(self.template)
+
+
 class Decks:
     """
     Class for decks generators used to filled up game deck before every round begins.
     """
 
+    _templates: ClassVar[dict[tuple, tuple[Card, ...]]] = {}
+
+    @classmethod
+    def template(cls, config: DeckConfig) -> tuple[Card, ...]:
+        """
+        Immutable deck template for config. Generator is called only once for every
+        deck configuration, then the same (shared) cards are used for every round.
+        """
+        if isinstance(config.generator, CardList):
+            return tuple(config.generator)
+        if not callable(config.generator):
+            raise TypeError(f'not supported: {config.generator=}')
+
+        # [NOTE]
+        # key is built from config values, not config instance itself, because
+        # config could be temporally changed (see tests fixtures)
+        key = (
+            config.generator,
+            *config.interval.borders,
+            config.jokers_amount,
+            config.iterations_amount,
+        )
+        try:
+            return cls._templates[key]
+        except KeyError:
+            template = cls._templates[key] = tuple(config.generator(config))
+            return template
+
     @staticmethod
     def full_deck_plus_jokers(config: DeckConfig):
         min, max = config.interval.borders
         for _ in range(config.iterations_amount):
             for rank in reversed(range_inclusevly(min.rank, max.rank)):
                 for suit in reversed(range_inclusevly(min.suit, max.suit)):
-                    yield Card(rank, suit)
+                    yield get_card(rank, suit)
 
             for i in range(config.jokers_amount):
-                yield JokerCard('red') if i % 2 else JokerCard('black')
+                yield get_joker(0) if i % 2 else get_joker(1)  # red / black
 
     @staticmethod
     def factory_from(table: CardList, hands: Stacks):
@@ -12,11 +12,13 @@ from asyncio.log import logger
 from operator import attrgetter
 from typing import TYPE_CHECKING
 
-from core.utils import looptools
 from core.utils import is_sorted
-from games.services.cards import Card, CardList, JokerCard, Stacks
+from games.services.bitboards import bits_desc
+from games.services.cards import Card, CardList, Stacks, get_card
+from games.services.jokers import place_row
 
 if TYPE_CHECKING:
+    from games.services.bitboards import CardsBitboard
     from games.services.combos import ComboStacks
 
 
@@ -117,192 +119,108 @@ def track_equal(
 def track_row(
     self: ComboStacks,
     possible_highest: Card,
+    possible_lowest: Card = Card(2, 1),
     condition_key: str = 'row',
     card_attr: str = 'rank',
     min_group_len=2,
     tracking_list_constant=True,
 ):
-    tracking = self.source
-    key = condition_key
-    attr = card_attr
+    # [NOTE]
+    # jokers are placed by `games.services.jokers` engine (the best straight window)
+    assert card_attr == 'rank'
     assert min_group_len >= 2
 
-    # 1- создадим вспомогаетельные переменные для временного хранения
-    # 2- сортировка
-    # нам нужно копировать tracking, чтобы сохранить оригинальный
-    # трекинг-лист (чтобы не изолировать от туда джокеров) только в том
-    # случае, если потом будем еще трекать другие кесы за пределами этой
-    # функции
-    case: Stacks = []
+    tracking = self.source
     if tracking_list_constant:
-        # copy:
-        tracking, jokers = tracking.copy().isolate_jokers(sort_attr=attr)
-    else:
-        tracking, jokers = tracking.isolate_jokers(sort_attr=attr)
-
-    # 3- основной цикл
-    new_group_flag = True
-    cursor = CardList()
-    loop_max_iteration = 99
-    # перебераем кажду карту из трекинга
-    # print.header('\n--- row ----')
-    # print.underline(f'{tracking=} -- {jokers=}\n')
-    for track_card, final in looptools.final(tracking):
-        while True:  # цикл по джокерам
-            # print('')
-            # print.bold(
-            #     f'{loop_max_iteration = } {track_card = } cursor = '
-            #     f'<the same as last case group>'
-            # )
-            # print(f'{case=}')
-            loop_max_iteration -= 1
-            assert loop_max_iteration, 'Achive lopp max iteration.'
-
-            # 3.1 созданеие новой группы
-            if new_group_flag:
-                # 3.1.1 -- добавим пустую группу
-                case.append(CardList())
-                # 3.1.2 -- начнем новую группу с хвоста предыдущего
-                if (
-                    jokers
-                    and cursor  # если вообще есть джокеры
-                    and  # если есть предыдущая группа
-                    # если предыдущая группа не 1 карта + джокеры,
-                    # тогда ее проходить еще раз не имеет смысла
-                    # это значит что ему на хватило джокеров, чтобы сомкнуть разрыв
-                    # и он перетащил все с конца в перед
-                    # [red, King, Quen]..[9][10] -- разрыв 2 карты vs 1 джокер
-                    not cursor.first.is_joker
-                    and
-                    # тот же случай, но он не смог перетащить вперед, тк там уже
-                    # наивысшая карта
-                    # [Ace, King, red]..[10][9] -- разрыв 2 карты vs 1 джокер
-                    not cursor.last.is_joker
-                    # 3 вариант когда оба случая (джокер и спереди и сзади)
-                    # [red, King, red].....[9] -- разрыв 3 карты vs 2 джокера
-                ):
-                    # пример применения хвоста:
-                    # [Ace, red, Quen, red]..[9][8] -- разрыв 2 карты vs 2 джокера
-                    # -> следующую группу должен начать с Quen
-                    # соберем хвост до первого до первого появления джокера
-                    tail = CardList()
-                    for i, card in enumerate(cursor):
-                        if card.is_joker:
-                            # будем использовать джокера которого не будет в хвосте
-                            usg_jkrs = CardList(card)
-                            # именно поэтому нам нельзя чтобы джокер был последней
-                            # картой, а то будет IndexOutOfRange
-                            tail = cursor[i + 1 :]
-                            break
-
-                    cursor = case[-1]
-                    cursor.extend(tail)
-                    assert tail, 'Empy tail.'
-                    # print.green(f'{tail=}')
-                else:
-                    # 3.1.2 -- начнем новую группу без хвоста, но с крайней карты
-                    usg_jkrs = jokers.copy()
-                    cursor = case[-1]
-                    cursor.append(track_card)
-
-                new_group_flag = False
-                continue
-
-            # 3.2 следующая карта оказалась токого же номинала, поэтому
-            # просто пропускаем и выходим из цикла по джокерам. Если же это
-            # последняя итерация цикла трекинг, нужно еще добавить джокеров ниже
-            if cursor.last[attr] == track_card[attr]:
-                if not final:
-                    break
-
-            # 3.3 добавим карту которая выполняет условие стрита и выходим
-            # из цикла по джокерам. Если же это последняя итерация цикла
-            # трекинг, нужно еще добавить джокеров ниже
-            if cursor.last[attr] == track_card[attr] + 1:
-                cursor.append(track_card)
-                if not final:
-                    break
-
-            # 3.4 еще остались джокеры, используем их
-            if usg_jkrs:
-                # сделаем зеркало на один ранг ниже, чтобы был дальше стрит
-                jkr = usg_jkrs.pop()
-                new_value = cursor.last[attr] - 1
-                mirror = jkr.get_mirrored(possible_highest, attr, new_value)
-                cursor.append(mirror)
-                # зайдем в цилк еще раз
-                continue
-
-            # 3.5 больше ничего не можем сделать c этой группой, так что
-            # зайдем в цилк еще раз и создадим новую группу
-            new_group_flag = True
-
-            # 3.6 переташим джокеров с конца вперед, чтобы был выше номинал
-            # только если первая карта уже не `Туз`
-            while cursor.last.is_joker and cursor.first[attr] != possible_highest[attr]:
-                new_value = cursor.first[attr] + 1
-                mirror = cursor.pop().get_mirrored(possible_highest, attr, new_value)
-                cursor.insert(0, mirror)
-
-            # крайний случай выхода, когда в цилкле треккинга последняя карта
-            # и закончились джокеры
-            if final and not usg_jkrs:
-                break
-            continue
-
-    # 4- collapse excess jokers
+        tracking = tracking.copy()
+    tracking, jokers = tracking.isolate_jokers(sort_attr=card_attr)
+
+    case = place_row(
+        tracking, jokers, possible_highest, possible_lowest, min_group_len
+    )
     if case:
-        # 4.1 -- выбрать самую длинну группу
-        max_group = max(case, key=attrgetter('length'))
-        # print.warning('max_group swap red/black jokers')
-        # print(jokers)
-
-        # 4.2 -- перегруперовать в ней джокеров, чтобы в начале были черные
-        jkr_iter = reversed(jokers)
-        for card, loop in looptools.item(max_group):
-            if card.is_joker:
-                try:
-                    loop.current = next(jkr_iter).get_mirrored(card)
-                except StopIteration:
-                    break
-
-        used = CardList(instance=max_group)
-    for group_index, group in enumerate(case):
-        # 4.1 -- в остальных группах удалить джокеры и пересобрать их в более
-        # маленькие группы соответсвенно
-        if group is max_group:
-            continue
-        for i, card in enumerate(group):
-            if isinstance(card, JokerCard):
-                # удалим джокера
-                group.remove(card)
-                # новая группа начинася с индекса вхождения джокера
-                new_group = group[i:]
-                # оставим только те, что не исполользуются
-                filtered = filter(lambda c: c not in used, new_group)
-                new_group = CardList(instance=filtered)
-                # добави новую группу без джокеров
-                case.insert(group_index + 1, new_group)
-                # в текцщей группе удалим все, что шло после джокера
-                del group[i:]
-                # c этой группой все, обработаем new_group,
-                # которую только что добавили
-                break
-        # используюемые карты запишем
-        used.extend(group)
-
-    # print.warning('-after collapse excess jokers-')
-    # print(f'{case=}')
-    # 5- отсортируем, чтобы в начале была самая длинная группа
+        self.cases[condition_key] = case
+
+
+################################################################################
+# Bitboard trackers
+################################################################################
+# [NOTE]
+# Results are the same as for trackers above, but groups are taken from bitboard
+# counters instead of sorting and grouping source list.
+
+
+def track_equal_bitboard(
+    self: ComboStacks,
+    bitboard: CardsBitboard,
+    possible_highest: Card,
+    condition_key: str,
+    min_group_len=2,
+):
+    key = condition_key
+    attr = condition_key
+    assert key in ['suit', 'rank']
+    assert min_group_len >= 2
+
+    if bitboard.length < min_group_len:
+        logger.warning(
+            f'Track equals failed, not enough cards: {bitboard}. '
+            'No cases will suplied.'
+        )
+        return
+
+    case: Stacks = [
+        bitboard.group(attr, value)
+        for value, amount in bitboard.groups(attr)
+        if amount >= min_group_len
+    ]
     case.sort(key=attrgetter('length'), reverse=True)
-    # 6- удалим все группы меньше min_group_len, начнем с конца, чтобы
-    # меньше проверять и выйти раньше
-    for group in reversed(case):
-        if group.length < min_group_len:
-            case.remove(group)
-        else:
-            break
-
-    # 7- сохраним наш случай, если нашли что-то
+
+    # the same jokers handling as for `track_equal`
+    jokers = sorted(bitboard.jokers, key=attrgetter('kind'), reverse=True)
+    for jkr in jokers:
+        if not case:
+            if not bitboard.rank_mask:
+                case.append(CardList())
+            else:
+                case.append(CardList(bitboard.highest(attr)))
+        try:
+            val = case[0].first[attr]
+        except IndexError:
+            val = possible_highest[attr]
+
+        mirrored = jkr.get_mirrored(possible_highest, attr, val)
+        case[0].append(mirrored)
+
+    if jokers:
+        case[0].sortby(attr)
+
     if case:
         self.cases[key] = case
+
+
+def track_row_bitboard(
+    self: ComboStacks,
+    bitboard: CardsBitboard,
+    possible_highest: Card,
+    possible_lowest: Card = Card(2, 1),
+    condition_key: str = 'row',
+    min_group_len=2,
+):
+    if bitboard.jokers:
+        cards = (
+            get_card(rank, bitboard.rank_suits[rank].bit_length() - 1)
+            for rank in bits_desc(bitboard.rank_mask)
+        )
+        case = place_row(
+            cards, bitboard.jokers, possible_highest, possible_lowest, min_group_len
+        )
+    else:
+        case = [
+            bitboard.row(highest, length)
+            for highest, length in bitboard.rows()
+            if length >= min_group_len
+        ]
+        case.sort(key=attrgetter('length'), reverse=True)
+    if case:
+        self.cases[condition_key] = case
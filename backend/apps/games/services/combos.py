@@ -7,13 +7,13 @@ from dataclasses import dataclass
 import functools
 
 import itertools
-from copy import deepcopy
 import logging
-from typing import TYPE_CHECKING, ClassVar, Iterable, TypeAlias
+from typing import TYPE_CHECKING, ClassVar, Hashable, Iterable, TypeAlias
 
-from core.utils import init_logger
+from core.utils import LRUCache, init_logger
 from core.utils import is_sorted
-from games.services.cards import Card, CardList, Stacks
+from games.services.bitboards import CardsBitboard
+from games.services.cards import Card, CardList, JokerCard, Stacks, encode_card
 from games.services import combo_trackers
 
 if TYPE_CHECKING:
@@ -120,24 +120,49 @@ class ComboKind:
         assert is_sorted(
             *major.values(), reverse=True
         ), f'Some condition is not row sequence in {major}'
+        return self._is_minor_combo_for(major)
 
+    def _is_minor_combo_for(self, major: Conditions) -> bool:
+        # the same as `is_minor_combo_for`, but without sequences checking
         if not major.keys() >= self.cases.keys():
             return False
 
-        value: bool = True
         for key in self.cases:
-            # check len
-            value = value and len(major[key]) >= len(self.cases[key])
+            if len(major[key]) < len(self.cases[key]):
+                return False
             for greater, smaller in zip(major[key], self.cases[key]):
-                # check each item
-                value = value and greater >= smaller
-                if not value:
-                    break
+                if greater < smaller:
+                    return False
+        return True
+
+
+@dataclass(frozen=True)
+class ComboMatch:
+    """
+    Result of looking for conditions at `ComboKindList`.
+
+        `kind`: equivalent combination or the nearest minor one
+        `exact`: conditions are equal to kind conditions
+        `no_combo`: there are no minor combinations, kind is the smallest one
+    """
 
-        return value
+    kind: ComboKind
+    exact: bool = True
+    no_combo: bool = False
 
 
 class ComboKindList(list[ComboKind]):
+    """
+    List of combinations from smallest to highest.
+
+    List is compiled at init into index for fast lookups (see `match`). Call
+    `compile()` again if list was changed after init.
+    """
+
+    _exact: dict[tuple, ComboKind]
+    _candidates: dict[frozenset[str], list[ComboKind]]
+    _matches: dict[tuple, ComboMatch]
+
     def __init__(self, __iterable: Iterable[ComboKind], *, set_priority=True) -> None:
         super().__init__(__iterable)
         if set_priority:
@@ -147,6 +172,64 @@ class ComboKindList(list[ComboKind]):
             for combo in self:
                 combo.priority = round(priority, 2)
                 priority += step
+        self.compile()
+
+    @staticmethod
+    def _key(conditions: Conditions) -> tuple:
+        return tuple(sorted((key, tuple(v)) for key, v in conditions.items()))
+
+    def compile(self) -> None:
+        """
+        Build index for lookups:
+        - exact matches by conditions (only if there are no highest combos which are
+        minor for them, otherwise highest minor one should be returned)
+        - candidates to be minor combo (from highest to smallest) for every set of
+        conditions keys
+        """
+        self._exact = {}
+        self._candidates = {}
+        self._matches = {}
+
+        for i, ref in enumerate(self):
+            highest = self[i + 1 :]
+            if not any(major._is_minor_combo_for(ref.cases) for major in highest):
+                self._exact.setdefault(self._key(ref.cases), ref)
+
+        all_keys = ComboKind._CONDITION_KEYS
+        for n in range(len(all_keys) + 1):
+            for combination in itertools.combinations(sorted(all_keys), n):
+                keys = frozenset(combination)
+                self._candidates[keys] = [
+                    ref for ref in reversed(self) if keys >= ref.cases.keys()
+                ]
+
+    def match(self, conditions: Conditions) -> ComboMatch:
+        """
+        Find equivalent combination (or the nearest minor one) for conditions.
+        Results are memorized.
+        """
+        key = self._key(conditions)
+        try:
+            return self._matches[key]
+        except KeyError:
+            pass
+
+        if key in self._exact:
+            match = ComboMatch(self._exact[key])
+        else:
+            major = dict(key)
+            try:
+                candidates = self._candidates[frozenset(major)]
+            except KeyError:  # unknown conditions keys
+                candidates = [r for r in reversed(self) if major.keys() >= r.cases.keys()]
+            nearest = next((r for r in candidates if r._is_minor_combo_for(major)), None)
+            if nearest is None:
+                match = ComboMatch(self[0], exact=False, no_combo=True)
+            else:
+                match = ComboMatch(nearest, exact=nearest.cases == major)
+
+        self._matches[key] = match
+        return match
 
     def get(self, name: str) -> ComboKind:
         """
@@ -164,15 +247,30 @@ class ComboKindList(list[ComboKind]):
         """
         Finding equivalent combination in self list.
 
-        Going through all combos from highest to smallest until self combination is not
-        major for referense.
+        Raise `ExtraComboException` if conditions are major for found combination and
+        `NoComboException` if there are no minor combinations. Use `match` to get
+        result without exceptions.
         """
-        for ref in reversed(self):
-            if conditions == ref.cases:
-                return ref
-            if ref.is_minor_combo_for(conditions):
-                raise ExtraComboException(cases=conditions, nearest=ref)
-        raise NoComboException(cases=conditions, nearest=ref)
+        match = self.match(conditions)
+        if match.no_combo:
+            raise NoComboException(cases=conditions, nearest=match.kind)
+        if not match.exact:
+            raise ExtraComboException(cases=conditions, nearest=match.kind)
+        return match.kind
+
+
+def card_strength(card: Card) -> int:
+    """
+    Card key for combos strength (9 bits): rank and suit (mirrored joker is taken by
+    its reflection) and than joker kind (natural card, red joker, black joker).
+
+    >>> red, black = JokerCard('red', 'Ace|S'), JokerCard('black', 'Ace|S')
+    >>> card_strength(Card('Ace|S')) < card_strength(red) < card_strength(black)
+    True
+    """
+    assert card.rank is not None and card.suit is not None, 'card should be natural'
+    kind = card.kind + 1 if isinstance(card, JokerCard) else 0
+    return (card.rank << 3 | card.suit) << 2 | kind
 
 
 @functools.total_ordering
@@ -192,6 +290,8 @@ class ComboStacks:
     track_equal = combo_trackers.track_equal
     track_row = combo_trackers.track_row
     track_highest = combo_trackers.track_highest
+    track_equal_bitboard = combo_trackers.track_equal_bitboard
+    track_row_bitboard = combo_trackers.track_row_bitboard
 
     @property
     def conditions(self):
@@ -204,6 +304,17 @@ class ComboStacks:
     def cases_chain(self):
         return itertools.chain(*itertools.chain(*self.cases.values()))
 
+    @property
+    def strength(self) -> tuple[int, ...]:
+        """
+        Canonical key to compare stacks of the same combination kind: rank and suit of
+        every card at cases (one by one) and than at leftovers. Mirrored jokers are
+        taken by theirs reflections and than by kind (black joker is stronger than red
+        one, as at cards comparison), natural card goes before jokers.
+        """
+        return tuple(
+            map(card_strength, itertools.chain(self.cases_chain, self.leftovers))
+        )
 
     def __init__(self, player: Player | None = None):
         if player:
@@ -265,47 +376,113 @@ class ComboStacks:
 
         return True
 
-    def track(self, possible_highest: Card = Card(14, 4)) -> None:
-        self.track_equal(possible_highest, 'suit')
-        self.track_equal(possible_highest, 'rank')
-        self.track_row(possible_highest)
+    def track(
+        self,
+        possible_highest: Card = Card(14, 4),
+        bitboard: CardsBitboard | None = None,
+        possible_lowest: Card = Card(2, 1),
+    ) -> None:
+        """
+        Track all cases at source. If `bitboard` (built from the same source) is
+        provided, groups are taken from it without sorting source several times.
+        """
+        if bitboard is None or not bitboard.is_trackable:
+            self.track_equal(possible_highest, 'suit')
+            self.track_equal(possible_highest, 'rank')
+            self.track_row(possible_highest, possible_lowest)
+            return
+
+        # source should be sorted by rank after tracking (see `track_highest`)
+        if bitboard.length >= 2:
+            self.source.sortby('rank')
+        self.track_equal_bitboard(bitboard, possible_highest, 'suit')
+        self.track_equal_bitboard(bitboard, possible_highest, 'rank')
+        self.track_row_bitboard(bitboard, possible_highest, possible_lowest)
 
     def merge(self, references: ComboKindList) -> ComboKind:
-        try:
-            return references.get_by_conditions(self.conditions)
-        except ExtraComboException as e:
-            logger.info(f'Exeption was catched: {e}')
-            logger.info(
-                'Solution is: '
-                '(1) Copied extra conditionas and staks in self.extra for any uses. '
-                f'(2) Merjed self into nearest {e.nearest}. '
-            )
+        """
+        Merge self into equivalent (or nearest) combination. Extra conditions and
+        stacks are kept at `self.extra_cases`.
 
-            self.extra_cases = deepcopy(self.cases)
-            self.trim_to(e.nearest)
-            return e.nearest
+        Raise `NoComboException` if there are no combination for self conditions.
+        """
+        match = references.match(self.conditions)
+        if match.no_combo:
+            raise NoComboException(cases=self.conditions, nearest=match.kind)
+        if not match.exact:
+            self.extra_cases = self.cases
+            self.trim_to(match.kind)
+        return match.kind
 
     def trim_to(self, reference: ComboKind) -> None:
+        """
+        Cut off excess conditions and cards. Cases lists are not modified, trimmed
+        cases are new lists (so untrimmed ones could be kept as `extra_cases`).
+        Not trimmed lists are shared, do not modify them.
+        """
         assert self.cases
         assert is_sorted(*self.cases.values(), key=lambda s: len(s), reverse=True)
 
-        # cut off excess condtitions 'rank' 'suit' 'row':
-        for unused_key in self.cases.keys() - reference.cases.keys():
-            del self.cases[unused_key]
-
-        # reduce extra cards in useable conditions
+        trimmed: dict[str, Stacks] = {}
         for key in reference.cases:
-            del self.cases[key][len(reference.cases[key]) :]
-            for amount, cards in zip(
-                reference.cases[key], self.cases[key], strict=True
-            ):
-                del cards[amount:]
+            amounts = reference.cases[key]
+            groups = self.cases[key][: len(amounts)]
+            trimmed[key] = [
+                cards if len(cards) <= amount else cards[:amount]
+                for amount, cards in zip(amounts, groups, strict=True)
+            ]
+        # keep cases order (it defines cards order at cases chain)
+        self.cases = {key: trimmed[key] for key in self.cases if key in trimmed}
+
+    def used_indexes(self) -> set[int]:
+        """
+        Indexes of source cards used at cases. Every case card takes its own source
+        card, so equal cards (from several decks) are not mixed up. Mirrored jokers
+        take source jokers of the same kind.
+
+        [NOTE] different cases could contain the same source card (a flush card
+        at a straight), so amount of used cards is the max amount for all cases.
+        """
+        # source card (or joker kind) -> amount of used cards
+        amounts: dict[Hashable, int] = {}
+        for stacks in self.cases.values():
+            case_amounts: dict[Hashable, int] = {}
+            for cards in stacks:
+                for card in cards:
+                    key = ('joker', card.kind) if isinstance(card, JokerCard) else card
+                    case_amounts[key] = case_amounts.get(key, 0) + 1
+            for key, amount in case_amounts.items():
+                if amounts.get(key, 0) < amount:
+                    amounts[key] = amount
+
+        used: set[int] = set()
+        for i, card in enumerate(self.source):
+            key = ('joker', card.kind) if isinstance(card, JokerCard) else card
+            if amounts.get(key):
+                amounts[key] -= 1
+                used.add(i)
+        return used
+
+    def get_leftovers(self) -> CardList:
+        """
+        Source cards not used at cases (except jokers, they are always used).
+        """
+        used = self.used_indexes()
+        return CardList(
+            instance=(
+                card
+                for i, card in enumerate(self.source)
+                if i not in used and not card.is_joker
+            )
+        )
 
     def track_and_merge(
         self,
         *stacks: CardList,
         references,
         possible_highest,
+        possible_lowest: Card = Card(2, 1),
+        bitboard: CardsBitboard | None = None,
     ) -> ComboKind:
         """
         Find any possible combination in stacks (even a Highest Card).
@@ -314,6 +491,10 @@ class ComboStacks:
         `*stacks`: where to trace combinations
         `possible_highest`: the most highest card in the deck (to prepend jokers into
         straight combos from the edges)
+        `possible_lowest`: the most lowest card in the deck (to append jokers into
+        straight combos, but not below it)
+        `bitboard`: already counted cards from all stacks (see
+        `PlayerSelector.evaluate_all_combos`)
 
         To coplite searching metodh creates a new merged CardList inside.
         Source stacks remain unmodified.
@@ -322,28 +503,19 @@ class ComboStacks:
         if not self.source:
             logger.warning('no cards for tracking was provided')
 
-        self.track(possible_highest=possible_highest)
-        try:
-            kind = self.merge(references)
-        except NoComboException as e:
-            logger.info(
-                f'Exeption was catched: {e}. '
-                'Solution is: added `highest_card` case with one card'
-            )
+        if bitboard is None:
+            bitboard = CardsBitboard(self.source)
+        self.track(possible_highest, bitboard, possible_lowest)
+        match = references.match(self.conditions)
+        if match.no_combo:
+            # added `highest_card` case with one card
             self.track_highest(possible_highest)
-            self.extra_cases = deepcopy(self.cases)
-            self.trim_to(e.nearest)
-            kind = e.nearest
-
-        # [NOTE]
-        # we check `not c.is_jokers` because jokers are always has been used.
-        # if we skip this cheking, not mirrored jokers at source will compare with
-        # mirrored at stacks and it return false.
-        used = list(self.cases_chain)
-        filtered = filter(lambda c: not c.is_joker and c not in used, self.source)
-        self.leftovers = CardList(instance=filtered)
+        if not match.exact:
+            self.extra_cases = self.cases
+            self.trim_to(match.kind)
 
-        return kind
+        self.leftovers = self.get_leftovers()
+        return match.kind
 
 
 @dataclass(order=True)
@@ -354,5 +526,33 @@ class Combo:
     kind: ComboKind
     stacks: ComboStacks
 
+    @functools.cached_property
+    def strength(self) -> tuple[float, tuple[int, ...]]:
+        """
+        Immutable key for fast sorting and grouping combos: kind priority and than
+        stacks strength.
+        """
+        return (self.kind.priority or 0.0, self.stacks.strength)
+
     def __repr__(self) -> str:
         return f'{self.kind}: {list(self.stacks.cases_chain)}'
+
+
+class ComboCache(LRUCache[Hashable, Combo]):
+    """
+    Process-wide LRU cache for evaluated combos.
+
+    Key is a fingerprint of cards (hand and table together, so the order of cards is
+    not considered) and config key (see `evaluators.config_key`). Therefore any
+    change of cards or config produce another key and cached combo is not used
+    anymore.
+
+    [NOTE] cached combos are shared, do not modify them.
+    """
+
+    @staticmethod
+    def fingerprint(config_key: Hashable, *stacks: Iterable[Card]) -> tuple:
+        return (config_key, *sorted(map(encode_card, itertools.chain(*stacks))))
+
+
+combo_cache = ComboCache()
@@ -8,7 +8,8 @@ objects to check all dependences.
 from __future__ import annotations
 
 
-from typing import TYPE_CHECKING, Iterable
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
 from django.db import IntegrityError
 from core.utils import StrColors, init_logger
 
@@ -47,13 +48,14 @@ def check_objects_continuity(
     Does a check is realted objects in `one` are the seme inctances of `another` items.
     """
     another = another if isinstance(another, Iterable) else [another]
+    if any(one is other for other in another):
+        return  # the same instance (the most common case)
+
     if one not in another:
         raise RuntimeError(
             f'Check continuity failed. There are no equal objects: {one} | {another}'
         )
-
-    if not any([one is other for other in another]):
-        raise GameContinuityError(one, another)
+    raise GameContinuityError(one, another)
 
 
 def validate_constraints(game: Game, *, skip: list[str] = []):
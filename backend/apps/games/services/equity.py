@@ -0,0 +1,376 @@
+"""
+Monte Carlo equity (win and tie probability) for players.
+
+Unknown cards (the rest of the deck and hidden hands) are sampled to complete every
+hand and the table up to config amounts, than showdown is played by the same combos
+rules as at `OpposingStage`. Works for any config (including exotic ones with
+jokers and several decks), because there are no precomputed equity tables.
+
+Samples are split into chunks which could be run at `ProcessPoolExecutor`. Cards are
+sent to workers as integer codes (see `encode_card`) together with config itself (not
+its name, config could be patched). If there are only a few
+unknown cards (late streets), all outcomes are enumerated for exact odds.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Hashable, Iterable, Iterator, Sequence, Sized
+
+from core.utils import LRUCache, init_logger
+from games.configurations.configurations import CONFIG_SCHEMAS
+from games.services.bitboards import CardsBitboard
+from games.services.cards import Card, CardList, decode_card, encode_card
+from games.services.evaluators import config_key, evaluate_cards
+
+if TYPE_CHECKING:
+    from games.configurations.configurations import GameConfig
+    from games.models import Game, Player
+
+logger = init_logger(__name__)
+
+DEFAULT_SAMPLES = 1000
+"""Default samples budget for one estimation."""
+
+EXACT_LIMIT = 2000
+"""Max amount of outcomes to enumerate them all instead of sampling."""
+
+
+@dataclass(frozen=True)
+class Equity:
+    """
+    Player's probabilities to win the whole bank alone or to share it (tie).
+    `exact` if all outcomes were enumerated (`samples` is amount of outcomes).
+    """
+
+    win: float = 0.0
+    tie: float = 0.0
+    samples: int = 0
+    exact: bool = False
+
+    @property
+    def lose(self) -> float:
+        return 1.0 - self.win - self.tie
+
+
+def _showdown(config: GameConfig, hands: Sequence[CardList], table: CardList):
+    """
+    Indexes of hands with the best combo (table cards are counted only once).
+    """
+    table_board = CardsBitboard(table)
+    strengths = []
+    for hand in hands:
+        bitboard = table_board + CardsBitboard(hand)
+        strengths.append(evaluate_cards(config, hand, table, bitboard).strength)
+
+    best = max(strengths)
+    return [i for i, strength in enumerate(strengths) if strength == best]
+
+
+def _simulate(
+    config: GameConfig,
+    hands: Sequence[tuple[int, ...]],
+    table: tuple[int, ...],
+    pool: tuple[int, ...],
+    samples: int,
+    time_limit: float | None,
+    seed: int | None,
+) -> tuple[list[int], list[int], int]:
+    """
+    Play showdowns for random samples. Return wins and ties amount for every hand and
+    amount of played samples (could be less than `samples` if time is over).
+    """
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+    rnd = random.Random(seed)
+
+    known_hands = [CardList(instance=map(decode_card, hand)) for hand in hands]
+    known_table = CardList(instance=map(decode_card, table))
+    unknown = [decode_card(code) for code in pool]
+    missing_table, *missing = _missing_slots(config, hands, table)
+
+    wins = [0] * len(hands)
+    ties = [0] * len(hands)
+    played = 0
+    while played < samples:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+
+        drawn = iter(rnd.sample(unknown, missing_table + sum(missing)))
+        flopped = itertools.islice(drawn, missing_table)
+        table_cards = CardList(instance=itertools.chain(known_table, flopped))
+        hands_cards = [
+            CardList(instance=itertools.chain(hand, itertools.islice(drawn, amount)))
+            for hand, amount in zip(known_hands, missing)
+        ]
+
+        winners = _showdown(config, hands_cards, table_cards)
+        for i in winners:
+            if len(winners) == 1:
+                wins[i] += 1
+            else:
+                ties[i] += 1
+        played += 1
+
+    return wins, ties, played
+
+
+################################################################################
+# Exact odds
+################################################################################
+# [NOTE]
+# When there are only a few unknown cards, all outcomes are enumerated instead of
+# sampling. Equal cards (duplicates from several decks, jokers of the same kind) are
+# enumerated once with multiplicity weight.
+
+
+def _missing_slots(
+    config: GameConfig, hands: Sequence[Sized], table: Sized
+) -> list[int]:
+    """Amount of unknown cards for table and for every hand."""
+    hand_size = sum(config.deal_cards_amounts)
+    table_size = sum(config.flops_amounts)
+    return [
+        max(table_size - len(table), 0),
+        *(max(hand_size - len(hand), 0) for hand in hands),
+    ]
+
+
+def _outcomes_amount(pool_size: int, slots: Sequence[int]) -> int:
+    """Amount of all outcomes (as if all cards were distinguished)."""
+    amount = 1
+    for slot in slots:
+        amount *= math.comb(pool_size, slot)
+        pool_size -= slot
+    return amount
+
+
+def _combinations(
+    counts: Sequence[tuple[int, int]], amount: int
+) -> Iterator[tuple[tuple[int, ...], int]]:
+    """
+    Unique combinations of `amount` cards from `(card code, count)` with theirs
+    weight (how many combinations there are if equal cards were distinguished).
+
+    >>> list(_combinations([(1, 2), (2, 1)], 2))
+    [((1, 1), 1), ((1, 2), 2)]
+    """
+    if not amount:
+        yield (), 1
+        return
+    if not counts:
+        return
+
+    (code, count), rest = counts[0], counts[1:]
+    for take in range(min(count, amount), -1, -1):
+        for tail, weight in _combinations(rest, amount - take):
+            yield (code,) * take + tail, math.comb(count, take) * weight
+
+
+def _outcomes(
+    counts: Counter[int], slots: Sequence[int]
+) -> Iterator[tuple[list[tuple[int, ...]], int]]:
+    """
+    Unique outcomes (cards for every slot) with theirs weight.
+    """
+    if not slots:
+        yield [], 1
+        return
+
+    for taken, weight in _combinations(sorted(counts.items()), slots[0]):
+        for tail, tail_weight in _outcomes(counts - Counter(taken), slots[1:]):
+            yield [taken, *tail], weight * tail_weight
+
+
+def _enumerate(
+    config: GameConfig,
+    hands: Sequence[tuple[int, ...]],
+    table: tuple[int, ...],
+    pool: tuple[int, ...],
+) -> tuple[list[int], list[int], int]:
+    """
+    Play showdowns for all outcomes. Return weighted wins and ties amount for every
+    hand and amount of all outcomes (the same as `_simulate` does).
+    """
+    slots = _missing_slots(config, hands, table)
+
+    wins = [0] * len(hands)
+    ties = [0] * len(hands)
+    total = 0
+    for (flopped, *dealt), weight in _outcomes(Counter(pool), slots):
+        table_cards = CardList(instance=map(decode_card, table + flopped))
+        hands_cards = [
+            CardList(instance=map(decode_card, hand + cards))
+            for hand, cards in zip(hands, dealt)
+        ]
+
+        winners = _showdown(config, hands_cards, table_cards)
+        for i in winners:
+            if len(winners) == 1:
+                wins[i] += weight
+            else:
+                ties[i] += weight
+        total += weight
+
+    return wins, ties, total
+
+
+class EquityCache(LRUCache[tuple, list[Equity]]):
+    """
+    Process-wide LRU cache of estimated equities. Key is config key (see
+    `evaluators.config_key`), every hand fingerprint, table fingerprint and pool
+    fingerprint.
+
+    Samples budget is not a part of key: cached equities are used only if they were
+    estimated by not less samples than requested (or exactly).
+    """
+
+    @staticmethod
+    def fingerprint(
+        config_key: Hashable,
+        hands: Iterable[Iterable[Card]],
+        table: Iterable[Card],
+        pool: Iterable[Card],
+    ) -> tuple:
+        return (
+            config_key,
+            tuple(tuple(sorted(map(encode_card, hand))) for hand in hands),
+            tuple(sorted(map(encode_card, table))),
+            tuple(sorted(map(encode_card, pool))),
+        )
+
+    @staticmethod
+    def is_enough(equities: list[Equity] | None, samples: int) -> bool:
+        if not equities:
+            return False
+        return equities[0].exact or equities[0].samples >= samples
+
+    def get_estimated(self, key: tuple, samples: int) -> list[Equity] | None:
+        """Cached equities estimated exactly or by `samples` at least."""
+        equities = self.get(key)
+        return equities if self.is_enough(equities, samples) else None
+
+    def set_estimated(self, key: tuple, equities: list[Equity]) -> None:
+        """Cache equities, unless more precise ones are cached already."""
+        with self._lock:
+            cached = self._data.get(key)
+        if equities[0].exact or not self.is_enough(cached, equities[0].samples):
+            self.set(key, equities)
+
+
+equity_cache = EquityCache(maxsize=256)
+
+
+def estimate_equity(
+    config_name: str,
+    hands: Sequence[Iterable[Card]],
+    table: Iterable[Card],
+    pool: Iterable[Card],
+    *,
+    samples: int = DEFAULT_SAMPLES,
+    time_limit: float | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+    exact_limit: int = EXACT_LIMIT,
+) -> list[Equity]:
+    """
+    Estimate equity for every hand.
+
+    `hands`: known cards of every player (hidden or not dealt cards are sampled)
+    `table`: known table cards (not flopped cards are sampled)
+    `pool`: cards to take samples from (deck and hidden hands cards)
+    `samples`: samples budget (cached equities are used only if they were estimated
+    exactly or by not less samples)
+    `time_limit`: seconds for estimation (for every worker)
+    `workers`: amount of processes, `1` to run at current process
+    `exact_limit`: enumerate all outcomes instead of sampling if there are not more
+    than that limit (late streets: one or two cards to flop)
+    """
+    config = CONFIG_SCHEMAS[config_name]
+    known_hands = [CardList(instance=hand) for hand in hands]
+    known_table = CardList(instance=table)
+    unknown = CardList(instance=pool)
+    key = equity_cache.fingerprint(
+        config_key(config), known_hands, known_table, unknown
+    )
+    if seed is None:
+        # seeded estimation is not taken from cache to be reproducible
+        cached = equity_cache.get_estimated(key, samples)
+        if cached is not None:
+            return cached
+
+    args = (
+        config,
+        [tuple(map(encode_card, hand)) for hand in known_hands],
+        tuple(map(encode_card, known_table)),
+        tuple(map(encode_card, unknown)),
+    )
+    slots = _missing_slots(config, known_hands, known_table)
+    if sum(slots) > len(unknown):
+        raise ValueError(
+            f'Not enough cards for sampling: {sum(slots)} required, '
+            f'but only {len(unknown)} in pool. '
+        )
+
+    exact = _outcomes_amount(len(unknown), slots) <= exact_limit
+    if exact:
+        results = [_enumerate(*args)]
+    else:
+        rnd = random.Random(seed)
+        workers = max(min(workers, samples), 1)
+        chunks = [samples // workers + (i < samples % workers) for i in range(workers)]
+        seeds = [rnd.getrandbits(32) for _ in chunks]
+
+        if workers == 1:
+            results = [_simulate(*args, chunks[0], time_limit, seeds[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_simulate, *args, chunk, time_limit, chunk_seed)
+                    for chunk, chunk_seed in zip(chunks, seeds)
+                ]
+                results = [future.result() for future in futures]
+
+    played = sum(result[2] for result in results)
+    equities = []
+    for i in range(len(hands)):
+        wins = sum(result[0][i] for result in results)
+        ties = sum(result[1][i] for result in results)
+        equities.append(
+            Equity(win=wins / played, tie=ties / played, samples=played, exact=exact)
+            if played
+            else Equity()
+        )
+
+    logger.debug(f'Equity estimated by {played} outcomes: {equities}')
+    if played:
+        equity_cache.set_estimated(key, equities)
+    return equities
+
+
+def estimate_game_equity(
+    game: Game, player: Player | None = None, **kwargs
+) -> dict[Player, Equity]:
+    """
+    Estimate equity for active players at current game state.
+
+    If `player` is provided, equity is estimated by his point of view: other hands
+    are hidden, so theirs cards are sampled together with deck.
+    """
+    players = list(game.players.active)
+    pool = game.deck.copy()
+    hands: list[CardList] = []
+    for other in players:
+        if player is None or other == player:
+            hands.append(other.hand)
+        else:
+            hands.append(CardList())
+            pool.extend(other.hand)
+
+    equities = estimate_equity(game.config_name, hands, game.table, pool, **kwargs)
+    return dict(zip(players, equities))
@@ -0,0 +1,258 @@
+"""
+Fast combinations evaluators for specific game configurations.
+
+Evaluator returns the same results as `ComboStacks.track_and_merge` (kind and
+stacks), but for cards without jokers there are no tracking or merging at all:
+conditions are counted by bitboard, kind is taken from precomputed table and stacks
+are cut straight from bitboard groups. Cards with jokers are tracked in usual way.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+from core.utils import init_logger
+from games.services.bitboards import CardsBitboard
+from games.services.cards import Card, CardList, Stacks, encode_card
+from games.services.combos import (
+    Combo,
+    ComboKind,
+    ComboKindList,
+    ComboStacks,
+    Conditions,
+    card_strength,
+)
+
+if TYPE_CHECKING:
+    from games.configurations.configurations import GameConfig
+
+logger = init_logger(__name__)
+
+ConditionsKey = tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...]]
+"""Tracked conditions as `(suit, rank, row)` groups lengths."""
+
+
+def partitions(total: int, min_part: int = 2, max_parts: int | None = None):
+    """
+    Yield all sequences of parts (from highest to smallest) where sum of parts is not
+    greater then total. Including empty one.
+
+    >>> list(partitions(5))
+    [(), (2,), (2, 2), (3,), (3, 2), (4,), (5,)]
+    """
+
+    def _partitions(rest: int, max_part: int, parts: int) -> Iterator[tuple[int, ...]]:
+        yield ()
+        if parts == 0:
+            return
+        for part in range(min_part, min(rest, max_part) + 1):
+            for tail in _partitions(rest - part, part, parts - 1):
+                yield (part, *tail)
+
+    parts = max_parts if max_parts is not None else total
+    return _partitions(total, total, parts)
+
+
+@dataclass
+class Evaluation:
+    """
+    Evaluation result. `strength` is integer key for comparison combos with the same
+    amount of cards: the bigger the better.
+    """
+
+    kind: ComboKind
+    stacks: ComboStacks
+    strength: int
+
+
+class ClassicEvaluator:
+    """
+    Evaluator for classic-like configurations: one deck without duplicates and 7 cards
+    at most (hand + table).
+
+    Kinds for all possible tracked conditions are precomputed at init (unexpected
+    conditions are calculated and stored into table at runtime).
+    """
+
+    MAX_CARDS: int = 7
+    SUITS_AMOUNT: int = 4
+
+    def __init__(
+        self,
+        references: ComboKindList,
+        possible_highest: Card,
+        possible_lowest: Card = Card(2, 1),
+    ) -> None:
+        self.references = references
+        self.possible_highest = possible_highest
+        self.possible_lowest = possible_lowest
+        self.table: dict[ConditionsKey, ComboKind] = {}
+
+        suit_patterns = list(partitions(self.MAX_CARDS, max_parts=self.SUITS_AMOUNT))
+        rank_patterns = list(partitions(self.MAX_CARDS))
+        row_patterns = list(partitions(self.MAX_CARDS))
+        for key in itertools.product(suit_patterns, rank_patterns, row_patterns):
+            self.table[key] = self._get_kind(key)
+
+    @classmethod
+    def is_suitable(cls, config: GameConfig) -> bool:
+        cards_amount = sum(config.deal_cards_amounts) + sum(config.flops_amounts)
+        return config.deck.iterations_amount == 1 and cards_amount <= cls.MAX_CARDS
+
+    def _get_kind(self, key: ConditionsKey) -> ComboKind:
+        conditions: Conditions = {
+            name: lengths for name, lengths in zip(('suit', 'rank', 'row'), key) if lengths
+        }
+        return self.references.match(conditions).kind
+
+    def evaluate(
+        self, *stacks: CardList, bitboard: CardsBitboard | None = None
+    ) -> Evaluation:
+        """
+        Evaluate combination for cards from all stacks (hand and table). Cards could
+        be already counted into `bitboard`.
+        """
+        if bitboard is None:
+            bitboard = CardsBitboard(itertools.chain(*stacks))
+        if bitboard.jokers or not bitboard.is_trackable:
+            return self._evaluate_by_tracking(*stacks, bitboard=bitboard)
+
+        # [1] tracked groups (the same order as trackers make)
+        groups: dict[str, Stacks] = {}
+        for attr in ('suit', 'rank'):
+            groups[attr] = [
+                bitboard.group(attr, value)
+                for value, amount in bitboard.groups(attr)
+                if amount >= 2
+            ]
+        groups['row'] = [
+            bitboard.row(highest, length)
+            for highest, length in bitboard.rows()
+            if length >= 2
+        ]
+        for attr_groups in groups.values():
+            attr_groups.sort(key=len, reverse=True)
+
+        key: ConditionsKey = tuple(  # type: ignore
+            tuple(len(group) for group in groups[attr]) for attr in groups
+        )
+        try:
+            kind = self.table[key]
+        except KeyError:
+            kind = self.table[key] = self._get_kind(key)
+
+        # [2] stacks cut to kind conditions (see ComboStacks.trim_to)
+        combo = ComboStacks()
+        combo.source = bitboard.cards('rank')
+        for attr in groups:
+            if attr not in kind.cases:
+                continue
+            combo.cases[attr] = [
+                group[:amount]
+                for amount, group in zip(kind.cases[attr], groups[attr], strict=False)
+            ]
+        if 'highest_card' in kind.cases:
+            combo.cases['highest_card'] = [combo.source[0:1]]
+
+        combo.leftovers = combo.get_leftovers()
+        return Evaluation(kind, combo, self.get_strength(kind, combo))
+
+    def _evaluate_by_tracking(
+        self, *stacks: CardList, bitboard: CardsBitboard | None = None
+    ) -> Evaluation:
+        combo = ComboStacks()
+        kind = combo.track_and_merge(
+            *stacks,
+            references=self.references,
+            possible_highest=self.possible_highest,
+            possible_lowest=self.possible_lowest,
+            bitboard=bitboard,
+        )
+        return Evaluation(kind, combo, self.get_strength(kind, combo))
+
+    def get_strength(self, kind: ComboKind, combo: ComboStacks) -> int:
+        """
+        Pack kind and all cards (cases cards, than leftovers) into one integer.
+        Every card takes 9 bits (see `card_strength`).
+        """
+        strength = self.references.index(kind)
+        cards = list(itertools.chain(combo.cases_chain, combo.leftovers))
+        for card in cards:
+            strength = strength << 9 | card_strength(card)
+        return strength << 9 * (len(combo.source) - len(cards))
+
+
+_EVALUATORS: dict[tuple, ClassicEvaluator | None] = {}
+_CONFIG_KEYS: dict[int, tuple[GameConfig, tuple]] = {}
+
+
+def config_key(config: GameConfig) -> tuple:
+    """
+    Config fields combos evaluation depends on (not config name, config could be
+    patched). Memoized per config instance: configs are replaced, not modified.
+    """
+    try:
+        return _CONFIG_KEYS[id(config)][1]
+    except KeyError:
+        pass
+
+    key = (
+        config.deck.iterations_amount,
+        sum(config.deal_cards_amounts) + sum(config.flops_amounts),
+        encode_card(config.deck.interval.max),
+        encode_card(config.deck.interval.min),
+        tuple(
+            (kind.name, kind.priority, tuple(sorted(kind.cases.items())))
+            for kind in config.combos
+        ),
+    )
+    # config is kept alive by reference, so its id is not reused by another one
+    _CONFIG_KEYS[id(config)] = (config, key)
+    return key
+
+
+def get_evaluator(config: GameConfig) -> ClassicEvaluator | None:
+    """
+    Evaluator for config if there are any suitable, otherwise None.
+    """
+    key = config_key(config)
+    try:
+        return _EVALUATORS[key]
+    except KeyError:
+        pass
+
+    evaluator = None
+    if ClassicEvaluator.is_suitable(config):
+        interval = config.deck.interval
+        evaluator = ClassicEvaluator(config.combos, interval.max, interval.min)
+    _EVALUATORS[key] = evaluator
+    return evaluator
+
+
+def evaluate_cards(
+    config: GameConfig,
+    hand: CardList,
+    table: CardList,
+    bitboard: CardsBitboard | None = None,
+) -> Combo:
+    """
+    Evaluate combo for hand and table cards by config evaluator (if there are any)
+    or by tracking. Cards could be already counted into `bitboard`.
+    """
+    evaluator = get_evaluator(config)
+    if evaluator:
+        evaluation = evaluator.evaluate(hand, table, bitboard=bitboard)
+        return Combo(evaluation.kind, evaluation.stacks)
+
+    stacks = ComboStacks()
+    kind = stacks.track_and_merge(
+        hand,
+        table,
+        references=config.combos,
+        possible_highest=config.deck.interval.max,
+        possible_lowest=config.deck.interval.min,
+        bitboard=bitboard,
+    )
+    return Combo(kind, stacks)
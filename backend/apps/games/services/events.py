@@ -0,0 +1,68 @@
+"""
+Compact codes for game events classes.
+
+Game events store class code instead of class name, so every action or stage class
+that could be logged has its own code: index at `EVENT_CLASSES`. Tuple is append
+only, codes must not be changed as they are stored at database.
+"""
+
+from __future__ import annotations
+
+from typing import Type, TypeAlias, Union
+
+from games.services import actions, stages
+
+EventClass: TypeAlias = Union[Type[actions.BaseAction], Type[stages.BaseStage]]
+
+EVENT_CLASSES: tuple[EventClass, ...] = (
+    # actions
+    actions.StartAction,
+    actions.EndAction,
+    actions.ForceContinueAction,
+    actions.LeaveGame,
+    actions.KickOut,
+    actions.PassAction,
+    actions.PlaceBet,
+    actions.PlaceBlind,
+    actions.PlaceBetCheck,
+    actions.PlaceBetReply,
+    actions.PlaceBetVaBank,
+    # stages
+    stages.SetupStage,
+    stages.DealCardsStage,
+    stages.DealCardsStage_1,
+    stages.DealCardsStage_2,
+    stages.DealCardsStage_3,
+    stages.BiddingsStage,
+    stages.BiddingsStage_1,
+    stages.BiddingsStage_2,
+    stages.BiddingsStage_3,
+    stages.BiddingsStage_4,
+    stages.PlacingBlindsStage,
+    stages.FlopStage,
+    stages.FlopStage_1,
+    stages.FlopStage_2,
+    stages.FlopStage_3,
+    stages.FlopStage_4,
+    stages.FlopStage_5,
+    stages.OpposingStage,
+    stages.TearDownStage,
+)
+
+EVENT_CODES: dict[EventClass, int] = {
+    event_class: code for code, event_class in enumerate(EVENT_CLASSES)
+}
+
+
+def get_event_code(event_class: EventClass) -> int:
+    try:
+        return EVENT_CODES[event_class]
+    except KeyError:
+        raise ValueError(
+            f'There are no event code for {event_class.__name__}. '
+            'Append it to EVENT_CLASSES. '
+        ) from None
+
+
+def get_event_class(code: int) -> EventClass:
+    return EVENT_CLASSES[code]
@@ -0,0 +1,132 @@
+"""
+Jokers placement engine.
+
+Jokers are placed into straight (row) combinations by searching the best window of
+ranks instead of walking through cards one by one and dragging jokers back and
+forth. Search space is a window top rank (there are only 13 distinct reflections
+for rank), so it does not depend on amount of jokers at all.
+
+Windows are bounded by deck interval ranks (`possible_highest` and `possible_lowest`
+cards).
+
+For rank and suit cases jokers are not placed by this engine: all of them go to the
+longest group (see `track_equal`), because combinations priority grows with the
+longest group length. References (`ComboKindList`) are not consulted here.
+"""
+
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Iterable
+
+from core.utils import init_logger
+from games.services.cards import Card, CardList, Stacks
+
+logger = init_logger(__name__)
+
+
+def best_row(
+    rank_mask: int,
+    jokers_amount: int,
+    highest: int,
+    lowest: int,
+) -> tuple[int, int]:
+    """
+    Find the longest straight window for ranks at `rank_mask` where jokers fill the
+    gaps (and the edges). Among windows of the same length the highest is chosen.
+    Return `(top rank, length)`.
+
+    Branch and bound: windows are taken from the highest top to the smallest and
+    search is stopped as soon as the rest windows could not be longer than the best
+    one.
+
+    >>> best_row(0b0001_0110_0000, 1, 14, 2)  # [8, 6, 5] + joker
+    (8, 4)
+    >>> best_row(1 << 14, 2, 14, 2)  # [Ace] + 2 jokers
+    (14, 3)
+    >>> best_row(0b0001_0110_0000, 2, 14, 5)  # [8, 6, 5] + 2 jokers, 5 is the lowest
+    (9, 5)
+    >>> best_row(0, 0, 14, 2)
+    (14, 0)
+    """
+    best_top, best_length = highest, 0
+    for top in range(highest, lowest - 1, -1):
+        # [1] bound: window can not be longer than ranks below top
+        # and longer than cards below top plus jokers
+        below = rank_mask & ((1 << top + 1) - 1)
+        bound = min(top - lowest + 1, below.bit_count() + jokers_amount)
+        if bound <= best_length:
+            if top - lowest + 1 <= best_length:
+                break
+            continue
+
+        # [2] branch: extend window down while there are cards or jokers
+        length, jokers = 0, jokers_amount
+        for rank in range(top, lowest - 1, -1):
+            if not below >> rank & 1:
+                if not jokers:
+                    break
+                jokers -= 1
+            length += 1
+
+        if length > best_length:
+            best_top, best_length = top, length
+    return best_top, best_length
+
+
+def place_row(
+    cards: Iterable[Card],
+    jokers: Iterable[Card],
+    possible_highest: Card,
+    possible_lowest: Card,
+    min_group_len: int = 2,
+) -> Stacks:
+    """
+    Place jokers into the best straight window and collect other straight groups
+    from the rest cards. Return row case (groups from the longest to the smallest).
+
+    `cards`: not joker cards (or mirrored jokers) sorted by rank from the highest,
+    the first card of every rank is taken into groups.
+    `jokers`: not mirrored jokers.
+    """
+    by_rank: dict[int, Card] = {}
+    for card in cards:
+        if card.rank is not None:
+            by_rank.setdefault(card.rank, card)
+    if not by_rank:
+        return []
+    assert possible_highest.rank is not None, 'possible highest should be natural card'
+    assert possible_lowest.rank is not None, 'possible lowest should be natural card'
+
+    # black jokers go first to take the highest places
+    jokers = sorted(jokers, key=attrgetter('kind'), reverse=True)
+    rank_mask = sum(1 << rank for rank in by_rank)
+    highest = max(possible_highest.rank, *by_rank)
+    lowest = min(possible_lowest.rank, *by_rank)
+    top, length = best_row(rank_mask, len(jokers), highest, lowest)
+
+    # [1] the best window
+    window = CardList()
+    jokers_iter = iter(jokers)
+    for rank in range(top, top - length, -1):
+        if rank in by_rank:
+            window.append(by_rank[rank])
+        else:
+            joker = next(jokers_iter)
+            window.append(joker.get_mirrored(possible_highest, 'rank', rank))
+    case: Stacks = [window]
+
+    # [2] other groups (without jokers) from the rest ranks
+    rest = rank_mask & ~(((1 << length) - 1) << top - length + 1)
+    group = CardList()
+    for rank in range(highest, lowest - 1, -1):
+        if rest >> rank & 1:
+            group.append(by_rank[rank])
+        elif group:
+            case.append(group)
+            group = CardList()
+    if group:
+        case.append(group)
+
+    case.sort(key=attrgetter('length'), reverse=True)
+    return [group for group in case if group.length >= min_group_len]
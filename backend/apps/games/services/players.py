@@ -0,0 +1,98 @@
+"""
+Players logic shared by `Player` model and its stand-in for simulation.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from games.services.bitboards import CardsBitboard
+from games.services.combos import Combo, combo_cache
+from games.services.evaluators import config_key, evaluate_cards
+
+if TYPE_CHECKING:
+    from games.services.cards import CardList
+
+
+class PlayerMixin:
+    """
+    Bets, positions and combo evaluation. Subclasses provide `user`, `game`, `hand`,
+    `bets` and `position`.
+    """
+
+    if TYPE_CHECKING:
+        user: Any
+        game: Any
+        hand: CardList
+        bets: list[int]
+        position: int
+        is_host: bool
+
+    _combo_cache: tuple[tuple, Combo] | None = None
+    'Cards fingerprint and combo for them. '
+
+    def __repr__(self) -> str:
+        n = self.position if self.position is not None else '?'
+        h = '(h)' if self.is_host else ''
+        d = '(d)' if self.is_dealer else ''
+        name = self.user.username
+        return f'({n}) {name}{h}{d}'
+
+    def __str__(self) -> str:
+        return self.user.username
+
+    @property
+    def bet_total(self):
+        return sum(self.bets)
+
+    @property
+    def is_dealer(self):
+        """
+        A dealer button is used to represent the player in the dealer position.
+        The dealer button rotates clockwise after each round, changing the position of
+        the dealer and blinds. Dealer position number is always 0.
+        """
+        return self.position == 0
+
+    @property
+    def is_performer(self):
+        return self == self.game.stage.performer
+
+    @property
+    def other_players(self):
+        return self.game.players.exclude(player=self)
+
+    @property
+    def combo(self) -> Combo | None:
+        """
+        Player's combination for hand and table cards. Cached per player instance and
+        at process-wide `combo_cache`, any changes of hand or table cards make
+        cached value outdated.
+        """
+        return self.evaluate_combo()
+
+    def evaluate_combo(self, table: CardsBitboard | None = None) -> Combo | None:
+        """
+        The same as `combo`, but table cards could be already counted into bitboard
+        (see `PlayerSelector.evaluate_all_combos`).
+        """
+        if not self.hand and not self.game.table:
+            return None
+
+        key = combo_cache.fingerprint(
+            config_key(self.game.config), self.hand, self.game.table
+        )
+        if self._combo_cache and self._combo_cache[0] == key:
+            combo_cache.hits += 1
+            return self._combo_cache[1]
+
+        combo = combo_cache.get(key)
+        if combo is None:
+            combo = self._evaluate_combo(table)
+            combo_cache.set(key, combo)
+        self._combo_cache = (key, combo)
+        return combo
+
+    def _evaluate_combo(self, table: CardsBitboard | None = None) -> Combo:
+        bitboard = None if table is None else table + CardsBitboard(self.hand)
+        return evaluate_cards(self.game.config, self.hand, self.game.table, bitboard)
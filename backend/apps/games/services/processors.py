@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Type
 
+from core.models import bulk_save
 from core.utils import StrColors, init_logger
 from core.utils.interval import Interval
 from games.services import stages
@@ -10,14 +11,20 @@ from games.services import actions
 from games.services.actions import ActionError, ActionPrototype, BaseAction
 from games.services.constraints import check_objects_continuity, validate_constraints
 from games.services.stages import BaseStage, RequirementNotSatisfied
+from users.models import Profile
 
 
 if TYPE_CHECKING:
+    from games.models.event import GameSnapshot
     from games.models.game import Game
 
 logger = init_logger(__name__)
 
 
+class StaleGameError(Exception):
+    """Game has been saved by another process since it was loaded."""
+
+
 @dataclass
 class ProcessingStatus:
     status_code: int
@@ -44,7 +51,13 @@ class NoneBiddingsCondition(PrematureFinalCondition):
     message = 'bidding for nothing, only place bet check is allowed'
 
     def __call__(self, game: Game):
-        values = game.stage.get_possible_values_for(actions.PlaceBet)
+        stage = game.stage
+        if actions.PlaceBet not in stage.possible_actions_classes:
+            return False  # not a biddings stage
+        if stage.performer is None:
+            return False  # biddings are over
+
+        values = stage.get_possible_values_for(actions.PlaceBet)
         if isinstance(values, Interval):
             return (0, 0) == values.borders
         return False
@@ -58,10 +71,22 @@ class BaseProcessor:
     CONTINUE = ProcessingStatus(300)
     NEW_ROUND = ProcessingStatus(301)
 
-    def __init__(self, game: Game, *, autosave: bool = True) -> None:
+    STEPS_BUDGET: int = 10_000
+    """Max amount of steps (stages and auto actions) for one run."""
+
+    SNAPSHOTS_PERIOD: int = 50
+    """Game snapshot is taken after that amount of events (and between rounds)."""
+
+    def __init__(
+        self, game: Game, *, autosave: bool = True, steps_budget: int | None = None
+    ) -> None:
         self.game = game
         self.actions_stack = []
         self.autosave = autosave
+        self.steps_budget = steps_budget or self.STEPS_BUDGET
+        self.steps_counter = 0
+        self.snapshots: list[GameSnapshot] = []
+        self.profiles: list[Profile] = []
 
     def add(self, action: BaseAction):
         check_objects_continuity(self.game, action.game)
@@ -69,33 +94,58 @@ class BaseProcessor:
         return self
 
     def run(self) -> ProcessingStatus:
+        if self.autosave and self.game.stage in (
+            stages.SetupStage,
+            stages.TearDownStage,
+        ):
+            # players could join game only between rounds and it is not an event,
+            # so game state is captured before processing
+            self.snapshots.append(self.game.take_snapshot())
+
         status = self._subrunner()
         if self.autosave:
             self._save_game_objects(status)
         return status
 
     def _subrunner(self) -> ProcessingStatus:
+        # [NOTE]
+        # explicit loop (not recursion) over stages: one iteration per stage, so
+        # stack depth does not depend on amount of stages and rounds
+        status = self.CONTINUE
+        while status == self.CONTINUE:
+            self._spend_step()
+            current_stage = self.game.stage
+            self.before_step(current_stage)
+            status = self._step(current_stage)
+            self.after_step(current_stage, status)
+        return status
+
+    def _step(self, current_stage: BaseStage) -> ProcessingStatus:
         if self._round_counter() == self.FORCED_STOP:
             return self.FORCED_STOP
 
         headline = StrColors.bold('Processing')
         logger.info(f'{headline} {self.game}. ')
 
-        # [NOTE]
-        # we are getting current stage from Game only once to cache their properties
-        # when stage complited run(..) will be called again and we ask for stage again
-        current_stage = self.game.stage
-
         # [01] actions
         if self._actions_processing(current_stage) == self.FORCED_STOP:
             return self.FORCED_STOP
 
         # [02] stages
-        status = self._stage_processing(current_stage)
-        if status in [self.STOP, self.FORCED_STOP]:
-            return status
+        return self._stage_processing(current_stage)
+
+    def _spend_step(self):
+        self.steps_counter += 1
+        if self.steps_counter > self.steps_budget:
+            raise RuntimeError(
+                f'Processing steps budget ({self.steps_budget}) is exceeded. '
+            )
 
-        return self._subrunner()
+    def before_step(self, current_stage: BaseStage) -> None:
+        """Hook called before every step. Stage is taken only once for a step."""
+
+    def after_step(self, current_stage: BaseStage, status: ProcessingStatus) -> None:
+        """Hook called after every step with its status."""
 
     def _actions_processing(self, current_stage: BaseStage):
         # [NOTE]
@@ -109,6 +159,7 @@ class BaseProcessor:
             if action in possible:
                 logger.info(' '.join([StrColors.green('acting'), str(action)]))
                 action.act()
+                self.game.touch_state()
                 self._make_history(action)
             else:
                 # no possible found for that action (processor contains invalid action)
@@ -131,6 +182,7 @@ class BaseProcessor:
 
         logger.info(f'{StrColors.cyan("exicuting")} {str(current_stage)}')
         current_stage.execute()
+        self.game.touch_state()
         logger.info(
             f'Game stage complited: {current_stage.get_message_format()}. '
             f'{StrColors.green("Continue")}. '
@@ -143,6 +195,10 @@ class BaseProcessor:
         else:
             self._continue_to_next_stage()
 
+        if self.autosave and current_stage == stages.SetupStage:
+            # shuffle seed is not logged, so deck is replayed from that snapshot
+            self.snapshots.append(self.game.take_snapshot())
+
         return self.CONTINUE
 
     def _save_game_objects(self, status: ProcessingStatus):
@@ -151,23 +207,68 @@ class BaseProcessor:
         """
         skip = ['performer'] if status == self.FORCED_STOP else []
         validate_constraints(self.game, skip=skip)
-        self.game.save(only_if_presave=True)
-        for player in self.game.players:
-            player.save(only_if_presave=True)
-            player.user.profile.save(only_if_presave=True)
 
-    def _make_history(self, latest: BaseStage | BaseAction):
-        performer = getattr(latest, 'player', None)
-        value = getattr(latest, 'value', None)
-        value = value if isinstance(value, int) else str(value)
-        self.game.actions_history.append(
-            {
-                'class': latest.__class__.__name__,
-                'performer': str(performer) if performer else None,
-                'message': latest.get_message_format(),
-                'value': value,
-            }
+        # [NOTE]
+        # all objects are saved in one transaction by one query for every model
+        # (pending events are inserted by one query as well)
+        players = list(self.game.players)
+        events = self.game.pending_events
+        if events:
+            period = self.SNAPSHOTS_PERIOD
+            if (events[0].seq - 1) // period != events[-1].seq // period:
+                self.snapshots.append(self.game.take_snapshot())
+
+        # [NOTE]
+        # users banks are not saved by values, but by differences (see `_save_banks`)
+        # money is never changed alone: it is moved from/to game bank or players bets,
+        # so there is always something to save at bulk saving
+        self.profiles = [
+            player.user.profile
+            for player in players
+            if player.user.profile._presave_flag
+        ]
+        bulk_save(
+            [*events, self.game, *players],
+            only_if_presave=True,
+            before_saving=self._before_saving,
         )
+        events.clear()
+        self.snapshots.clear()
+
+    def _before_saving(self):
+        # optimistic lock: raises if game has been saved by another process
+        self.game.increment_version()
+        self._save_banks()
+
+        if self.snapshots:
+            # imported here because of circular imports
+            from games.models.event import GameSnapshot
+
+            # snapshot replaces previous one for the same event (players could join
+            # game between rounds)
+            snapshots = {snapshot.seq: snapshot for snapshot in self.snapshots}
+            GameSnapshot.objects.bulk_create(
+                snapshots.values(),
+                update_conflicts=True,
+                unique_fields=['game_id', 'seq'],  # column names for Django 4.1
+                update_fields=['data', 'created'],
+            )
+
+    def _save_banks(self):
+        """
+        Save users banks by differences from loaded values. User could play at several
+        games at once, so bank value is not locked by game version.
+        """
+        deltas = {
+            profile.pk: profile.bank - profile._db_data['bank']
+            for profile in self.profiles
+        }
+        Profile.objects.add_to_banks(deltas)
+        for profile in self.profiles:
+            profile._db_data['bank'] = profile.bank
+
+    def _make_history(self, latest: BaseStage | BaseAction):
+        self.game.log_event(latest)
 
     def _round_counter(self):
         if self.game.stage == stages.SetupStage:
@@ -233,8 +334,9 @@ class AutoProcessor(BaseProcessor):
         stop_after_rounds_amount: int | None = None,
         stop_after_actions_amount: int | None = None,
         autosave: bool = True,
+        steps_budget: int | None = None,
     ):
-        super().__init__(game, autosave=autosave)
+        super().__init__(game, autosave=autosave, steps_budget=steps_budget)
 
         supported_keys = [
             'stop_before_stage',
@@ -318,7 +420,31 @@ class AutoProcessor(BaseProcessor):
 
         return self.CONTINUE
 
+    def select_prototype(
+        self, protos: list[ActionPrototype]
+    ) -> ActionPrototype | None:
+        """Prototype for auto generated action. The first possible by default."""
+        return protos[0] if protos else None
+
+    def get_auto_action(self, proto: ActionPrototype) -> BaseAction:
+        """Auto generated action from prototype. With min value by default."""
+        return proto.get_action(use_value='min')
+
     def _actions_processing(self, current_stage: BaseStage):
+        # making auto actions untill stage requirement will be satisfied
+        while True:
+            status = self._auto_actions_step(current_stage)
+            if status == self.FORCED_STOP:
+                return self.FORCED_STOP
+            if status == self.STOP or current_stage.check_requirements(raises=False):
+                return self.CONTINUE
+            self._spend_step()
+
+    def _auto_actions_step(self, current_stage: BaseStage):
+        """
+        Act suitable `with_actions` and one auto generated action. Return `STOP` if
+        there are no possible actions.
+        """
         # [1] try all with_actions:
         for proto in self.with_actions.copy():  # copy: because of removing items
             if proto.suitable_stage_class:
@@ -339,25 +465,19 @@ class AutoProcessor(BaseProcessor):
 
         # [2] append new auto generated action
         # [2.1] take first possible action prototype
-        protos = current_stage.get_possible_actions()
-        if not protos:
-            return self.CONTINUE
-        proto = protos[0]
+        auto_proto = self.select_prototype(current_stage.get_possible_actions())
+        if not auto_proto:
+            return self.STOP
 
-        if self.stop_factor.get('stop_before_action') == proto:
+        if self.stop_factor.get('stop_before_action') == auto_proto:
             return self.FORCED_STOP
 
         # [2.2] add action with first possible value
-        self.add(proto.get_action(use_value='min'))
+        self.add(self.get_auto_action(auto_proto))
         super()._actions_processing(current_stage)
 
-        if self._stop_after_action_condition(proto) == self.FORCED_STOP:
+        if self._stop_after_action_condition(auto_proto) == self.FORCED_STOP:
             return self.FORCED_STOP
-
-        # [2.3] making auto actions untill stage requirement will be satisfied
-        if not current_stage.check_requirements(raises=False):
-            return self._actions_processing(current_stage)
-
         return self.CONTINUE
 
     def _stage_processing(self, current_stage: BaseStage):
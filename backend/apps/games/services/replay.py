@@ -0,0 +1,213 @@
+"""
+Replay game from snapshot and events.
+
+Snapshots are taken by processor between rounds (players could join only there and
+it is not a game event) and every `SNAPSHOTS_PERIOD` events. Game is restored from
+the nearest snapshot into stand-ins for Game and Player models (see simulation), so
+there are no database queries while replaying.
+
+Events are replayed by the same processor: every action event is acted again and
+stages are executed by processing (the same way as they were at the first time).
+Shuffle seed is never logged, so `SetupStage` of shuffled deck is not replayed: there
+are always a snapshot just after it. Reproduced events are checked against recorded
+ones.
+
+Note: users banks are restored from snapshot, so changes from other games are not
+taken into account.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from core.utils import init_logger
+from games.configurations.configurations import CONFIG_SCHEMAS
+from games.services import actions, stages
+from games.services.actions import BaseAction
+from games.services.cards import CardList, decode_card, encode_card
+from games.services.events import get_event_code
+from games.services.processors import BaseProcessor
+from games.services.simulation import SimGame, SimPlayer, SimUser
+
+if TYPE_CHECKING:
+    from games.models import Game, GameEvent
+
+logger = init_logger(__name__)
+
+
+class ReplayError(Exception):
+    pass
+
+
+def dump_state(game: Game | ReplayGame) -> dict[str, Any]:
+    """
+    JSON-serializable game and players state (cards are stored by codes).
+    """
+    return {
+        'config_name': game.config_name,
+        'deck': [encode_card(card) for card in game.deck],
+        'table': [encode_card(card) for card in game.table],
+        'bank': game.bank,
+        'begins': game.begins,
+        'rounds_counter': game.rounds_counter,
+        'stage_index': game.stage_index,
+        'events_counter': game.events_counter,
+        'players': [
+            {
+                'user': player.user.pk,
+                'username': player.user.username,
+                'bank': player.user.profile.bank,
+                'position': player.position,
+                'is_host': player.is_host,
+                'is_active': player.is_active,
+                'hand': [encode_card(card) for card in player.hand],
+                'bets': list(player.bets),
+            }
+            for player in game.players
+        ],
+    }
+
+
+class ReplayGame(SimGame):
+    """
+    Stand-in for `Game` model restored from snapshot data.
+    """
+
+    def __init__(self, data: Mapping[str, Any], pk: int | None = None) -> None:
+        self.pk = pk
+        self.config_name = data['config_name']
+        self.config = CONFIG_SCHEMAS[self.config_name]
+        self.stages = self.config.stages
+        self.deck = CardList(instance=map(decode_card, data['deck']))
+        self.table = CardList(instance=map(decode_card, data['table']))
+        self.bank = data['bank']
+        self.begins = data['begins']
+        self.rounds_counter = data['rounds_counter']
+        self.stage_index = data['stage_index']
+        self.events_counter = data['events_counter']
+        self.state_version = 0
+        self._stage = None
+
+        self.recorded: Mapping[int, GameEvent] = {}
+        'recorded events to check reproduced ones against them'
+
+        players = []
+        for player_data in data['players']:
+            user = SimUser(player_data['username'], player_data['bank'])
+            user.pk = player_data['user']  # type: ignore
+            player = SimPlayer(
+                user, self, player_data['position'], player_data['is_host']
+            )
+            player.is_active = player_data['is_active']
+            player.hand = CardList(instance=map(decode_card, player_data['hand']))
+            player.bets = list(player_data['bets'])
+            players.append(player)
+        self.select_players(players)
+
+    def log_event(self, latest: stages.BaseStage | BaseAction) -> None:
+        self.events_counter += 1
+        event = self.recorded.get(self.events_counter)
+        if event is not None and event.code != get_event_code(type(latest)):
+            raise ReplayError(
+                f'Replay diverged at {event!r}: {type(latest).__name__} reproduced. '
+            )
+
+
+class ReplayProcessor(BaseProcessor):
+    """
+    Process one recorded action (or stages only) and stop after `until` event.
+    """
+
+    def __init__(self, game: ReplayGame, until: int) -> None:
+        super().__init__(game, autosave=False)  # type: ignore
+        self.until = until
+
+    def _stage_processing(self, current_stage: stages.BaseStage):
+        if self.game.events_counter >= self.until:
+            return self.STOP
+
+        if current_stage == stages.SetupStage and self.game.config.deck.shuffling:
+            raise ReplayError(
+                f'Deck of {self.game} could not be replayed: there are no snapshot '
+                'after deck shuffling. '
+            )
+        return super()._stage_processing(current_stage)
+
+
+def get_action(game: ReplayGame, event: GameEvent) -> BaseAction:
+    """Action for recorded event."""
+    action_class: type[BaseAction] = event.event_class  # type: ignore
+    players = {player.user.pk: player for player in game.players}
+    try:
+        player = players[event.performer_id]
+    except KeyError:
+        raise ReplayError(
+            f'Performer of {event!r} is not a player at replayed game '
+            '(user has been deleted or snapshot is outdated). '
+        ) from None
+
+    if issubclass(action_class, actions.KickOut):
+        kicker = event.details['kicker']  # type: ignore
+        value = next(p for p in game.players if p.user.username == kicker)
+        return action_class(game, player, value=value)  # type: ignore
+    if action_class.values_expected:
+        return action_class(game, player, value=event.value)  # type: ignore
+    return action_class(game, player)  # type: ignore
+
+
+def apply_events(
+    game: ReplayGame, events: Iterable[GameEvent], until: int | None = None
+) -> ReplayGame:
+    """
+    Replay events (in order of sequence numbers) after game state. Stop after
+    `until` event (after all events by default).
+    """
+    recorded = {event.seq: event for event in events}
+    last = max(recorded, default=game.events_counter) if until is None else until
+    game.recorded = recorded
+
+    start = time.perf_counter()
+    initial = game.events_counter
+    for seq in sorted(recorded):
+        if seq > last:
+            break
+        if seq <= game.events_counter:
+            continue  # stage event reproduced by processing
+
+        event = recorded[seq]
+        processor = ReplayProcessor(game, last)
+        if issubclass(event.event_class, BaseAction):
+            processor.add(get_action(game, event))
+        processor.run()
+
+        if game.events_counter < seq:
+            raise ReplayError(f'Event {event!r} has not been reproduced. ')
+
+    replayed = game.events_counter - initial
+    if replayed:
+        per_event = (time.perf_counter() - start) / replayed
+        logger.debug(f'{replayed} events replayed: {per_event * 1e6:.0f}μs per event')
+    return game
+
+
+def replay(game_pk: int, seq: int | None = None) -> ReplayGame:
+    """
+    Restore game state after `seq` event (after the latest one by default) from the
+    nearest snapshot.
+    """
+    # imported here because of circular imports (models import services)
+    from games.models import GameEvent, GameSnapshot
+
+    snapshots = GameSnapshot.objects.filter(game_id=game_pk)
+    events = GameEvent.objects.filter(game_id=game_pk)
+    if seq is not None:
+        snapshots = snapshots.filter(seq__lte=seq)
+        events = events.filter(seq__lte=seq)
+
+    snapshot = snapshots.order_by('-seq', '-pk').first()
+    if snapshot is None:
+        raise ReplayError(f'There are no snapshot for game {game_pk} to replay from. ')
+
+    game = ReplayGame(snapshot.data, pk=game_pk)
+    return apply_events(game, events.filter(seq__gt=snapshot.seq), until=seq)
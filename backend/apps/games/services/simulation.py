@@ -0,0 +1,371 @@
+"""
+Headless in-memory games simulation.
+
+Games are played by the same stages, actions and processors as real ones, but against
+lightweight stand-ins for Game, Player, User and Profile models (with the same
+attributes), so there are no database queries at all. Actions are chosen by random
+policy: any possible action (except leaving and kicking out) with any possible bet.
+
+Every round is played from `SetupStage` to `TearDownStage`. Users banks are restored
+before every round, so rounds are independent. Rounds could be sharded across
+`ProcessPoolExecutor` and reports are merged.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from core.utils import init_logger, loggers_level
+from core.utils.interval import Interval
+from games.configurations.configurations import CONFIG_SCHEMAS
+from games.selectors import PlayerSelector
+from games.services import actions, stages
+from games.services.actions import ActionPrototype, BaseAction
+from games.services.cards import CardList
+from games.services.players import PlayerMixin
+from games.services.processors import AutoProcessor, BaseProcessor, ProcessingStatus
+from games.services.stages import UnsplitPotError
+
+logger = init_logger(__name__)
+
+DEFAULT_BANK = 1000
+"""Users bank at the beginning of every round."""
+
+EXCLUDED_ACTIONS = (actions.LeaveGame, actions.KickOut)
+"""Actions which are never chosen by simulation policy."""
+
+
+################################################################################
+# Models stand-ins
+################################################################################
+
+
+class SimProfile:
+    def __init__(self, bank: int) -> None:
+        self.bank = bank
+
+    def presave(self):
+        pass
+
+    def save(self, *args, **kwargs):
+        pass
+
+
+class SimUser:
+    def __init__(self, username: str, bank: int) -> None:
+        self.username = username
+        self.profile = SimProfile(bank)
+
+    def __str__(self) -> str:
+        return self.username
+
+
+class SimPlayer(PlayerMixin):
+    """
+    Stand-in for `Player` model (bets, positions and combos logic is shared).
+    """
+
+    def __init__(
+        self, user: SimUser, game: SimGame, position: int, is_host: bool
+    ) -> None:
+        self.user = user
+        self.game = game
+        self.hand = CardList()
+        self.bets: list[int] = []
+        self.position = position
+        self.is_host = is_host
+        self.is_active = True
+
+    def presave(self):
+        pass
+
+    def save(self, *args, **kwargs):
+        pass
+
+    def delete(self):
+        pass
+
+
+class SimGame:
+    """
+    Stand-in for `Game` model. Players are created for new users with the same bank.
+    """
+
+    pk: int | None = None
+    rnd: random.Random | None = None
+
+    def __init__(
+        self,
+        config_name: str,
+        players_amount: int,
+        bank: int = DEFAULT_BANK,
+        rnd: random.Random | None = None,
+    ) -> None:
+        self.rnd = rnd
+        self.config_name = config_name
+        self.config = CONFIG_SCHEMAS[config_name]
+        self.stages = self.config.stages
+        self.deck = CardList()
+        self.table = CardList()
+        self.bank = 0
+        self.begins = False
+        self.rounds_counter = 1
+        self.stage_index = 0
+        self.state_version = 0
+        self._stage: stages.BaseStage | None = None
+
+        players = [
+            SimPlayer(SimUser(f'player_{i}', bank), self, position=i, is_host=i == 0)
+            for i in range(players_amount)
+        ]
+        self.select_players(players)
+
+    def __repr__(self) -> str:
+        return f'simulated game at [#{self.stage_index}] {self.stage}'
+
+    @property
+    def players(self) -> PlayerSelector:
+        return self._players_selector
+
+    @property
+    def bank_total(self):
+        return self.bank + self.players.aggregate_sum_all_bets()
+
+    @property
+    def stage(self) -> stages.BaseStage:
+        stage_class = self.stages[self.stage_index]
+        if type(self._stage) is not stage_class:
+            self._stage = stage_class(self)  # type: ignore
+        return self._stage  # type: ignore
+
+    def touch_state(self) -> None:
+        self.state_version += 1
+        self._stage = None
+
+    def log_event(self, latest: stages.BaseStage | BaseAction) -> None:
+        pass  # there are no events log at simulation
+
+    def select_players(self, source: Sequence[SimPlayer]):
+        self._players_selector = PlayerSelector(source)  # type: ignore
+        self.touch_state()
+        return self
+
+    def get_players(self) -> PlayerSelector:
+        return self._players_selector
+
+    def get_processor(self, *, autosave: bool = False) -> BaseProcessor:
+        return BaseProcessor(self, autosave=False)  # type: ignore
+
+    def presave(self):
+        pass
+
+    def save(self, *args, **kwargs):
+        pass
+
+
+################################################################################
+# Simulation
+################################################################################
+
+
+@dataclass
+class SimulationReport:
+    """
+    Aggregates for simulated rounds. Reports from several shards could be merged.
+    """
+
+    rounds: int = 0
+    showdowns: int = 0
+    'rounds where there were more than one active player at `OpposingStage`'
+    unsplit_pots: int = 0
+    'rounds interrupted because bank could not be split between winners equally'
+    combos: Counter[str] = field(default_factory=Counter)
+    'combos of active players at `OpposingStage`'
+    winning_combos: Counter[str] = field(default_factory=Counter)
+    pots: list[int] = field(default_factory=list)
+    stage_durations: dict[str, list[float]] = field(default_factory=dict)
+    'stage name: [total seconds, amount of steps]'
+    elapsed: float = 0.0
+
+    def merge(self, other: SimulationReport) -> SimulationReport:
+        self.rounds += other.rounds
+        self.showdowns += other.showdowns
+        self.unsplit_pots += other.unsplit_pots
+        self.combos.update(other.combos)
+        self.winning_combos.update(other.winning_combos)
+        self.pots.extend(other.pots)
+        for name, (total, amount) in other.stage_durations.items():
+            duration = self.stage_durations.setdefault(name, [0.0, 0])
+            duration[0] += total
+            duration[1] += amount
+        self.elapsed = max(self.elapsed, other.elapsed)
+        return self
+
+    def summary(self) -> dict[str, Any]:
+        """JSON-serializable aggregates."""
+        return {
+            'rounds': self.rounds,
+            'rounds_per_second': self.rounds / self.elapsed if self.elapsed else 0.0,
+            'showdowns': self.showdowns,
+            'unsplit_pots': self.unsplit_pots,
+            'combos': {
+                name: amount / sum(self.combos.values())
+                for name, amount in self.combos.most_common()
+            },
+            'winning_combos': {
+                name: amount / sum(self.winning_combos.values())
+                for name, amount in self.winning_combos.most_common()
+            },
+            'pots': {
+                'mean': statistics.mean(self.pots) if self.pots else 0,
+                'median': statistics.median(self.pots) if self.pots else 0,
+                'max': max(self.pots, default=0),
+            },
+            'stage_durations': {
+                name: total / amount
+                for name, (total, amount) in self.stage_durations.items()
+            },
+        }
+
+
+class SimulationProcessor(AutoProcessor):
+    """
+    Play one round by random policy and collect aggregates into report.
+    """
+
+    def __init__(
+        self, game: SimGame, report: SimulationReport, rnd: random.Random, bank: int
+    ) -> None:
+        super().__init__(
+            game,  # type: ignore
+            stop_after_stage=stages.TearDownStage,
+            autosave=False,
+        )
+        self.report = report
+        self.rnd = rnd
+        self.bank = bank
+        self._step_start = 0.0
+
+    def _round_counter(self):
+        # every round is played by a new processor, so there are no rounds limit
+        return self.CONTINUE
+
+    def select_prototype(self, protos: list[ActionPrototype]) -> ActionPrototype | None:
+        protos = [p for p in protos if p.action_class not in EXCLUDED_ACTIONS]
+        return self.rnd.choice(protos) if protos else None
+
+    def get_auto_action(self, proto: ActionPrototype) -> BaseAction:
+        values = proto.action_values
+        if proto.action_class.values_expected and isinstance(values, Interval):
+            step = values.step or 1
+            value = (
+                values.min
+                + self.rnd.randrange((values.max - values.min) // step + 1) * step
+            )
+            return proto.action_class(proto.game, proto.player, value=value)
+        return proto.get_action(use_value='min')
+
+    def before_step(self, current_stage: stages.BaseStage) -> None:
+        if current_stage == stages.SetupStage:
+            for player in self.game.players:
+                player.user.profile.bank = self.bank
+        if current_stage == stages.OpposingStage:
+            self.report.pots.append(self.game.bank)
+        self._step_start = time.perf_counter()
+
+    def after_step(
+        self, current_stage: stages.BaseStage, status: ProcessingStatus
+    ) -> None:
+        name = type(current_stage).__name__
+        duration = self.report.stage_durations.setdefault(name, [0.0, 0])
+        duration[0] += time.perf_counter() - self._step_start
+        duration[1] += 1
+
+        if current_stage == stages.OpposingStage and status == self.CONTINUE:
+            active = PlayerSelector(tuple(self.game.players.active))
+            if len(active) > 1:
+                self.report.showdowns += 1
+            for combo in active.evaluate_all_combos().values():
+                if combo is not None:
+                    self.report.combos[combo.kind.name] += 1
+            assert isinstance(current_stage, stages.OpposingStage)
+            kwargs = current_stage.message_format_kwargs
+            self.report.winning_combos[kwargs['combo']] += 1
+
+
+def _simulate(
+    config_name: str,
+    rounds: int,
+    players_amount: int,
+    bank: int,
+    seed: int | None,
+) -> SimulationReport:
+    """
+    Play rounds at the current process.
+    """
+    rnd = random.Random(seed)
+    report = SimulationReport()
+    start = time.perf_counter()
+    game = SimGame(config_name, players_amount, bank, rnd)
+
+    # processing logs are too verbose for thousands of rounds
+    with loggers_level(logging.ERROR, match_name='games'):
+        for _ in range(rounds):
+            try:
+                SimulationProcessor(game, report, rnd, bank).run()
+            except UnsplitPotError:
+                # game is broken at the middle of the stage, so a new one is taken
+                report.unsplit_pots += 1
+                game = SimGame(config_name, players_amount, bank, rnd)
+            report.rounds += 1
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def simulate(
+    config_name: str,
+    rounds: int,
+    *,
+    players_amount: int = 4,
+    bank: int = DEFAULT_BANK,
+    workers: int = 1,
+    seed: int | None = None,
+) -> SimulationReport:
+    """
+    Simulate rounds for config without database.
+
+    `workers`: amount of processes (rounds are split between them equally), `1` to
+    run at current process
+    `seed`: makes simulation reproducible (for the same amount of workers)
+    """
+    rnd = random.Random(seed)
+    workers = max(min(workers, rounds), 1)
+    shards = [rounds // workers + (i < rounds % workers) for i in range(workers)]
+    seeds = [rnd.getrandbits(32) if seed is not None else None for _ in shards]
+
+    if workers == 1:
+        return _simulate(config_name, shards[0], players_amount, bank, seeds[0])
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _simulate, config_name, shard, players_amount, bank, shard_seed
+            )
+            for shard, shard_seed in zip(shards, seeds)
+        ]
+        report = SimulationReport()
+        for future in futures:
+            report.merge(future.result())
+
+    report.elapsed = time.perf_counter() - start
+    logger.info(f'{report.rounds} rounds simulated for {config_name}. ')
+    return report
@@ -1,23 +1,31 @@
 from __future__ import annotations
 from copy import copy
+import logging
+import random
 
+from functools import wraps
 from pprint import pformat
-from typing import TYPE_CHECKING, Any, Callable, Iterable, Type, TypeAlias
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Type, TypeAlias
 
 from black import Sequence
 
 from core.utils import Interval, StrColors, init_logger
 from games.services import actions
 from games.services.actions import ActionPrototype, BaseAction
-from games.services.cards import CardList
+from games.services.cards import CardList, Decks, SeededDeck
 
 if TYPE_CHECKING:
+    from games.selectors import PlayerSelector
+
     from ..models import Player
     from ..models.game import Game
     _ActionValuesTypes: TypeAlias = int | Interval[int] | Sequence[Player] | Player
 
 logger = init_logger(__name__)
 
+_seeds_generator = random.SystemRandom()
+"""Deck shuffle seeds generator (not predictable, unlike module-level `random`). """
+
 
 class RequirementNotSatisfied(Exception):
     def __init__(self, stage: BaseStage, requirement_name: str) -> None:
@@ -40,6 +48,41 @@ class RequirementNotSatisfied(Exception):
         )
 
 
+def _memo_key(arg: Any) -> Hashable:
+    if isinstance(arg, BaseAction):
+        # values for action instance could differ from values for its type
+        # (see `is_values_awailable`)
+        return (type(arg), 'instance')
+    if isinstance(arg, (list, tuple)):
+        return tuple(arg)
+    return arg
+
+
+def memoized_by_state(method: Callable) -> Callable:
+    """
+    Cache method results at stage instance until game state is changed: state version
+    (any action has acted or players have been re-selected), stage index or players
+    selector (see `BaseStage.get_memo_state`).
+    """
+
+    @wraps(method)
+    def wrapper(self: BaseStage, *args):
+        memo = self.get_memo()
+        # qualified name: overridden method calling super() has its own result
+        key = (method.__qualname__, *map(_memo_key, args))
+        try:
+            value = memo[key]
+        except KeyError:
+            value = memo[key] = method(self, *args)
+        return value.copy() if isinstance(value, list) else value
+
+    return wrapper
+
+
+class UnsplitPotError(NotImplementedError):
+    """Bank could not be split between winners equally (splitting is not supported)."""
+
+
 class BaseStage:
     requirements: tuple[Callable[[BaseStage], bool], ...] = ()
     """Requirements for stage execution. """
@@ -48,12 +91,19 @@ class BaseStage:
     """Any possible actions at that stage (main action at 0 index). """
 
     message: str = 'stage has been proceed'
-    """Message form for game `actions_history`. Formated at get_message_format. """
+    """Message form for game events. Formated by get_message_kwargs. """
     message_requirement_unsatisfied: str = 'waiting for {player}'
     """Message form for stage `status`. Formated at get_status_format. """
 
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {}
+
     def get_message_format(self):
-        return self.message
+        return self.message.format(**self.get_message_kwargs())
+
+    def get_event_details(self) -> dict[str, Any]:
+        """Extra data for game event to replay stage execution. """
+        return {}
 
     def get_status_format(self):
         status = self.message_requirement_unsatisfied
@@ -61,10 +111,33 @@ class BaseStage:
 
     def __init__(self, game: Game) -> None:
         self.game = game
+        self._memo: dict[Hashable, Any] = {}
+        self._memo_state = self.get_memo_state()
 
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    def get_memo_state(self) -> tuple[int, int, PlayerSelector | None]:
+        """
+        Game state memoized results depend on: state version, stage index and players
+        selector (they could be changed without touching state version).
+        """
+        game = self.game
+        return (game.state_version, game.stage_index, game.get_players())
+
+    def get_memo(self) -> dict[Hashable, Any]:
+        """Memoized results for current game state."""
+        version, index, players = self.get_memo_state()
+        memo_version, memo_index, memo_players = self._memo_state
+        if (
+            version != memo_version
+            or index != memo_index
+            or players is not memo_players
+        ):
+            self._memo.clear()
+            self._memo_state = (version, index, players)
+        return self._memo
+
     def __eq__(self, other: object) -> bool:
         if isinstance(other, type):
             # make a shortcut for that cases: if game.stage == BiddingStage: ...
@@ -73,6 +146,7 @@ class BaseStage:
             return type(self) == other
         return super().__eq__(other)
 
+    @memoized_by_state
     def get_possible_actions(
         self,
         from_origin_actions: Iterable[Type[actions.BaseAction]] | None = None,
@@ -128,6 +202,7 @@ class BaseStage:
 
         return True
 
+    @memoized_by_state
     def get_possible_values_for(
         self, action: Type[BaseAction] | BaseAction
     ) -> _ActionValuesTypes | None:
@@ -137,6 +212,10 @@ class BaseStage:
 
     @property
     def performer(self) -> None | Player:
+        return self._get_performer()
+
+    @memoized_by_state
+    def _get_performer(self) -> None | Player:
         if self.check_requirements(raises=False):
             return None
         return self.get_performer()
@@ -145,12 +224,19 @@ class BaseStage:
         raise NotImplementedError
 
     def check_requirements(self, *, raises=True):
+        unsatisfied = self._get_unsatisfied_requirement()
+        if unsatisfied is None:
+            return True
+        if raises:
+            raise RequirementNotSatisfied(self, unsatisfied)
+        return False
+
+    @memoized_by_state
+    def _get_unsatisfied_requirement(self) -> str | None:
         for requirement in self.requirements:
             if not requirement(self):
-                if raises:
-                    raise RequirementNotSatisfied(self, requirement.__name__)
-                return False
-        return True
+                return requirement.__name__
+        return None
 
     def execute(self) -> None:
         raise NotImplementedError
@@ -184,6 +270,7 @@ class SetupStage(BaseStage):
         host_approved_start_requirement,
     )
 
+    @memoized_by_state
     def get_possible_actions(
         self, from_origin_actions: Iterable[Type[actions.BaseAction]] | None = None
     ) -> list[ActionPrototype]:
@@ -195,6 +282,7 @@ class SetupStage(BaseStage):
 
         return super().get_possible_actions(from_origin_actions)
 
+    @memoized_by_state
     def get_possible_values_for(
         self, action: Type[BaseAction] | BaseAction
     ) -> _ActionValuesTypes | None:
@@ -209,17 +297,20 @@ class SetupStage(BaseStage):
         self.fill_and_shuffle_deck()
 
     def fill_and_shuffle_deck(self):
-        generator = self.game.config.deck.generator
-
-        if callable(generator):
-            self.game.deck = CardList(instance=generator(self.game.config.deck))
-        elif isinstance(generator, CardList):
-            self.game.deck = generator.copy()
-        else:
-            raise TypeError
+        """
+        Fill up game deck from template. Shuffled deck is stored by seed at game row
+        (see `SeededDeck`).
 
+        [NOTE] Seed is never logged (at game event value or details): anyone who
+        knows it could restore all deck cards. Deck is replayed from snapshot taken
+        just after that stage (see `BaseProcessor`).
+        """
+        template = Decks.template(self.game.config.deck)
         if self.game.config.deck.shuffling:
-            self.game.deck.shuffle()
+            seed = (self.game.rnd or _seeds_generator).getrandbits(32)
+            self.game.deck = SeededDeck(template, seed)
+        else:
+            self.game.deck = CardList(instance=template)
 
 
 class DealCardsStage(BaseStage):
@@ -245,14 +336,18 @@ class DealCardsStage(BaseStage):
 
         self.amount = self.game.config.deal_cards_amounts[index]
 
-    def get_message_format(self):
-        return self.message.format(amount=self.amount)
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {'amount': self.amount}
 
     def execute(self) -> None:
-        for _ in range(self.amount):
-            for player in self.game.players:
-                player.hand.append(self.game.deck.pop())
-                player.presave()
+        # [NOTE]
+        # cards are drawn from deck all together and every player get every n-th
+        # card (in the same order as it was dealt one by one in a circle)
+        players = list(self.game.players)
+        drawn = self.game.deck.draw(self.amount * len(players))
+        for i, player in enumerate(players):
+            player.hand.extend(drawn[i :: len(players)])
+            player.presave()
 
 
 class BiddingsStage(BaseStage):
@@ -281,6 +376,7 @@ class BiddingsStage(BaseStage):
     def get_performer(self) -> Player:
         return self.game.players.next_betmaker
 
+    @memoized_by_state
     def get_possible_actions(
         self,
         from_origin_actions: Iterable[Type[actions.BaseAction]] | None = None,
@@ -307,6 +403,7 @@ class BiddingsStage(BaseStage):
 
         return super().get_possible_actions(origin)
 
+    @memoized_by_state
     def get_possible_values_for(
         self, action: Type[BaseAction] | BaseAction
     ) -> Interval[int] | None:
@@ -320,7 +417,7 @@ class BiddingsStage(BaseStage):
         min = self.game.players.aggregate_max_bet() - self.performer.bet_total
         max = self.game.players.aggregate_possible_max_bet_for_player(self.performer)
         max = max - (max % step)
-        return Interval(min=min, max=max, step=step)
+        return Interval[int](min=min, max=max, step=step)
 
     def execute(self):
         self.accept_bets()
@@ -368,6 +465,7 @@ class PlacingBlindsStage(BiddingsStage):
 
         raise RuntimeError
 
+    @memoized_by_state
     def get_possible_values_for(self, action: Type[BaseAction] | BaseAction):
         if not self.is_values_awailable(action):
             return None
@@ -397,13 +495,11 @@ class FlopStage(BaseStage):
             raise ValueError('Stage class with `amount` property must ends with index.')
         self.amount = self.game.config.flops_amounts[index]
 
-    def get_message_format(self):
-        return self.message.format(amount=self.amount)
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return {'amount': self.amount}
 
     def execute(self):
-        flop = self.game.deck[-self.amount :]
-        self.game.table.extend(reversed(flop))
-        del self.game.deck[-self.amount :]
+        self.game.table.extend(self.game.deck.draw(self.amount))
         self.game.presave()
 
 
@@ -411,14 +507,18 @@ class OpposingStage(BaseStage):
     message: str = '{winners} has {combo} and wins {benefit}'
     message_format_kwargs: dict = {}
 
-    def get_message_format(self):
-        return self.message.format(**self.message_format_kwargs)
+    def get_message_kwargs(self) -> dict[str, Any]:
+        return self.message_format_kwargs
 
     def execute(self):
+        combos = self.game.players.evaluate_all_combos()
         winners = list(self.game.players.winners)
         reminder = self.game.bank % len(winners)
         if reminder > 0:
-            raise NotImplementedError
+            raise UnsplitPotError(
+                f'Bank {self.game.bank} could not be split between '
+                f'{len(winners)} winners equally. '
+            )
 
         benefit = self.game.bank // len(winners)
 
@@ -428,13 +528,14 @@ class OpposingStage(BaseStage):
             player.user.profile.presave()
         self.game.presave()
 
-        logger.info(
-            'Combinations by players: \n'
-            + pformat([(player, player.combo) for player in self.game.players])
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Combinations by players: \n'
+                + pformat(list(combos.items()))
+            )
         self.message_format_kwargs = {
             'winners': ' '.join([p.user.username for p in winners]),
-            'combo': winners[0].combo.kind.name,
+            'combo': combos[winners[0]].kind.name,
             'benefit': benefit,
         }
 
@@ -454,6 +555,7 @@ class TearDownStage(BaseStage):
     def get_performer(self) -> Player:
         return self.game.players.host
 
+    @memoized_by_state
     def get_possible_values_for(
         self, action: Type[BaseAction] | BaseAction
     ) -> _ActionValuesTypes | None:
@@ -470,7 +572,6 @@ class TearDownStage(BaseStage):
         self.game.begins = False
         self.game.deck.clear()
         self.game.table.clear()
-        self.game.actions_history.clear()
         self.game.presave()
 
         for player in self.game.players:
@@ -5,7 +5,13 @@ from typing import TYPE_CHECKING, Type, TypeAlias, TypeVar, overload
 from django.contrib.auth.models import UserManager
 from django.contrib.auth.models import User as _DjangoUserModel
 from django.db import models
-from core.models import CleanManagerMixin, CreatedModifiedModel, FullCleanSavingMixin
+from django.utils import timezone
+from core.models import (
+    CleanManagerMixin,
+    CreatedModifiedModel,
+    ExtendedSavingMixin,
+    FullCleanSavingMixin,
+)
 from core.utils.types import NOT_PROVIDED
 
 
@@ -52,12 +58,31 @@ class UserProxy(FullCleanSavingMixin, _DjangoUserModel):
         proxy = True
 
 
-class Profile(FullCleanSavingMixin, CreatedModifiedModel):
+class ProfileManager(models.Manager['Profile']):
+    def add_to_banks(self, deltas: dict[int, int]) -> int:
+        """
+        Add money to profiles banks (by profiles pk) at one UPDATE query. Banks are
+        changed relatively (`F('bank') + delta`), so changes made by other games of
+        the same user are not overwritten. Return amount of updated profiles.
+        """
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            return 0
+        whens = [models.When(pk=pk, then=delta) for pk, delta in deltas.items()]
+        return self.filter(pk__in=deltas).update(
+            bank=models.F('bank') + models.Case(*whens, default=0),
+            modified=timezone.now(),
+        )
+
+
+class Profile(ExtendedSavingMixin, CreatedModifiedModel):
     """
     Model for representing users profile.
     It stores non-auth related information about a site user.
     """
 
+    objects: ProfileManager = ProfileManager()
+
     user: UserProxy = models.OneToOneField(
         UserProxy, on_delete=models.CASCADE, related_name='profile'
     )
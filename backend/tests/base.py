@@ -80,6 +80,7 @@ class APIGameProperties(BaseGameProperties):
         # create, delete, retrive, list, delete
         'games': '/api/v1/games/',
         'game_detail': '/api/v1/games/{game_pk}/',
+        'game_events': '/api/v1/games/{game_pk}/events/',
 
         # create, retrive, list
         'playersPreform': '/api/v1/games/{game_pk}/playersPreform/',
@@ -5,10 +5,11 @@ import re
 import pytest
 from core.utils import StrColors, TemporaryContext, init_logger
 from games.configurations.configurations import CONFIG_SCHEMAS
+from games.models import Game
 from games.models.player import PlayerPreform
 from games.services import actions, stages
 from games.services.cards import Card
-from games.services.processors import AutoProcessor
+from games.services.processors import AutoProcessor, StaleGameError
 from rest_framework import status
 from users.models import Profile, User
 
@@ -69,6 +70,39 @@ class TestGameAPI(APIGameProperties):
         assert self.response_data['stage']['performer']
         assert self.response_data['stage']['status']
 
+    def test_games_endpoint_events(self):
+        AutoProcessor(self.game, stop_after_stage=stages.FlopStage_1).run()
+        self.assert_response('[1] all game events', 'vybornyy', 'GET', 'game_events')
+        events = self.response_data
+        assert [event['seq'] for event in events] == list(range(1, len(events) + 1))
+        assert events[0]['class'] == 'StartAction'
+        assert events[0]['performer'] == 'vybornyy'
+        assert events[-1]['message'] == 'flop 3 cards on game table'
+
+        after = events[-3]['seq']
+        self.assert_response('[2] events after seq', 'vybornyy', 'GET', 'game_events', after=after)
+        assert self.response_data == events[-2:]
+
+        self.assert_response(
+            '[3] invalid seq', 'vybornyy', 'GET', 'game_events', status.HTTP_400_BAD_REQUEST, after='last'
+        )
+
+        self.assert_response('[4] round events', 'vybornyy', 'GET', 'game_events', round=1)
+        assert self.response_data == events
+        self.assert_response('[5] next round events', 'vybornyy', 'GET', 'game_events', round=2)
+        assert not self.response_data
+
+        # events are not shipped with game
+        self.assert_response('[6] game detail', 'vybornyy', 'GET', 'game_detail')
+        assert 'actions_history' not in self.response_data
+
+        # only players and users waiting to participate have access to events
+        self.assert_response('[7] participant', 'participant', 'GET', 'game_events')
+        assert self.response_data == events
+        assert all(set(event) == {'seq', 'class', 'performer', 'message', 'value'} for event in events)
+        self.assert_response('[8] not joined user', 'someuser', 'GET', 'game_events', status.HTTP_404_NOT_FOUND)
+        self.assert_response('[9] anonymous', 'anonymous', 'GET', 'game_events', status.HTTP_401_UNAUTHORIZED)
+
     ####################################################################################
     # Test Game Players Endpont
     ####################################################################################
@@ -120,6 +154,18 @@ class TestGameAPI(APIGameProperties):
         assert self.response_data['bets'] == []
         assert self.response_data['is_dealer'] is not True
         assert self.response_data['position'] != 123
+        assert self.game.version == 1  # joining is checked by game version
+
+    def test_players_endpoint_create_stale_game(self, monkeypatch: pytest.MonkeyPatch):
+        def stale(game: Game):
+            raise StaleGameError('game has been saved by another request')
+
+        monkeypatch.setattr(Game, 'increment_version', stale)
+        data = {'user': self.participant}
+        self.assert_response('', 'vybornyy', 'POST', 'players', status.HTTP_409_CONFLICT, **data)
+        assert self.response_data['code'] == 'stale_game'
+        assert PlayerPreform.objects.exists()
+        assert self.game.players_manager.count() == len(self.players)
 
     def test_players_endpoint_create_failed(self):
         initial_players_amount = len(self.players)
@@ -327,6 +373,27 @@ class TestGameAPI(APIGameProperties):
 
         assert self.game.stage == stages.BiddingsStage_2
 
+    def test_actions_endpoint_stale_game(self, monkeypatch: pytest.MonkeyPatch):
+        increment_version = Game.increment_version
+        conflicts = iter([True])
+
+        def stale_once(game: Game):
+            if next(conflicts, False):
+                raise StaleGameError('game has been saved by another request')
+            increment_version(game)
+
+        monkeypatch.setattr(Game, 'increment_version', stale_once)
+        self.assert_response('action is run again for fresh game', 'vybornyy', 'POST', 'start')
+        assert self.game.stage == stages.PlacingBlindsStage
+        assert self.game.version == 1
+
+        def stale_always(game: Game):
+            raise StaleGameError('game has been saved by another request')
+
+        monkeypatch.setattr(Game, 'increment_version', stale_always)
+        self.assert_response('', 'simusik', 'POST', 'blind', status.HTTP_409_CONFLICT)
+        assert self.response_data['code'] == 'stale_game'
+
     ####################################################################################
     # Test playerPreform Endpont
     ####################################################################################
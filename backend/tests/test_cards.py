@@ -1,11 +1,26 @@
 import copy
+import pickle
+import tracemalloc
 from operator import eq, ge, gt, is_, is_not, le, lt, ne
+from timeit import timeit
 from typing import Any, Callable
 
 import pytest
-from core.utils import Interval
-from games.configurations.configurations import DEFAULT_CONFIG
-from games.services.cards import Card, CardList, Decks, JokerCard, Stacks
+from core.utils import Interval, init_logger, temporally
+from games.configurations.configurations import CONFIG_SCHEMAS, DEFAULT_CONFIG
+from games.services.cards import (
+    Card,
+    CardArray,
+    CardList,
+    Decks,
+    JokerCard,
+    Stacks,
+    get_card,
+    get_joker,
+    parse_card,
+)
+
+logger = init_logger(__name__)
 
 
 @pytest.mark.parametrize(
@@ -593,3 +608,171 @@ def test_full_deck_plus_jokers():
     # use new_generator again
     # be carefull, because in that way no cards will be yield
     assert CardList(instance=new_generator).length == 0
+
+
+@pytest.mark.parametrize(
+    'input_data',
+    [
+        CardList('red', 'A|s', 'K|s', 'K|c', '10|h', '2|c', 'black', '2|d', 'red(J|c)'),
+        CardList('10.s', 'black(10.s)', 'red(10.s)', '10.d', 'red(6.h)', 'black'),
+        CardList(instance=Decks.full_deck_plus_jokers(DEFAULT_CONFIG.deck)),
+        CardList(),
+    ],
+)
+def test_cardarray_vs_cardlist(input_data: CardList):
+    cards = CardArray(instance=input_data)
+    assert cards == input_data
+    assert cards.tolist() == input_data
+    assert str(cards) == str(input_data)
+    with temporally(Card.Text, str_method='eng_short_suit'):  # parsable representation
+        assert CardArray(instance=str(input_data)) == input_data
+
+    # sorting
+    for attr in ('rank', 'suit'):
+        for reverse in (True, False):
+            expected = input_data.copy().shuffle().sortby(attr, reverse=reverse)
+            result = cards.copy().shuffle().sortby(attr, reverse=reverse)
+            assert list(result) == list(expected)
+            assert all(map(lambda x, y: type(x) is type(y), result, expected))
+
+    # groupby
+    for attr in ('rank', 'suit'):
+        expected_groups = list(input_data.copy().groupby(attr))
+        groups = list(cards.copy().groupby(attr))
+        assert groups == expected_groups
+
+    # isolating
+    expected = input_data.copy().isolate_jokers(sort_attr='rank')
+    assert cards.copy().isolate_jokers(sort_attr='rank') == expected
+
+    # list operations
+    assert cards[1:3] == input_data[1:3]
+    assert isinstance(cards[1:3], CardArray)
+    if input_data:
+        assert cards.first == input_data.first
+        assert cards.last == input_data.last
+        assert cards.copy().pop() == input_data.copy().pop()
+
+    new = cards.copy()
+    del new[-2:]
+    new.extend(cards[-2:])
+    assert new == cards
+    new.clear()
+    assert not new
+
+
+@pytest.mark.parametrize(
+    'tokens, expected',
+    [
+        (['A|h', 'Ace|Hearts', '14|3', 'ace|H', 'Ace.h', 'a-hearts'], Card(14, 3)),
+        (['10|S', '10|s', '10|Spades', '10|4', '10.spad'], Card(10, 4)),
+        (['black', 'black|'], JokerCard('black')),
+        (['red(Jack|C)', 'red(J|c)', 'red(11|1)', 'red|J|C'], JokerCard('red(J|c)')),
+    ],
+)
+def test_parse_card(tokens: list[str], expected: Card):
+    cards = [parse_card(token) for token in tokens]
+    assert all(card is cards[0] for card in cards)  # shared instances
+    assert type(cards[0]) is type(expected)
+    assert cards[0] == expected
+    if expected.is_joker:
+        assert cards[0].kind == expected.kind
+
+    # table and slow parser give the same result
+    if not expected.is_joker:
+        assert all(parse_card(token) == Card(token) for token in tokens)
+    assert parse_card('') is None
+
+
+def test_cards_registry():
+    # the same card value -> the same instance
+    assert CardList('Ace|H')[0] is get_card(14, 3)
+    assert CardList('black')[0] is get_joker(1)
+    assert get_joker(1).get_mirrored(Card('Ace|H')) is get_joker(1, 14, 3)
+    assert get_joker(1).get_mirrored(Card('Ace|H'), 'suit', 1) is get_joker(1, 14, 1)
+
+    # cards are immutable
+    card = get_card(14, 3)
+    with pytest.raises(AttributeError):
+        card.rank = 13
+    assert copy.copy(card) is card
+    assert copy.deepcopy(card) is card
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert pickle.loads(pickle.dumps(get_joker(0, 2, 1))) is get_joker(0, 2, 1)
+
+    # and hashable
+    assert {get_card(14, 3), Card('Ace|H')} == {Card(14, 3)}
+    assert len({JokerCard('red'), JokerCard('black')}) == 2
+
+
+@pytest.mark.slow
+def test_cards_registry_memory_usage():
+    class DictCard:
+        # how cards were stored before: every card has it's own __dict__
+        def __init__(self, rank, suit) -> None:
+            self.rank = rank
+            self.suit = suit
+
+    config = DEFAULT_CONFIG.deck
+    decks_amount = 1000
+
+    tracemalloc.start()
+    shared = [
+        CardList(instance=Decks.full_deck_plus_jokers(config))
+        for _ in range(decks_amount)
+    ]
+    shared_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    owned = [[DictCard(c.rank, c.suit) for c in deck] for deck in shared]
+    owned_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert list(map(len, owned)) == list(map(len, shared))
+    assert shared_size * 3 < owned_size
+
+
+@pytest.mark.parametrize('container', [CardList, CardArray])
+def test_deck_template_and_draw(container: type[CardList | CardArray]):
+    config = DEFAULT_CONFIG.deck
+    assert Decks.template(config) is Decks.template(config)
+    assert list(Decks.template(config)) == CardList(
+        instance=Decks.full_deck_plus_jokers(config)
+    )
+
+    # draw from deck the same as pop cards one by one
+    deck = container(instance=Decks.template(config)).shuffle()
+    expected = deck.copy()
+    drawn = deck.draw(10)
+    assert list(drawn) == [expected.pop() for _ in range(10)]
+    assert deck == expected
+    assert not deck.draw(0)
+
+    with pytest.raises(IndexError):
+        deck.draw(len(deck) + 1)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky'])
+def test_deck_template_round_setup_speed(config_name: str):
+    config = CONFIG_SCHEMAS[config_name].deck
+    players_amount = 6
+    amount = 2
+
+    def generator_and_pop():
+        deck = CardList(instance=Decks.full_deck_plus_jokers(config)).shuffle()
+        hands = [CardList() for _ in range(players_amount)]
+        for _ in range(amount):
+            for hand in hands:
+                hand.append(deck.pop())
+
+    def template_and_draw():
+        deck = CardList(instance=Decks.template(config)).shuffle()
+        drawn = deck.draw(amount * players_amount)
+        [drawn[i::players_amount] for i in range(players_amount)]
+
+    t1 = timeit(generator_and_pop, number=1000)
+    t2 = timeit(template_and_draw, number=1000)
+    logger.info(f'{config_name}: generator and pop {t1:.3f}s | template {t2:.3f}s')
+    assert t2 < t1
@@ -1,15 +1,25 @@
 import itertools
 import operator
 import random
+import timeit
 from copy import deepcopy
 from typing import Callable
 
 import pytest
 from core.utils.functools import init_logger
-from games.configurations.configurations import DEFAULT_CONFIG
-from games.services.cards import CardList, Stacks
+from games.configurations.configurations import (
+    CONFIG_SCHEMAS,
+    DEFAULT_CONFIG,
+    GameConfig,
+)
+from games.services.bitboards import CardsBitboard
+from games.services.cards import CardList, Decks, Stacks
 from games.services.combos import (Combo, ComboKind, ComboKindList,
-                                   ComboStacks, Conditions)
+                                   ComboStacks, Conditions,
+                                   ExtraComboException, NoComboException)
+from games.services.evaluators import (ClassicEvaluator, evaluate_cards,
+                                       get_evaluator, partitions)
+from games.services.jokers import best_row
 
 from tests.tools import param_kwargs_list
 
@@ -30,6 +40,7 @@ DEFAULT_COMBOS = ComboKindList(
     ]
 )
 
+
 @pytest.mark.parametrize(
     'input_data, expected',
     [
@@ -44,6 +55,42 @@ def test_classic_combos_priority(input_data: ComboKindList, expected: list[float
         assert combo.priority == priority
 
 
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky', 'classic', 'foolish'])
+def test_combokindlist_match(config_name: str):
+    references = CONFIG_SCHEMAS[config_name].combos
+
+    def get_by_conditions(conditions: Conditions) -> tuple[ComboKind, bool, bool]:
+        # how it was before compiled ComboKindList: walk through all combos
+        for ref in reversed(references):
+            if conditions == ref.cases:
+                return ref, True, False
+            if ref.is_minor_combo_for(conditions):
+                return ref, False, False
+        return ref, False, True
+
+    for suit, rank, row in itertools.product(
+        partitions(8, max_parts=4), partitions(8), partitions(8)
+    ):
+        conditions = {
+            key: value
+            for key, value in zip(('suit', 'rank', 'row'), (suit, rank, row))
+            if value
+        }
+        match = references.match(conditions)
+        expected = get_by_conditions(conditions)
+        assert (match.kind, match.exact, match.no_combo) == expected
+        assert references.match(conditions) is match  # memorized
+
+        if match.no_combo:
+            with pytest.raises(NoComboException):
+                references.get_by_conditions(conditions)
+        elif not match.exact:
+            with pytest.raises(ExtraComboException):
+                references.get_by_conditions(conditions)
+        else:
+            assert references.get_by_conditions(conditions) == match.kind
+
+
 def test_combostacks_track(tracking_cards_and_expected_cases: tuple[Stacks, dict[str, Stacks]]):
     stacks, expected_cases = tracking_cards_and_expected_cases
 
@@ -67,6 +114,224 @@ def test_combostacks_track(tracking_cards_and_expected_cases: tuple[Stacks, dict
         assert key in expected_cases, f'Get unexpetced {key} case after tracking.'
 
 
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky', 'classic', 'foolish'])
+@pytest.mark.parametrize('amount', [0, 1, 2, 5, 7, 9])
+def test_combostacks_track_by_bitboard(config_name: str, amount: int):
+    config = CONFIG_SCHEMAS[config_name].deck
+    possible_highest = config.interval.max
+    deck = CardList(instance=Decks.template(config))
+    random.seed(amount)
+
+    for _ in range(200):
+        source = CardList(instance=random.sample(deck, amount))
+        expected = ComboStacks()
+        expected.source = source.copy()
+        expected.track(possible_highest)
+
+        combo = ComboStacks()
+        combo.source = source.copy()
+        combo.track(possible_highest, CardsBitboard(source))
+
+        assert combo.cases == expected.cases
+        assert combo.source == expected.source
+        assert list(map(type, combo.cases_chain)) == list(
+            map(type, expected.cases_chain)
+        )
+
+
+def test_combostacks_track_jokers_by_bitboard(tracking_cards_and_expected_cases: tuple[Stacks, dict[str, Stacks]]):
+    stacks, expected_cases = tracking_cards_and_expected_cases
+    combo = ComboStacks()
+    combo.source = CardList(instance=itertools.chain(*stacks))
+    combo.track(bitboard=CardsBitboard(combo.source))
+
+    # the same jokers placement as for tracking by source list
+    expected = expected_cases.get('row')
+    if expected != pytest.mark.skip:
+        assert combo.cases.get('row') == expected
+
+
+@pytest.mark.parametrize('lowest', [2, 6])
+@pytest.mark.parametrize('jokers_amount', [0, 1, 2, 3, 5, 20])
+def test_best_row(jokers_amount: int, lowest: int):
+    random.seed(jokers_amount)
+    for _ in range(300):
+        ranks = random.sample(range(lowest, 15), random.randint(0, 7))
+        mask = sum(1 << r for r in ranks)
+
+        # brute force: all windows, the longest and than the highest one
+        windows = [(0, 14)]
+        for top, length in itertools.product(range(14, 1, -1), range(1, 14)):
+            window = range(top - length + 1, top + 1)
+            if window.start < lowest:
+                continue
+            if sum(not mask >> rank & 1 for rank in window) <= jokers_amount:
+                windows.append((length, top))
+        length, top = max(windows)
+        assert best_row(mask, jokers_amount, 14, lowest) == (top, length)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky'])
+def test_track_row_jokers_speed(config_name: str):
+    config = CONFIG_SCHEMAS[config_name]
+    possible_highest = config.deck.interval.max
+    deck = CardList(instance=Decks.template(config.deck))
+    naturals = [c for c in deck if not c.is_joker]
+    jokers = [c for c in deck if c.is_joker]
+    random.seed(0)
+
+    timings: dict[int, float] = {}
+    for jokers_amount in range(0, 21):
+        source = CardList(instance=random.sample(naturals, 7) + jokers[:jokers_amount])
+        bitboard = CardsBitboard(source)
+
+        def track():
+            combo = ComboStacks()
+            combo.source = source.copy()
+            combo.track_row_bitboard(bitboard, possible_highest)
+            combo.track_row(possible_highest)
+
+        timings[jokers_amount] = min(timeit.repeat(track, number=200, repeat=3))
+        logger.info(f'{config_name}: {jokers_amount} jokers: {timings[jokers_amount]}')
+
+    # window search does not depend on jokers amount
+    assert timings[20] < 3 * timings[1]
+
+
+def test_classic_evaluator_vs_tracking(tracking_cards_and_expected_cases: tuple[Stacks, dict[str, Stacks]]):
+    stacks, _ = tracking_cards_and_expected_cases
+    config = CONFIG_SCHEMAS['classic']
+    evaluator = get_evaluator(config)
+    assert isinstance(evaluator, ClassicEvaluator)
+
+    expected = ComboStacks()
+    kind = expected.track_and_merge(
+        *stacks,
+        references=config.combos,
+        possible_highest=config.deck.interval.max,
+    )
+    evaluation = evaluator.evaluate(*stacks)
+
+    assert evaluation.kind == kind
+    assert evaluation.stacks.cases == expected.cases
+    assert evaluation.stacks.leftovers == expected.leftovers
+    assert Combo(evaluation.kind, evaluation.stacks) == Combo(kind, expected)
+
+
+def test_classic_evaluator_random_hands():
+    config = CONFIG_SCHEMAS['classic']
+    evaluator = get_evaluator(config)
+    deck = CardList(instance=Decks.template(config.deck))
+    rnd = random.Random(0)
+
+    evaluations = []
+    for _ in range(300):
+        # hand and table are taken from one deck, so they never share cards
+        cards = rnd.sample(deck, 7)
+        hand, table = CardList(instance=cards[:2]), CardList(instance=cards[2:])
+        expected = ComboStacks()
+        kind = expected.track_and_merge(
+            hand,
+            table,
+            references=config.combos,
+            possible_highest=config.deck.interval.max,
+        )
+        evaluation = evaluator.evaluate(hand, table)
+        assert evaluation.kind == kind
+        assert evaluation.stacks == expected
+        if not any(c.is_joker for c in itertools.chain(hand, table)):
+            evaluations.append(evaluation)
+
+    # strength ordering is the same as combos ordering
+    for a, b in itertools.combinations(evaluations, 2):
+        if a.kind != b.kind:
+            assert (a.kind < b.kind) == (a.strength < b.strength)
+        elif a.stacks.conditions == b.stacks.conditions:
+            assert (a.stacks < b.stacks) == (a.strength < b.strength)
+
+
+def test_evaluator_for_patched_config():
+    config = CONFIG_SCHEMAS['classic']
+    assert get_evaluator(config) is get_evaluator(GameConfig.construct(**dict(config)))
+
+    # the same name, but several decks: evaluator is not suitable any more
+    deck = config.deck.copy(update={'iterations_amount': 2})
+    assert get_evaluator(GameConfig.construct(**dict(config, deck=deck))) is None
+    assert get_evaluator(config) is not None
+
+
+@pytest.mark.parametrize('config_name', ['bizarre', 'classic'])
+def test_combo_strength(config_name: str):
+    config = CONFIG_SCHEMAS[config_name]
+    cards_amount = sum(config.deal_cards_amounts) + sum(config.flops_amounts)
+    deck = CardList(instance=[c for c in Decks.template(config.deck) if not c.is_joker])
+    random.seed(0)
+
+    combos: list[Combo] = []
+    for _ in range(200):
+        stacks = ComboStacks()
+        kind = stacks.track_and_merge(
+            CardList(instance=random.sample(deck, cards_amount)),
+            references=config.combos,
+            possible_highest=config.deck.interval.max,
+        )
+        combos.append(Combo(kind, stacks))
+
+    # strength ordering is the same as combos ordering
+    for a, b in itertools.combinations(combos, 2):
+        if a.kind != b.kind or a.stacks.conditions == b.stacks.conditions:
+            assert (a < b) == (a.strength < b.strength)
+            assert (a == b) == (a.strength == b.strength)
+
+
+def test_combo_strength_jokers_kinds():
+    config = CONFIG_SCHEMAS['bizarre']
+    table = CardList('K|H', '9|D', '5|C', '3|S')
+    combos = {}
+    for joker in ('red', 'black'):
+        stacks = ComboStacks()
+        kind = stacks.track_and_merge(
+            CardList(joker, 'K|D'),
+            table,
+            references=config.combos,
+            possible_highest=config.deck.interval.max,
+        )
+        combos[joker] = Combo(kind, stacks)
+
+    # the same reflections, but black joker is stronger than red one
+    assert combos['red'] < combos['black']
+    assert combos['red'].strength < combos['black'].strength
+
+
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky', 'classic', 'foolish'])
+def test_evaluate_cards_by_counted_bitboard(config_name: str):
+    config = CONFIG_SCHEMAS[config_name]
+    deck = CardList(instance=Decks.template(config.deck))
+    random.seed(0)
+
+    for _ in range(50):
+        cards = CardList(instance=random.sample(deck, len(deck)))
+        hand = cards.draw(sum(config.deal_cards_amounts))
+        flops = [cards.draw(amount) for amount in config.flops_amounts]
+        bitboard = CardsBitboard(hand)
+
+        table = CardList()
+        for flop in flops:
+            table.extend(flop)
+            bitboard.extend(flop)
+            stacks = ComboStacks()
+            kind = stacks.track_and_merge(
+                hand,
+                table,
+                references=config.combos,
+                possible_highest=config.deck.interval.max,
+            )
+            combo = evaluate_cards(config, hand, table, bitboard)
+            assert combo == Combo(kind, stacks)
+            assert combo.stacks.leftovers == stacks.leftovers
+
+
 @pytest.mark.parametrize(
     'minor, expected, major',
     [
@@ -310,6 +575,33 @@ def test_track_and_merge(input_stacks: Stacks, expected_kind: ComboKind, expecte
         assert type(a) == type(b)
 
 
+def test_combostacks_leftovers_by_indexes():
+    # two decks: the same cards are not mixed up
+    stacks = ComboStacks()
+    kind = stacks.track_and_merge(
+        CardList('K|H', 'K|H', '9|C', 'red'),
+        CardList('9|C', '5|D', '2|S'),
+        references=DEFAULT_COMBOS,
+        possible_highest=DEFAULT_CONFIG.deck.interval.max,
+    )
+    assert kind == DEFAULT_COMBOS.get('full house')
+    assert stacks.cases['rank'] == [CardList('red(K|S)', 'K|H', 'K|H'), CardList('9|C', '9|C')]
+    assert stacks.leftovers == CardList('5|D', '2|S')
+    assert len(stacks.used_indexes()) == 5
+
+    # extra cases are kept untrimmed (not copied)
+    assert stacks.extra_cases['rank'][0] is stacks.cases['rank'][0]
+    assert 'suit' not in stacks.cases
+
+    stacks = ComboStacks()
+    stacks.track_and_merge(
+        CardList('K|H', 'K|H', '9|C'),
+        references=DEFAULT_COMBOS,
+        possible_highest=DEFAULT_CONFIG.deck.interval.max,
+    )
+    assert stacks.leftovers == CardList('9|C')
+
+
 @pytest.mark.parametrize(
     'cases, expected',
     [
@@ -484,4 +776,4 @@ def test_combo_comparison(
             else:
                 raise RuntimeError('Invalid input test data structure. ')
         else:
-            assert comparision(a, b)
\ No newline at end of file
+            assert comparision(a, b)
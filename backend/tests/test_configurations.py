@@ -10,6 +10,7 @@ from games.configurations.configurations import (CONFIG_SCHEMAS,
                                                  DEFAULT_CONFIG, GameConfig,
                                                  get_config_schemas)
 from games.models.game import Game
+from games.services.events import get_event_class, get_event_code
 from games.services.processors import AutoProcessor
 
 from tests.tools import param_kwargs, param_kwargs_list
@@ -87,3 +88,9 @@ def test_configurations_examples(data: JSON, simple_game: Game):
 @pytest.mark.xfail
 def test_get_json_schema():
     logger.info('\n' + pformat(DEFAULT_CONFIG.schema()) + '\n')
+
+
+def test_configurations_stages_event_codes():
+    for config in CONFIG_SCHEMAS.values():
+        for stage in config.stages:
+            assert get_event_class(get_event_code(stage)) is stage
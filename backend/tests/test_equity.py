@@ -0,0 +1,99 @@
+import itertools
+import random
+from collections import Counter
+
+import pytest
+from core.utils import temporally
+from core.utils.functools import init_logger
+from games.configurations.configurations import CONFIG_SCHEMAS
+from games.services.cards import CardList, Decks, encode_card
+from games.services.equity import (Equity, _outcomes, _outcomes_amount,
+                                   equity_cache, estimate_equity)
+
+logger = init_logger(__name__)
+
+
+def test_estimate_equity():
+    deck = CardList(instance=Decks.template(CONFIG_SCHEMAS['classic'].deck))
+    aces, trash = CardList('A|H', 'A|S'), CardList('7|H', '2|C')
+    pool = CardList(instance=[c for c in deck if c not in aces + trash])
+    equity_cache.clear()
+
+    # well known preflop equity: pocket aces vs 7-2 offsuit (~87%)
+    equities = estimate_equity('classic', [aces, trash], [], pool, seed=0)
+    assert not equities[0].exact
+    assert 0.83 < equities[0].win < 0.91
+    assert equities[0].win + equities[1].win + equities[0].tie == pytest.approx(1)
+    assert estimate_equity('classic', [aces, trash], [], pool) is equities
+
+    # cached equities are not used for bigger samples budget or another pool
+    cheap = estimate_equity('classic', [aces, trash], [], pool, samples=100)
+    assert cheap is equities
+    precise = estimate_equity('classic', [aces, trash], [], pool, samples=2000)
+    assert precise[0].samples == 2000
+    assert estimate_equity('classic', [aces, trash], [], pool, samples=100) is precise
+    first = estimate_equity('classic', [aces, trash], [], pool[1:], samples=100)
+    assert estimate_equity('classic', [aces, trash], [], pool[:-1], samples=100) is not first
+
+    # all cards are known: the only showdown
+    table = CardList('K|D', 'K|C', '9|S', '5|D', '3|H')
+    pool = CardList(instance=[c for c in pool if c not in table])
+    equities = estimate_equity('classic', [aces, trash], table, pool)
+    assert equities == [Equity(1.0, 0.0, 1, exact=True), Equity(0.0, 0.0, 1, exact=True)]
+
+    # time is over: no samples
+    equities = estimate_equity('classic', [aces, CardList()], [], pool, time_limit=0)
+    assert equities == [Equity(), Equity()]
+
+    with pytest.raises(ValueError):
+        estimate_equity('classic', [aces, trash], [], CardList('2|H'))
+
+
+def test_exact_equity():
+    deck = CardList(instance=Decks.template(CONFIG_SCHEMAS['classic'].deck))
+    hands = [CardList('A|H', 'A|S'), CardList('7|H', '8|H')]
+    table = CardList('K|D', '6|H', '2|S', '5|D')
+    known = list(itertools.chain(table, *hands))
+    pool = CardList(instance=[c for c in deck if not c.is_joker and c not in known])
+    equity_cache.clear()
+
+    # river: 44 outcomes, 7-8 makes a straight by any 4 or any 9
+    equities = estimate_equity('classic', hands, table, pool)
+    assert equities[0].exact and equities[0].samples == 44
+    assert equities[1].win == pytest.approx(8 / 44)
+    assert equities[0].win == pytest.approx(36 / 44)
+
+    # patched config is not served by equities cached for the original one
+    with temporally(CONFIG_SCHEMAS, classic=CONFIG_SCHEMAS['bizarre']):
+        assert estimate_equity('classic', hands, table, pool) is not equities
+    assert estimate_equity('classic', hands, table, pool) is equities
+
+    # with jokers: two of them are equal (the same kind), but weighted twice
+    jokers = CardList('red', 'red', 'black')
+    equities = estimate_equity('classic', hands, table, pool + jokers)
+    assert equities[1].samples == 47
+    assert equities[1].win == pytest.approx((8 + 3) / 47)
+
+
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky'])
+def test_exact_equity_outcomes_weights(config_name: str):
+    deck = CardList(instance=Decks.template(CONFIG_SCHEMAS[config_name].deck))
+    pool = Counter(map(encode_card, random.Random(0).sample(deck, 30)))
+
+    # equal cards are enumerated once, but weights are the same as for all outcomes
+    outcomes = list(_outcomes(pool, [2, 1]))
+    assert sum(weight for _, weight in outcomes) == _outcomes_amount(30, [2, 1])
+    assert len(outcomes) <= _outcomes_amount(30, [2, 1])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('config_name', ['bizarre', 'cheeky', 'foolish'])
+def test_estimate_equity_by_processes(config_name: str):
+    deck = CardList(instance=Decks.template(CONFIG_SCHEMAS[config_name].deck))
+    equity_cache.clear()
+
+    equities = estimate_equity(
+        config_name, [CardList(), CardList()], [], deck, samples=20, workers=2
+    )
+    assert all(equity.samples == 20 for equity in equities)
+    assert sum(e.win for e in equities) + equities[0].tie == pytest.approx(1)
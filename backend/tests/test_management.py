@@ -1,9 +1,13 @@
+import json
 import logging
+import random
 from io import StringIO
 
 import pytest
 from core.utils.functools import change_loggers_level
 from django.core.management import call_command
+from games.configurations.configurations import CONFIG_SCHEMAS
+from games.services.benchmarks import deal
 
 from tests.base import APIGameProperties
 
@@ -16,6 +20,34 @@ class TestComands:
         call_command('apply_data', stdout=out)
         assert 'Success' in out.getvalue()
 
+    def test_benchmark_combos(self):
+        out = StringIO()
+        call_command(
+            'benchmark_combos', '--rounds', '2', '--config', 'classic', stdout=out
+        )
+        report = json.loads(out.getvalue())
+        assert report['options'] == {'rounds': 2, 'seed': 0}
+        assert {b['name'] for b in report['benchmarks']} == {
+            'ComboStacks.track_and_merge',
+            'PlayerSelector.winners',
+            'CardList.sortby',
+            'CardList.groupby',
+        }
+        for benchmark in report['benchmarks']:
+            assert benchmark['params']['config'] == 'classic'
+            assert benchmark['stats']['min'] <= benchmark['stats']['max']
+
+    @pytest.mark.parametrize('config_name', ['classic', 'foolish'])
+    def test_benchmark_deal(self, config_name: str):
+        config = CONFIG_SCHEMAS[config_name]
+        hands, table = deal(config, random.Random(0), 8, jokers_density=0.5)
+        cards = [card for hand in hands for card in hand] + table
+        naturals = [card for card in cards if not card.is_joker]
+
+        # single deck: all cards are drawn from one deck, so there are no duplicates
+        assert len(set(naturals)) == len(naturals)
+        assert 0 < len(cards) - len(naturals) <= config.deck.jokers_amount
+
 @pytest.mark.django_db
 class TestForceContinueAction(APIGameProperties):
     def test_force_continue_with_default_data(
@@ -1,4 +1,5 @@
 import logging
+import random
 from operator import attrgetter
 from timeit import timeit
 from typing import Any
@@ -8,10 +9,10 @@ from core.utils import (ProcessingTimer, change_loggers_level, init_logger,
                         processing_timer)
 from django.db import IntegrityError
 from django.db.models import Prefetch
-from games.models import Game, Player
+from games.models import CardListField, Game, Player
 from games.models.managers import PlayerManager, PlayerQuerySet
 from games.services import actions
-from games.services.cards import CardList
+from games.services.cards import CardArray, CardList, Decks, SeededDeck
 from games.services.processors import AutoProcessor, BaseProcessor
 from users.models import Profile, User
 
@@ -40,7 +41,7 @@ class TestGameModel:
 
         # assert deck and table
         assert isinstance(game.deck, CardList)
-        assert isinstance(game.table, CardList)
+        assert isinstance(game.table, CardArray)
         assert game.deck, game.table == (deck, table)
 
         # no player selector - no rises, but warning log
@@ -92,6 +93,18 @@ class TestGameModel:
         with pytest.raises(exception, match=match):
             Game(deck=data, table=data).save()
 
+    def test_cardlist_field_container(self):
+        field = CardListField(blank=True, container=CardArray)
+        cards = field.to_python('Ace|H black 2|C red(Ace|S)')
+        assert isinstance(cards, CardArray)
+        assert cards == CardList('Ace|H', 'black', '2|C', 'red(Ace|S)')
+        assert field.get_prep_value(cards) == 'Ace|H black 2|C red(Ace|S)'
+        assert isinstance(field.get_default(), CardArray)
+        assert field.deconstruct()[3]['container'] is CardArray
+
+        # default field accepts both containers
+        assert CardListField().get_prep_value(cards) == field.get_prep_value(cards)
+
     def test_cardlist_field_blank(self):
         # with empty cardlist argument
         empty_list = CardList()
@@ -105,6 +118,37 @@ class TestGameModel:
         assert game.deck is not empty_list  # is not - new empty list creates inside
         assert game.deck == empty_list
 
+    def test_game_seeded_deck(self):
+        game: Game = Game.objects.create()
+        template = Decks.template(game.config.deck)
+        expected = CardList(instance=template).shuffle(random.Random(42))
+
+        # drawing cards moves cursor only
+        game.deck = SeededDeck(template, seed=42)
+        assert game.deck == expected
+        assert game.deck.draw(2) == expected.draw(2)
+        assert game.deck_cursor == 2
+        assert not game.deck_cards
+        game.save()
+
+        # cards are derived from seed and cursor after loading
+        game = Game.objects.get(pk=game.pk)
+        assert game.deck == expected
+        game.deck.clear()
+        assert game.deck_cursor == len(template)
+        assert not game.deck
+
+        # explicit cards
+        game.deck = CardList('Ace|H')
+        assert (game.deck_seed, game.deck_template, game.deck_cursor) == (None, None, 0)
+        assert game.deck == CardList('Ace|H')
+
+        # template changed
+        game.deck = SeededDeck(template, seed=42)
+        game.deck_template += 1
+        with pytest.raises(ValueError, match='has been changed'):
+            game.deck
+
     @pytest.mark.skip(
         'Game model not inheretted from ChangedFieldsMixin anymore. '
         'So this test has no sence. '
@@ -348,12 +392,47 @@ class TestGamePlayersInterface(BaseGameProperties):
             # act save:
             BaseProcessor(game)._save_game_objects(BaseProcessor.STOP)
 
-            # 1- UPDATE game
-            # 4- for every player:
-            #   1- UPDATE player
-            #   2-3-4 check constaints...
-            players = len(self.usernames)
-            assert context.amount == 1 + 4 * players, context.formated_quries
+            # 1- SAVEPOINT (transaction)
+            # 2- UPDATE game version (only if it was not changed since loading)
+            # 3- INSERT all game events at once
+            # 4- UPDATE game
+            # 5- UPDATE all players at once (only hand, no constraints checks)
+            # 6- RELEASE SAVEPOINT
+            # (profiles are not changed)
+            assert context.amount == 6, context.formated_quries
+
+        version_update = context.captured_queries[1]['sql']
+        assert version_update.startswith('UPDATE "games_game" SET "version"')
+        assert '"games_game"."version" = 0' in version_update
+
+        events_insert = context.captured_queries[2]['sql']
+        assert events_insert.startswith('INSERT INTO "games_gameevent"')
+
+        # only changed fields are saved
+        players_update = context.captured_queries[4]['sql']
+        assert players_update.startswith('UPDATE "games_player"')
+        assert 'hand' in players_update
+        assert 'bets' not in players_update
+
+        # nothing to save after saving
+        with ExtendedQueriesContext() as context:
+            BaseProcessor(game)._save_game_objects(BaseProcessor.STOP)
+            assert context.amount == 0, context.formated_quries
+
+    def test_queries_amount_round_bulk_saving(self, setup_game):
+        game = self.game
+        AutoProcessor(game, stop_after_rounds_amount=1, autosave=False).run()
+
+        with ExtendedQueriesContext() as context:
+            BaseProcessor(game)._save_game_objects(BaseProcessor.FORCED_STOP)
+
+            # constant amount for any players amount and events amount:
+            # SAVEPOINT, UPDATE game version, INSERT events, UPDATE game,
+            # UPDATE players, UPDATE profiles, RELEASE
+            assert context.amount == 7, context.formated_quries
+
+        expected = [(p.position, p.user.profile.bank) for p in game.players]
+        assert [(p.position, p.user.profile.bank) for p in self.game.players] == expected
 
     def test_select_players_change_values(self, setup_game):
         game = self.game
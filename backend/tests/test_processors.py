@@ -1,8 +1,13 @@
 
+import sys
+
 import pytest
 from core.utils import init_logger
+from django.db.models import F
 from games.services import actions, stages
-from games.services.processors import AutoProcessor
+from games.services.processors import AutoProcessor, StaleGameError
+
+from users.models import Profile
 
 from tests.base import BaseGameProperties
 
@@ -61,7 +66,7 @@ class TestAutoProcessor(BaseGameProperties):
         # [1] stop after action
         game = self.game
         start = actions.StartAction.prototype(game, game.players[0])
-        AutoProcessor(self.game, stop_after_action=start).run()
+        AutoProcessor(game, stop_after_action=start).run()
 
         # game still at this stage
         assert self.game.stage == stages.SetupStage
@@ -121,3 +126,50 @@ class TestAutoProcessor(BaseGameProperties):
         AutoProcessor(self.game, stop_after_actions_amount=1).run()
         AutoProcessor(self.game, stop_after_actions_amount=1).run()
         assert [p.bet_total for p in self.players_list] == [10, 5, 10]
+
+    def test_autoplay_game_constant_stack_depth(self):
+        depths: list[int] = []
+
+        class DepthProcessor(AutoProcessor):
+            def after_step(self, current_stage, status):
+                frame, depth = sys._getframe(), 0
+                while frame:
+                    frame, depth = frame.f_back, depth + 1
+                depths.append(depth)
+
+        DepthProcessor(self.game, stop_after_rounds_amount=3).run()
+        assert self.game.rounds_counter == 4
+        assert len(depths) > 3 * len(self.game.stages)
+        assert len(set(depths)) == 1
+
+    def test_autoplay_game_steps_budget(self):
+        with pytest.raises(RuntimeError, match=r'steps budget \(5\) is exceeded'):
+            AutoProcessor(
+                self.game, stop_after_rounds_amount=3, steps_budget=5
+            ).run()
+
+    def test_stale_game_saving(self):
+        game, stale = self.game, self.game
+        actions.StartAction.run(game)
+        assert game.version == 1
+
+        # nothing is saved for game loaded before the latest saving
+        with pytest.raises(StaleGameError, match='since version 0'):
+            actions.StartAction.run(stale)
+
+        game = self.game
+        assert game.version == 1
+        assert game.events.count() == game.events_counter
+
+    def test_banks_saving_by_differences(self):
+        actions.StartAction.run(self.game)
+        game = self.game
+        profile = game.stage.performer.user.profile
+        bank = profile.bank
+
+        # user wins at another game after this game has been loaded
+        Profile.objects.filter(pk=profile.pk).update(bank=F('bank') + 100)
+
+        actions.PlaceBlind.run(game)
+        profile.refresh_from_db()
+        assert profile.bank == bank - game.config.small_blind + 100
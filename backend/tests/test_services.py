@@ -1,8 +1,18 @@
+import json
+import logging
+import random
+
 import pytest
-from core.utils import Interval, StrColors, init_logger, is_sorted
+from core.utils import Interval, StrColors, init_logger, is_sorted, temporally
+from games.configurations.configurations import CONFIG_SCHEMAS
+from games.selectors import PlayerSelector
 from games.services import actions, stages
-from games.services.combos import Combo
+from games.services.combos import Combo, combo_cache
+from games.services.equity import estimate_game_equity
+from games.services.events import get_event_code
 from games.services.processors import AutoProcessor, BaseProcessor
+from games.services.replay import ReplayError, dump_state, replay
+from games.services.simulation import simulate
 from users.models import User
 
 from tests.base import BaseGameProperties
@@ -56,7 +66,6 @@ class TestGameStages(BaseGameProperties):
         ]
         assert expected_actions_classes == result_action_classes
 
-
         test = '[2] test possible actions at BiddingsStage_2'
         logger.info(StrColors.purple(test))
         AutoProcessor(game, stop_before_stage=stages.BiddingsStage_2).run()
@@ -72,7 +81,6 @@ class TestGameStages(BaseGameProperties):
         ]
         assert expected_actions_classes == result_action_classes
 
-
         test = '[3] test possible actions at BiddingsStage_3 after VaBank'
         logger.info(StrColors.purple(test))
         AutoProcessor(game, stop_before_stage=stages.BiddingsStage_1).run()
@@ -90,13 +98,11 @@ class TestGameStages(BaseGameProperties):
         ]
         assert expected_actions_classes == result_action_classes
 
-
     def test_start_stage_bank_less_then_big_blind(self):
         poorman = self.players['vybornyy']
         poorman.user.profile.bank = self.game.config.small_blind
         poorman.user.profile.save()
 
-
         # [1] start is not awailable
         with pytest.raises(actions.ActionError):
             actions.StartAction.run(self.game)
@@ -104,7 +110,6 @@ class TestGameStages(BaseGameProperties):
         # [2] and AutoProcessor not falls down
         AutoProcessor(self.game, stop_after_rounds_amount=1).run()
 
-
     def test_start_stage_one_player(self):
         self.game.players_manager.exclude(user=self.users['vybornyy']).delete()
 
@@ -150,6 +155,52 @@ class TestGameStages(BaseGameProperties):
         BaseProcessor(self.game).run()
         assert self.game.stage.performer == self.players_list[1]
 
+    def test_stage_memoized_by_state(self, monkeypatch):
+        game = self.game
+        AutoProcessor(game, stop_before_stage=stages.BiddingsStage_1).run()
+        stage = game.stage
+        assert game.stage is stage
+
+        calls = []
+        get_performer = type(stage).get_performer
+        monkeypatch.setattr(
+            type(stage),
+            'get_performer',
+            lambda self: calls.append(1) or get_performer(self),
+        )
+        performer = stage.performer
+        protos = stage.get_possible_actions()
+        assert stage.get_possible_values_for(actions.PlaceBet) is (
+            stage.get_possible_values_for(actions.PlaceBet)
+        )
+        assert stage.performer is performer
+        assert stage.get_possible_actions() == protos
+        assert len(calls) == 1
+
+        # subclass method and overridden one (called by super) have own results
+        memo_names = {key[0] for key in stage.get_memo()}
+        assert 'BiddingsStage.get_possible_actions' in memo_names
+        assert 'BaseStage.get_possible_actions' in memo_names
+
+        # invalidated after action has acted (with stage instance itself)
+        actions.PlaceBetReply.run(game)
+        assert game.stage is not stage
+        stage = game.stage
+        assert game.stage is stage
+        assert stage.performer != performer
+        calls.clear()
+
+        # invalidated after players selector or stage index are changed (even without
+        # touching state version)
+        game._players_selector = PlayerSelector(list(game.players))
+        stage.performer
+        stage.performer
+        assert len(calls) == 1
+
+        game.stage_index += 1
+        stage.performer
+        assert len(calls) == 2
+
     @pytest.mark.parametrize(
         'passed_names',
         [
@@ -223,6 +274,67 @@ class TestGameStages(BaseGameProperties):
             bank = self.initial_users_bank[passed.username]
             assert passed.profile.bank == bank
 
+    def test_player_combo_cache(self):
+        AutoProcessor(self.game, stop_before_stage=stages.OpposingStage).run()
+        combo_cache.clear()
+        player = self.game.players[0]
+
+        combo = player.combo
+        assert combo_cache.info()['misses'] == 1
+        assert player.combo is combo
+        assert combo_cache.info()['hits'] == 1
+
+        # the same cards for another player instance (from process-wide cache)
+        assert self.game.players[0].combo is combo
+        assert combo_cache.info()['hits'] == 2
+
+        # cards changing invalidates cache
+        card = player.hand.pop()
+        assert player.combo is not combo
+        assert combo_cache.info()['misses'] == 2
+        player.hand.append(card)
+        assert player.combo is combo
+
+        # patched config invalidates cache as well
+        with temporally(CONFIG_SCHEMAS, classic=CONFIG_SCHEMAS['bizarre']):
+            patched_player = self.game.players[0]
+            assert patched_player.combo is not combo
+            assert combo_cache.info()['misses'] == 3
+            assert patched_player.combo == patched_player._evaluate_combo()
+        assert player.combo is combo
+
+        player.game.table.pop()
+        assert player.combo is not combo
+        assert player.combo == player._evaluate_combo()
+
+    def test_groupby_combo_without_cards(self):
+        # nobody has cards yet: there are no combos, so all players are in one group
+        groups = list(self.game.players.groupby_combo)
+        assert groups == [list(self.game.players.active)]
+
+    def test_evaluate_all_combos(self):
+        AutoProcessor(self.game, stop_before_stage=stages.OpposingStage).run()
+        combo_cache.clear()
+
+        combos = self.game.players.evaluate_all_combos()
+        assert list(combos) == list(self.game.players)
+        assert combo_cache.info()['misses'] == len(self.players_list)
+
+        # the same as evaluated one by one (and cached per player instance)
+        for player, combo in combos.items():
+            assert player.combo is combo
+            assert combo == player._evaluate_combo()
+
+    def test_estimate_game_equity(self):
+        AutoProcessor(self.game, stop_before_stage=stages.OpposingStage).run()
+        player = self.game.players[0]
+
+        # by player point of view: other hands are hidden
+        equities = estimate_game_equity(self.game, player, samples=50, seed=0)
+        assert list(equities) == list(self.game.players.active)
+        assert all(equity.samples == 50 for equity in equities.values())
+        assert sum(e.win for e in equities.values()) <= 1
+
     def test_move_dealer_button(self):
         # arragne:
         AutoProcessor(self.game, stop_before_stage=stages.TearDownStage).run()
@@ -240,7 +352,6 @@ class TestGameStages(BaseGameProperties):
             assert player.position == expected_position
         assert is_sorted(self.game.players, key='position')
 
-
     def test_game_actions_history(self):
         actions.StartAction.run(self.game)
         # 1- start action by user
@@ -248,6 +359,95 @@ class TestGameStages(BaseGameProperties):
         # 3- DealCardsStage
         assert len(self.game.actions_history) == 3
 
+    def test_game_events(self):
+        game = self.game
+        actions.StartAction.run(game, autosave=False)
+        actions.PlaceBlind.run(game, autosave=False)
+
+        # events are pending until game objects are saved
+        assert not game.events.exists()
+        history = game.actions_history
+        assert [event['seq'] for event in history] == [1, 2, 3, 4]
+        assert history[0]['message'] == 'vybornyy makes this game begins'
+        assert history[3]['message'] == 'simusik place small blind'
+        assert history[3]['value'] == game.config.small_blind
+
+        game.get_processor()._save_game_objects(BaseProcessor.STOP)
+        assert not game.pending_events
+        assert self.game.events_counter == 4
+        assert self.game.actions_history == history
+
+        # stored compactly: message is rendered on read
+        event = self.game.events.get(seq=4)
+        assert event.event_class == actions.PlaceBlind
+        assert event.details == {'blind': 'small'}
+
+        # the previous round events are not in history, but they are kept
+        AutoProcessor(game, stop_after_stage=stages.TearDownStage).run()
+        assert self.game.actions_history[0]['class'] == 'TearDownStage'
+        assert self.game.events.filter(round=1).count() > 4
+
+    def test_replay(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(BaseProcessor, 'SNAPSHOTS_PERIOD', 7)
+        states = {}
+        for _ in range(60):
+            AutoProcessor(self.game, stop_after_actions_amount=1).run()
+            game = self.game
+            states[game.events_counter] = dump_state(game)
+        assert game.rounds_counter > 2
+        assert game.snapshots.count() > game.rounds_counter * 2
+
+        # state at any event after any action is restored from the nearest snapshot
+        for seq, state in states.items():
+            assert dump_state(replay(game.pk, seq)) == state
+
+        # deck is not shuffled again: it is taken from snapshot after setup stage
+        setups = game.events.filter(code=get_event_code(stages.SetupStage))
+        for setup in setups:
+            assert game.snapshots.filter(seq=setup.seq).exists()
+
+    def test_shuffle_seed_is_not_logged(self):
+        seeds = set()
+        for _ in range(40):
+            AutoProcessor(self.game, stop_after_actions_amount=1).run()
+            seeds.add(self.game.deck_seed)
+        seeds.discard(None)
+        assert len(seeds) > 1
+
+        # anyone who knows the seed could restore all deck cards
+        for event in self.game.events.all():
+            assert event.value not in seeds
+            rendered = json.dumps([event.render(), event.details])
+            assert not any(str(seed) in rendered for seed in seeds)
+
+    def test_replay_diverged(self):
+        AutoProcessor(self.game, stop_after_stage=stages.BiddingsStage_1).run()
+        game = self.game
+        game.events.filter(code=get_event_code(stages.DealCardsStage_1)).update(
+            code=get_event_code(stages.FlopStage_1)
+        )
+        with pytest.raises(ReplayError, match='Replay diverged'):
+            replay(game.pk)
+
+    def test_replay_snapshot_replaced(self):
+        game = self.game
+        for _ in range(2):
+            processor = BaseProcessor(game)
+            processor.snapshots.append(game.take_snapshot())
+            game.bank += 10
+            game.presave()
+            processor._save_game_objects(processor.STOP)
+
+        # the only snapshot for the same event: the latest one (taken before saving)
+        assert game.snapshots.count() == 1
+        assert game.snapshots.get().data['bank'] == 10
+
+    def test_replay_performer_deleted(self):
+        AutoProcessor(self.game, stop_after_stage=stages.BiddingsStage_1).run()
+        self.users['barticheg'].delete()
+        with pytest.raises(ReplayError, match='is not a player at replayed game'):
+            replay(self.game_pk)
+
 
 @pytest.mark.django_db
 @pytest.mark.usefixtures('setup_game')
@@ -341,7 +541,6 @@ class TestGameActions(BaseGameProperties):
     def players_bets_total(self):
         return [p.bet_total for p in self.game.players.active]
 
-    
     def test_place_bet_all_actions_and_pass_action(self, setup_users_banks):
         """This test has assertion for:
 
@@ -435,3 +634,39 @@ class TestGameActions(BaseGameProperties):
         actions.PlaceBetCheck.run(self.game, self.users['simusik'])
         actions.PlaceBetCheck.run(self.game, self.users['barticheg'])
         assert self.game.stage == stages.TearDownStage
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('config_name', ['classic', 'bizarre', 'cheeky', 'foolish'])
+def test_simulate(config_name: str, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        report = simulate(config_name, 20, players_amount=3, seed=0)
+
+    assert report.rounds == 20
+    assert sum(report.winning_combos.values()) == 20 - report.unsplit_pots
+    assert sum(report.combos.values()) >= 2 * report.showdowns
+    assert 'SetupStage' in report.stage_durations
+
+    # reproducible by seed, global random generator and loggers are not touched
+    state = random.getstate()
+    level = logging.getLogger('games.services.stages').level
+    again = simulate(config_name, 20, players_amount=3, seed=0)
+    assert (again.combos, again.pots) == (report.combos, report.pots)
+    assert random.getstate() == state
+    assert logging.getLogger('games.services.stages').level == level
+
+
+def test_simulate_raises(monkeypatch: pytest.MonkeyPatch):
+    def broken(stage):
+        raise NotImplementedError('not an unsplit pot')
+
+    # only unsplit pots are counted, other errors are raised
+    monkeypatch.setattr(stages.OpposingStage, 'execute', broken)
+    with pytest.raises(NotImplementedError, match='not an unsplit pot'):
+        simulate('classic', 20, players_amount=3, seed=0)
+
+
+def test_simulate_by_processes():
+    report = simulate('foolish', 6, workers=2, seed=0)
+    assert report.rounds == 6
+    assert report.summary()['rounds'] == 6
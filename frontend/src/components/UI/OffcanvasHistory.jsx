@@ -14,10 +14,10 @@ const OffcanvasHistory = ({...props}) => {
   const handleClose = () => setShow(false)
   const handleShow = () => setShow(true)
 
-  const { game }= useLoaderData()
+  const { events }= useLoaderData()
 
 
-  const actionsComonents = game.actions_history.map((action, i) => {
+  const actionsComonents = events.map((action, i) => {
     let bg = action.performer ? 'secondary' : 'light'
     if (action.performer && action.performer == auth.username) {
       bg = 'primary'
@@ -20,7 +20,7 @@ const GamePage = () => {
   if (!data) {
     return <Loader />
   }
-  const { game, playerMe, playersOther, actions } = data
+  const { game, events, playerMe, playersOther, actions } = data
 
   //------------- AUTO RELOADER ----------
   // we are making fake post request to the same page every 2 sec
@@ -50,8 +50,8 @@ const GamePage = () => {
   let latestStageAction
   let latestPlayerAction
   let action
-  for (let i = game.actions_history.length - 1; i >= 0; i--) {
-    action = game.actions_history[i]
+  for (let i = events.length - 1; i >= 0; i--) {
+    action = events[i]
     if (!latestStageAction && !action.performer) {
       latestStageAction = <Alert variant="info">{action.message}</Alert>
     }
@@ -5,6 +5,7 @@ import delay from '../utils/functools'
 const ENDPOINTS = {
   games: '/api/v1/games/',
   gameDetail: '/api/v1/games/{game_pk}/',
+  gameEvents: '/api/v1/games/{game_pk}/events/',
 
   players: '/api/v1/games/{game_pk}/players/',
   playersDetail: '/api/v1/games/{game_pk}/players/{username}/',
@@ -20,6 +21,8 @@ const ENDPOINTS = {
 export default class GameService {
   constructor(token = null) {
     this.token = token
+    // events already loaded for current game round, only new ones are fetched
+    this.eventsCache = { gameId: null, round: null, events: [] }
     autoBind(this)
   }
 
@@ -144,6 +147,25 @@ export default class GameService {
 
 
 
+  ////////////////////////////// events  ////////////////////////////////////////
+
+  async getEvents(gameId, round) {
+    // current round events (history is not shipped with game)
+    // loader is polled, so only events after the latest seen one are requested
+    let cache = this.eventsCache
+    if (cache.gameId !== gameId || cache.round !== round) {
+      cache = { gameId, round, events: [] }
+    }
+    const latest = cache.events[cache.events.length - 1]
+
+    const response = await axios.get(
+      ENDPOINTS.gameEvents.replace('{game_pk}', gameId),
+      { ...this.config, params: { round, after: latest ? latest.seq : 0 } }
+    )
+    this.eventsCache = { ...cache, events: [...cache.events, ...response.data] }
+    return this.eventsCache.events
+  }
+
   ////////////////////////////// LOADERS  ////////////////////////////////////////
 
   async gamesPageLoader() {
@@ -174,6 +196,8 @@ export default class GameService {
     )
     const game = response.data
 
+    const events = await this.getEvents(params.gameId, game.rounds_counter)
+
     response = await axios.get(
       ENDPOINTS.players.replace('{game_pk}', params.gameId),
       this.config
@@ -198,6 +222,6 @@ export default class GameService {
     )
     const actions = response.data
 
-    return { game, playersAll, playerMe, playersOther, actions }
+    return { game, events, playersAll, playerMe, playersOther, actions }
   }
 }